@@ -0,0 +1,61 @@
+"""
+Synthetic datasets for the benchmarks.
+
+Every user gets roughly 80% of days played over the requested number of
+years, with scores drawn from a realistic distribution. User 0 belongs to
+every group, so benchmarks can run as them against any group. The other users
+fill the groups three at a time until they are full; any left over belong to
+no group. Groups alternate between including and excluding historical data.
+"""
+import datetime
+import random
+from typing import List, NamedTuple
+
+from database.Database import GROUP_CAPACITY, Database
+from utils.sample_data import PLAY_PROBABILITY, SCORE_OPTIONS, SCORE_WEIGHTS
+
+PASSWORD = "benchmark-password"
+
+
+class Dataset(NamedTuple):
+    user_ids: List[int]
+    usernames: List[str]
+    historical_group_id: int
+    current_group_id: int
+
+
+def seed_dataset(db: Database, users: int, years: float, groups: int, seed: int = 0,
+                 today: datetime.date = None) -> Dataset:
+    rng = random.Random(seed)
+    today = today or datetime.date.today()
+    days = int(years * 365)
+    start = today - datetime.timedelta(days=days - 1)
+
+    usernames = [f"user{i}" for i in range(users)]
+    user_ids = [db.register_user(name, PASSWORD, f"User {i}").id for i, name in enumerate(usernames)]
+
+    group_ids = []
+    for g in range(max(groups, 2)):
+        group = db.create_group(f"Group {g}", user_ids[0], include_historical=(g % 2 == 0))
+        group_ids.append(group.id)
+    others = user_ids[1:]
+    per_group = GROUP_CAPACITY - 1
+    for g, group_id in enumerate(group_ids):
+        for user_id in others[g * per_group:(g + 1) * per_group]:
+            db.join_group(group_id, user_id)
+
+    for user_id in user_ids:
+        entries = []
+        for d in range(days):
+            score = rng.choices(SCORE_OPTIONS, SCORE_WEIGHTS)[0]
+            if rng.random() < PLAY_PROBABILITY and score is not None:
+                entries.append((start + datetime.timedelta(days=d), score))
+        db.import_scores(user_id, entries)
+
+    # Backdate the groups so the historical cutoff falls inside the data
+    for group_id in group_ids:
+        db.update_group(group_id, created_at=datetime.datetime.combine(
+            start + datetime.timedelta(days=days // 2), datetime.time()
+        ))
+
+    return Dataset(user_ids, usernames, group_ids[0], group_ids[1])
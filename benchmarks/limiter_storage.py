@@ -0,0 +1,56 @@
+"""
+Per-check overhead of the rate-limit storages for each strategy.
+
+    python benchmarks/limiter_storage.py --checks 5000
+"""
+import sys
+import os
+import argparse
+import statistics
+import tempfile
+import time
+
+# Add parent directory to path to allow imports from backend root
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(backend_dir)
+
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter, MovingWindowRateLimiter, SlidingWindowCounterRateLimiter
+
+import utils.limiter_storage  # noqa: F401  registers sqlite://
+
+STRATEGIES = {
+    'fixed-window': FixedWindowRateLimiter,
+    'moving-window': MovingWindowRateLimiter,
+    'sliding-window-counter': SlidingWindowCounterRateLimiter,
+}
+
+def measure(limiter, checks, keys):
+    # A limit high enough that every hit is granted, so each check does the full write path
+    limit = parse(f"{checks * 2}/hour")
+    timings = []
+    for i in range(checks):
+        start = time.perf_counter()
+        limiter.hit(limit, f"client-{i % keys}")
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return statistics.mean(timings), timings[int(len(timings) * 0.99)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Rate-limit storage overhead per check.")
+    parser.add_argument("--checks", type=int, default=5000, help="Hits per storage and strategy.")
+    parser.add_argument("--keys", type=int, default=100, help="Distinct clients hitting the limit.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        uris = ["memory://", f"sqlite:///{os.path.join(directory, 'limits.db')}"]
+        for uri in uris:
+            for name, strategy in STRATEGIES.items():
+                storage = storage_from_string(uri)
+                mean, p99 = measure(strategy(storage), args.checks, args.keys)
+                print(f"{uri.split(':')[0]:8} {name:24} mean {mean * 1000:.3f} ms   p99 {p99 * 1000:.3f} ms")
+                storage.reset()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Benchmarks for the Database and route hot paths.
+
+Seeds a synthetic dataset into a temporary SQLite file, then times each case
+and reports p50/p95 latency, SQL statements per call and peak Python memory
+(measured in a separate pass, since tracemalloc slows everything down).
+Results are written as JSON; given a baseline from an earlier run, cases that
+got slower, issue more queries or use more memory are flagged and the script
+exits non-zero.
+
+    python benchmarks/run.py --users 100 --years 3 --groups 10
+    python benchmarks/run.py --output benchmarks/results/baseline.json
+    python benchmarks/run.py --baseline benchmarks/results/baseline.json
+"""
+import sys
+import os
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+# Add parent directory to path to allow imports from backend root
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(backend_dir)
+
+import sqlalchemy
+from sqlalchemy import event
+
+from benchmarks.datasets import PASSWORD, seed_dataset
+from config.app import create_app
+
+# Allowed slowdown or memory growth relative to the baseline before a case is flagged
+DEFAULT_THRESHOLD = 0.25
+
+# Timings below this many milliseconds are too noisy to compare
+MIN_COMPARABLE_MS = 0.05
+
+
+def build_cases(app, dataset):
+    db = app.config['database']
+    client = app.test_client()
+    user_id = dataset.user_ids[0]
+    token = client.post('/login', json={'username': dataset.usernames[0], 'password': PASSWORD}).json['access_token']
+    headers = {'Authorization': f'Bearer {token}'}
+    today = datetime.date.today().isoformat()
+    scores = iter(range(10 ** 9))
+
+    def request(method, path, **kwargs):
+        def call():
+            response = client.open(path, method=method, **kwargs)
+            assert response.status_code == 200, (path, response.status_code, response.get_data(as_text=True)[:200])
+        return call
+
+    def database_call(fn, *args):
+        def call():
+            fn(*args)
+            db.session.remove()
+        return call
+
+    return {
+        'db.get_scores personal': database_call(db.get_scores, user_id, 'personal'),
+        'db.get_scores group historical': database_call(db.get_scores, user_id, 'group', dataset.historical_group_id),
+        'db.get_scores group current': database_call(db.get_scores, user_id, 'group', dataset.current_group_id),
+        'db.get_user_groups': database_call(db.get_user_groups, user_id),
+        'GET /groups': request('GET', '/groups', headers=headers),
+        'GET /groups/<id>': request('GET', f'/groups/{dataset.historical_group_id}', headers=headers),
+        'GET /stats personal': request('GET', '/stats', headers=headers),
+        'GET /stats group': request('GET', f'/stats?scope=group&groupId={dataset.historical_group_id}', headers=headers),
+        'GET /stats/streaks group': request(
+            'GET', f'/stats/streaks?scope=group&groupId={dataset.historical_group_id}', headers=headers
+        ),
+        'POST /login': request('POST', '/login', json={'username': dataset.usernames[0], 'password': PASSWORD}),
+        'POST /scores': lambda: request('POST', '/scores', headers=headers, json={
+            'date': today, 'score': next(scores) % 6 + 1
+        })(),
+    }
+
+
+def run_case(engine, call, repeat):
+    statements = [0]
+
+    def count(*_):
+        statements[0] += 1
+
+    call()  # warm up
+    timings = []
+    event.listen(engine, 'before_cursor_execute', count)
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            call()
+            timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        event.remove(engine, 'before_cursor_execute', count)
+
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    return {
+        'p50_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        'queries': round(statements[0] / repeat, 2),
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Return a list of human-readable regressions against the baseline."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric in ('p50_ms', 'p95_ms'):
+            if previous[metric] >= MIN_COMPARABLE_MS and current[metric] > previous[metric] * (1 + threshold):
+                regressions.append(f"{name}: {metric} {previous[metric]} -> {current[metric]}")
+        if current['queries'] > previous['queries']:
+            regressions.append(f"{name}: queries {previous['queries']} -> {current['queries']}")
+        if current['peak_kib'] > previous['peak_kib'] * (1 + threshold):
+            regressions.append(f"{name}: peak_kib {previous['peak_kib']} -> {current['peak_kib']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Database methods and routes on a synthetic dataset.")
+    parser.add_argument("--users", type=int, default=50, help="Users to create.")
+    parser.add_argument("--years", type=float, default=2, help="Years of score history per user.")
+    parser.add_argument("--groups", type=int, default=10, help="Groups to create.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the dataset.")
+    parser.add_argument("--repeat", type=int, default=30, help="Timed calls per case.")
+    parser.add_argument("--only", action="append", help="Run only cases whose name contains this text (repeatable).")
+    parser.add_argument("--output", help="Write results to this JSON file.")
+    parser.add_argument("--baseline", help="Compare against results from an earlier run.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative slowdown or memory growth that counts as a regression.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = create_app({
+            "JWT_SECRET_KEY": "benchmark-secret-key-with-enough-length",
+            "DATABASE_URL": f"sqlite:///{os.path.join(directory, 'benchmark.db')}",
+            "BCRYPT_ROUNDS": 4,
+            "RATELIMIT_ENABLED": False,
+            # Measure the work behind GET /scores, not the response cache
+            "SCORES_CACHE_SIZE": 0,
+        })
+        db = app.config['database']
+
+        start = time.perf_counter()
+        with app.app_context():
+            dataset = seed_dataset(db, args.users, args.years, args.groups, seed=args.seed)
+        print(f"Seeded {args.users} users x {args.years} years, {max(args.groups, 2)} groups "
+              f"in {time.perf_counter() - start:.1f}s")
+
+        results = {}
+        with app.app_context():
+            for name, call in build_cases(app, dataset).items():
+                if args.only and not any(text in name for text in args.only):
+                    continue
+                results[name] = run_case(db.engine, call, args.repeat)
+                r = results[name]
+                print(f"{name:34} p50 {r['p50_ms']:8.3f} ms  p95 {r['p95_ms']:8.3f} ms  "
+                      f"queries {r['queries']:5}  peak {r['peak_kib']:9.1f} KiB")
+        db.engine.dispose()
+
+    report = {
+        'meta': {
+            'users': args.users, 'years': args.years, 'groups': args.groups, 'seed': args.seed,
+            'repeat': args.repeat, 'python': platform.python_version(), 'sqlalchemy': sqlalchemy.__version__,
+            'platform': platform.platform(), 'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        },
+        'results': results,
+    }
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if {k: baseline['meta'].get(k) for k in ('users', 'years', 'groups', 'seed')} != \
+                {k: report['meta'][k] for k in ('users', 'years', 'groups', 'seed')}:
+            print("Warning: baseline was recorded with a different dataset size")
+        regressions = compare(results, baseline['results'], args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        print(f"{len(regressions)} regression(s) against {args.baseline}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Payload size and build-plus-serialise time of GET /scores in the default
+weeks format against format=columnar, for a personal and a group view.
+
+    python benchmarks/scores_format.py --users 4 --years 3
+"""
+import sys
+import os
+import argparse
+import gzip
+import statistics
+import tempfile
+import time
+
+# Add parent directory to path to allow imports from backend root
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(backend_dir)
+
+from benchmarks.datasets import seed_dataset
+from config.app import create_app
+
+def measure(app, build, repeat):
+    db = app.config['database']
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = app.json.dumps(build())
+        timings.append(time.perf_counter() - start)
+        db.session.remove()
+    return statistics.median(timings), body.encode()
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare GET /scores payloads in the weeks and columnar formats.")
+    parser.add_argument("--users", type=int, default=4, help="Users to create (group views show up to four).")
+    parser.add_argument("--years", type=float, default=3, help="Years of score history per user.")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed builds per case.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = create_app({
+            "JWT_SECRET_KEY": "benchmark-secret-key-with-enough-length",
+            "DATABASE_URL": f"sqlite:///{os.path.join(directory, 'benchmark.db')}",
+            "BCRYPT_ROUNDS": 4,
+        })
+        db = app.config['database']
+        with app.app_context():
+            dataset = seed_dataset(db, args.users, args.years, groups=2)
+            user_id = dataset.user_ids[0]
+            scopes = {
+                'personal': (user_id, 'personal', None),
+                'group': (user_id, 'group', dataset.historical_group_id),
+            }
+            print(f"{args.users} users x {args.years} years")
+            for scope, scope_args in scopes.items():
+                for columnar in (False, True):
+                    seconds, body = measure(
+                        app, lambda: db.get_scores_page(*scope_args, columnar=columnar), args.repeat
+                    )
+                    name = f"{scope} {'columnar' if columnar else 'weeks'}"
+                    print(f"{name:18} {len(body) / 1024:9.1f} KiB  gzip {len(gzip.compress(body)) / 1024:7.1f} KiB  "
+                          f"build+serialise {seconds * 1000:7.2f} ms")
+        db.engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Compare read throughput of the SQLite engine profile against the old
+single shared connection (StaticPool) with N concurrent reader threads.
+
+    python benchmarks/sqlite_readers.py --threads 8 --seconds 5
+"""
+import sys
+import os
+import argparse
+import datetime
+import tempfile
+import threading
+import time
+
+# Add parent directory to path to allow imports from backend root
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(backend_dir)
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from database.Database import Database
+from utils.password_hasher import PasswordHasher
+
+def seed(url, users, days):
+    db = Database(url, password_hasher=PasswordHasher(rounds=4))
+    user_ids = [db.register_user(f"user{i}", "pass", f"User {i}").id for i in range(users)]
+    group = db.create_group("Benchmark", user_ids[0])
+    for user_id in user_ids[1:]:
+        db.join_group(group.id, user_id)
+    start = datetime.date.today() - datetime.timedelta(days=days)
+    for user_id in user_ids:
+        db.import_scores(user_id, [
+            (start + datetime.timedelta(days=d), (d + user_id) % 7 or None) for d in range(days)
+        ])
+    db.engine.dispose()
+    return user_ids[0], group.id
+
+def legacy_database(url):
+    """A Database bound to the previous engine setup: one connection shared by every thread."""
+    db = Database(url, password_hasher=PasswordHasher(rounds=4))
+    db.engine.dispose()
+    db.engine = create_engine(url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    db.session = scoped_session(sessionmaker(bind=db.engine))
+    return db
+
+def run_readers(db, user_id, group_id, threads, seconds):
+    deadline = time.perf_counter() + seconds
+    counts = [0] * threads
+    errors = []
+
+    def read(index):
+        try:
+            while time.perf_counter() < deadline:
+                db.get_scores(user_id, 'group', group_id)
+                db.session.remove()
+                counts[index] += 1
+        except Exception as e:
+            errors.append(e)
+
+    workers = [threading.Thread(target=read, args=(i,)) for i in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return sum(counts) / seconds, errors
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent reader throughput for SQLite engine setups.")
+    parser.add_argument("--threads", type=int, default=8, help="Concurrent reader threads.")
+    parser.add_argument("--seconds", type=float, default=5, help="Duration of each run.")
+    parser.add_argument("--users", type=int, default=10, help="Group members to seed.")
+    parser.add_argument("--days", type=int, default=365, help="Days of scores per user.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        user_id, group_id = seed(url, args.users, args.days)
+
+        for name, db in (("StaticPool (shared connection)", legacy_database(url)),
+                         ("WAL + QueuePool", Database(url, password_hasher=PasswordHasher(rounds=4)))):
+            rate, errors = run_readers(db, user_id, group_id, args.threads, args.seconds)
+            print(f"{name:32} {rate:8.1f} get_scores/s with {args.threads} threads, {len(errors)} error(s)")
+            if errors:
+                print(f"  first error: {errors[0]!r}")
+            db.engine.dispose()
+
+if __name__ == "__main__":
+    main()
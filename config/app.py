@@ -5,7 +5,10 @@ from flask_jwt_extended import JWTManager
 from dotenv import load_dotenv
 
 from database.Database import Database
+from database.slow_query_log import SlowQueryLog, create_file_logger
 from config.limiter import limiter
+from utils.metrics import RequestMetrics
+from utils.password_hasher import PasswordHasher
 
 load_dotenv()
 
@@ -14,6 +17,21 @@ def create_app(test_config=None):
     app.config['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY')
     app.config['DATABASE_URL'] = os.environ.get('DATABASE_URL', 'sqlite:///wordlewise.db')
     app.config['FLASK_ENV'] = os.environ.get('FLASK_ENV', 'production')
+    app.config['SCORES_CACHE_SIZE'] = int(os.environ.get('SCORES_CACHE_SIZE', 256))
+    app.config['SCORES_CACHE_TTL'] = float(os.environ.get('SCORES_CACHE_TTL', 300))
+    app.config['BCRYPT_ROUNDS'] = int(os.environ.get('BCRYPT_ROUNDS', 12))
+    app.config['BCRYPT_WORKERS'] = int(os.environ.get('BCRYPT_WORKERS', 2))
+    app.config['BCRYPT_MAX_PENDING'] = int(os.environ.get('BCRYPT_MAX_PENDING', 16))
+    # memory:// keeps counters per process; sqlite:///limits.db shares them between workers
+    app.config['RATELIMIT_STORAGE_URI'] = os.environ.get('RATELIMIT_STORAGE_URI', 'memory://')
+    app.config['RATELIMIT_STRATEGY'] = os.environ.get('RATELIMIT_STRATEGY', 'fixed-window')
+    app.config['METRICS_ENABLED'] = os.environ.get('METRICS_ENABLED', 'false').lower() == 'true'
+    # Bearer token required to read /metrics; unset leaves it open
+    app.config['METRICS_TOKEN'] = os.environ.get('METRICS_TOKEN')
+    # Path of the slow-query log; unset disables it
+    app.config['SLOW_QUERY_LOG'] = os.environ.get('SLOW_QUERY_LOG')
+    app.config['SLOW_QUERY_THRESHOLD_MS'] = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', 100))
+    app.config['SLOW_QUERY_EXPLAIN'] = os.environ.get('SLOW_QUERY_EXPLAIN', 'true').lower() == 'true'
     
     if app.config['FLASK_ENV'] == 'development':
         app.debug = True
@@ -30,10 +48,39 @@ def create_app(test_config=None):
     ]
     CORS(app, origins=allowed_origins)
 
+    # Request metrics go first so that requests rejected by the rate limiter are still counted
+    metrics = RequestMetrics() if app.config['METRICS_ENABLED'] else None
+    if metrics:
+        metrics.init_app(app)
+
     # Initialize rate limiter
     limiter.init_app(app)
 
-    database = Database(database_url=app.config['DATABASE_URL'])
+    database = Database(
+        database_url=app.config['DATABASE_URL'],
+        scores_cache_size=app.config['SCORES_CACHE_SIZE'],
+        scores_cache_ttl=app.config['SCORES_CACHE_TTL'],
+        password_hasher=PasswordHasher(
+            rounds=app.config['BCRYPT_ROUNDS'],
+            max_workers=app.config['BCRYPT_WORKERS'],
+            max_pending=app.config['BCRYPT_MAX_PENDING']
+        )
+    )
+
+    if metrics:
+        metrics.instrument_engine(database.engine)
+        metrics.add_stats_source(
+            'scores_cache', 'GET /scores response cache', database.scores_cache.stats,
+            counters=('hits', 'misses', 'evictions', 'expirations', 'invalidations'),
+            gauges=('size', 'maxsize')
+        )
+
+    if app.config['SLOW_QUERY_LOG']:
+        SlowQueryLog(
+            create_file_logger(app.config['SLOW_QUERY_LOG']),
+            threshold_ms=app.config['SLOW_QUERY_THRESHOLD_MS'],
+            explain=app.config['SLOW_QUERY_EXPLAIN']
+        ).attach(database.engine)
 
     if not test_config or not test_config.get('TESTING'):
         @app.teardown_appcontext
@@ -46,14 +93,20 @@ def create_app(test_config=None):
     from routes.users import users_bp
     from routes.groups import groups_bp
     from routes.wordle import wordle_bp
+    from routes.stats import stats_bp
+    from routes.metrics import metrics_bp
 
     app.register_blueprint(auth_bp)
     app.register_blueprint(scores_bp)
     app.register_blueprint(users_bp)
     app.register_blueprint(groups_bp)
     app.register_blueprint(wordle_bp)
+    app.register_blueprint(stats_bp)
+    if metrics:
+        app.register_blueprint(metrics_bp)
 
     # Store database instance in app config for route access
     app.config['database'] = database
+    app.config['metrics'] = metrics
 
     return app
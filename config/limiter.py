@@ -1,10 +1,13 @@
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 
-# Initialize limiter without app (will be initialized later with init_app)
+# Registers the sqlite:// storage scheme
+import utils.limiter_storage  # noqa: F401
+
+# Initialize limiter without app (will be initialized later with init_app).
+# Storage and strategy come from RATELIMIT_STORAGE_URI and RATELIMIT_STRATEGY in the app config
 limiter = Limiter(
     key_func=get_remote_address,
     default_limits=[],
-    storage_uri="memory://",
     headers_enabled=True
 )
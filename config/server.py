@@ -0,0 +1,129 @@
+"""
+Serving the app outside of the Flask development server.
+
+SERVER picks the server that main.py starts:
+
+- `gunicorn` (default in Docker): pre-forked worker processes, each running
+  WEB_THREADS request threads. The app is loaded once in the master before
+  forking, so startup work such as migrations runs once and read-only memory
+  is shared between workers; each worker then drops the pooled database
+  connections it inherited so no connection is used by two processes.
+  Request metrics are shared through a temporary directory so that whichever
+  worker answers a scrape reports the totals for all of them.
+- `waitress`: a single process with WEB_THREADS threads, useful on platforms
+  without fork. WEB_KEEPALIVE becomes its idle-connection timeout; the
+  gunicorn-only settings have no waitress equivalent (in particular there is
+  no per-request deadline), and setting them prints a warning.
+- `flask`: the development server.
+"""
+import os
+import shutil
+import tempfile
+
+from database.engine import checkpoint_wal
+
+SERVERS = ('gunicorn', 'waitress', 'flask')
+
+# Environment variables that only configure gunicorn
+GUNICORN_ONLY_SETTINGS = (
+    'WEB_WORKERS', 'WEB_TIMEOUT', 'WEB_GRACEFUL_TIMEOUT', 'WEB_MAX_REQUESTS', 'WEB_MAX_REQUESTS_JITTER'
+)
+
+
+def get_server_options():
+    workers = int(os.environ.get('WEB_WORKERS', (os.cpu_count() or 1) * 2 + 1))
+    threads = int(os.environ.get('WEB_THREADS', 4))
+    return {
+        'bind': f"{os.environ.get('HOST', '0.0.0.0')}:{int(os.environ.get('PORT', 5000))}",
+        'workers': workers,
+        'threads': threads,
+        'worker_class': 'gthread' if threads > 1 else 'sync',
+        'preload_app': True,
+        # Worker heartbeat, in seconds. A sync worker is restarted if one request
+        # runs this long; a gthread worker only if its main loop stops responding,
+        # since it checks in between requests whatever its threads are doing
+        'timeout': int(os.environ.get('WEB_TIMEOUT', 30)),
+        'graceful_timeout': int(os.environ.get('WEB_GRACEFUL_TIMEOUT', 30)),
+        # Seconds an idle keep-alive connection is held open
+        'keepalive': int(os.environ.get('WEB_KEEPALIVE', 5)),
+        # Recycle workers periodically, jittered so they don't all restart together
+        'max_requests': int(os.environ.get('WEB_MAX_REQUESTS', 1000)),
+        'max_requests_jitter': int(os.environ.get('WEB_MAX_REQUESTS_JITTER', 100)),
+        'accesslog': '-',
+    }
+
+
+def dispose_inherited_connections(app):
+    """
+    Discard the pooled database connections a forked worker inherited from
+    the master, without closing them underneath the master.
+    """
+    app.config['database'].engine.dispose(close=False)
+
+
+def run_gunicorn(app, options):
+    from gunicorn.app.base import BaseApplication
+
+    # Workers write their request metrics here so that any of them can report the totals
+    metrics = app.config.get('metrics')
+    metrics_directory = tempfile.mkdtemp(prefix='wordlewise-metrics-') if metrics else None
+    if metrics:
+        metrics.share_between_processes(metrics_directory)
+
+    class GunicornApplication(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+            self.cfg.set('post_fork', lambda server, worker: dispose_inherited_connections(app))
+            if metrics:
+                self.cfg.set('worker_exit', lambda server, worker: metrics.flush())
+                self.cfg.set('child_exit', lambda server, worker: metrics.mark_process_dead(worker.pid))
+
+        def load(self):
+            return app
+
+    master_pid = os.getpid()
+    try:
+        GunicornApplication().run()
+    finally:
+        # Workers exit through here too; only the master owns the directory
+        if metrics_directory and os.getpid() == master_pid:
+            shutil.rmtree(metrics_directory, ignore_errors=True)
+
+
+def run_waitress(app, options):
+    from waitress import serve
+
+    ignored = [name for name in GUNICORN_ONLY_SETTINGS if name in os.environ]
+    if ignored:
+        print(f"Warning: waitress has no equivalent of {', '.join(ignored)}; ignoring them")
+    serve(
+        app,
+        listen=options['bind'],
+        threads=options['threads'],
+        # Seconds an idle connection is kept open, not a limit on running requests
+        channel_timeout=options['keepalive'],
+    )
+
+
+def run_server(app):
+    server = os.environ.get('SERVER', 'flask')
+    if server not in SERVERS:
+        raise ValueError(f"SERVER must be one of {', '.join(SERVERS)}, not {server!r}")
+
+    options = get_server_options()
+    print(f"Starting {server} server on {options['bind']}...")
+    server_pid = os.getpid()
+    try:
+        if server == 'gunicorn':
+            run_gunicorn(app, options)
+        elif server == 'waitress':
+            run_waitress(app, options)
+        else:
+            host, port = options['bind'].rsplit(':', 1)
+            app.run(host=host, port=int(port))
+    finally:
+        # Leave every commit in the database file itself, not only in its WAL.
+        # Forked gunicorn workers unwind through here as well; leave it to the master
+        if os.getpid() == server_pid:
+            checkpoint_wal(app.config['database'].engine)
@@ -3,60 +3,72 @@ import datetime
 import hashlib
 import re
 from typing import List
-import bcrypt
-import pytz
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import Session, sessionmaker, scoped_session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy import Date, and_, cast, delete, func, insert, or_, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, aliased, joinedload, sessionmaker, scoped_session
 
 from database.models.base import Base
 from database.models.Score import Score
 from database.models.User import User
 from database.models.Group import Group
 from database.models.GroupMember import GroupMember
+from database.models.WeeklyScore import WeeklyScore
+from database.models.UserRollup import UserRollup
+from database.models.DataVersion import DataVersion
+from database.models.WordleAnswer import WordleAnswer
+from database.engine import create_database_engine
+from database.migrations import run_migrations
+from database.rollups import rebuild_user_rollup, rebuild_user_weeks
+from utils.dates import week_start
+from utils.timezones import today_in
 from utils.invite_code import generate_invite_code
+from utils.lru_cache import LRUCache
+from utils.password_hasher import PasswordHasher
+
+# Number of weekly rollup rows fetched per round trip when streaming get_scores
+SCORES_BATCH_SIZE = 1000
+
+# Rows per multi-row INSERT/DELETE when writing scores in bulk
+SCORES_WRITE_BATCH_SIZE = 500
+
+# Dialects with a native INSERT ... ON CONFLICT DO UPDATE
+UPSERT_DIALECTS = {
+    'sqlite': sqlite.insert,
+    'postgresql': postgresql.insert,
+}
+
+# SQL for the Monday starting a date's week, by dialect; elsewhere scores are grouped by day and folded
+WEEK_START_EXPRESSIONS = {
+    'sqlite': lambda column: func.date(column, 'weekday 0', '-6 days'),
+    'postgresql': lambda column: cast(func.date_trunc('week', column), Date),
+}
+
+# Guesses allowed in a game; any score above this is a failed game
+MAX_GUESSES = 6
+
+# Most members a group can have
+GROUP_CAPACITY = 4
+
+STATS_BUCKETS = tuple(str(guesses) for guesses in range(1, MAX_GUESSES + 1)) + ('fail',)
+
+
+def _week_rank(week: dict) -> tuple:
+    return (week["total"] / week["games"], -week["games"])
 
 
 class Database:
-    def __init__(self, database_url: str) -> None:
+    def __init__(self, database_url: str, scores_cache_size: int = 256, scores_cache_ttl: float = 300,
+                 password_hasher: PasswordHasher = None) -> None:
         self.database_url = database_url
+        self.password_hasher = password_hasher or PasswordHasher()
         
-        # Configure engine with proper pool settings
-        if 'sqlite' in database_url:
-            # SQLite doesn't support real connection pooling
-            # Use StaticPool for SQLite to avoid threading issues
-            self.engine = create_engine(
-                self.database_url,
-                echo=False,
-                connect_args={"check_same_thread": False},
-                poolclass=StaticPool
-            )
-        else:
-            # For other databases (PostgreSQL, MySQL, etc.)
-            self.engine = create_engine(
-                self.database_url,
-                echo=False,
-                pool_size=5,
-                max_overflow=10,
-                pool_timeout=30,
-                pool_recycle=1800,
-                pool_pre_ping=True
-            )
-        
+        self.engine = create_database_engine(self.database_url)
         Base.metadata.create_all(self.engine, checkfirst=True)
+        run_migrations(self.engine)
         self.session: Session = scoped_session(sessionmaker(bind=self.engine))
-        self.timezone = None
+        # Serialised get_scores responses, tagged ('personal', user_id) or ('group', group_id)
+        self.scores_cache = LRUCache(maxsize=scores_cache_size, ttl=scores_cache_ttl)
 
-    def set_timezone(self, timezone) -> None:
-        if timezone not in pytz.all_timezones:
-            raise Exception('Invalid timezone')
-        self.timezone = timezone
-    
-    def today(self) -> datetime.date:
-        if self.timezone is None:
-            raise Exception('No timezone has been set')
-        return datetime.datetime.now(pytz.timezone(self.timezone)).date()
-    
     def login(self, username: str, password: str) -> User:
         user = self.session.query(User).filter_by(username=username).first()
         if user is not None:
@@ -69,14 +81,17 @@ class Database:
                 # Legacy MD5 verification
                 if hashlib.md5(password.encode()).hexdigest() == hash_to_match:
                     # Password is correct - migrate to bcrypt
-                    new_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-                    user.password_hash = new_hash
+                    user.password_hash = self.password_hasher.hash(password)
                     self.session.commit()
                     return user
                 raise Exception('Password incorrect')
             else:
                 # Modern bcrypt verification
-                if bcrypt.checkpw(password.encode('utf-8'), hash_to_match.encode('utf-8')):
+                if self.password_hasher.check(password, hash_to_match):
+                    # Re-hash if the configured work factor has changed since it was stored
+                    if self.password_hasher.needs_rehash(hash_to_match):
+                        user.password_hash = self.password_hasher.hash(password)
+                        self.session.commit()
                     return user
                 raise Exception('Password incorrect')
         raise Exception('User does not exist')
@@ -86,7 +101,7 @@ class Database:
             raise Exception("Username already exists")
 
         # Use bcrypt for secure password hashing
-        password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        password_hash = self.password_hasher.hash(password)
         new_user = User(username=username, password_hash=password_hash, forename=forename)
         self.session.add(new_user)
         self.session.commit()
@@ -95,101 +110,539 @@ class Database:
     def get_user_by_id(self, user_id: int) -> User:
         return self.session.query(User).filter_by(id=user_id).first()
         
-    def get_scores(self, user_id: int, scope_type: str, group_id: int = None) -> List:
-        # Determine query based on scope
-        query = self.session.query(Score)
-        
+    def get_scores(self, user_id: int, scope_type: str, group_id: int = None,
+                   start_date: datetime.date = None, end_date: datetime.date = None,
+                   timezone: str = None) -> List:
+        return self.get_scores_page(
+            user_id, scope_type, group_id, start_date, end_date, timezone=timezone
+        )["weeks"]
+
+    def get_scores_page(self, user_id: int, scope_type: str, group_id: int = None,
+                        start_date: datetime.date = None, end_date: datetime.date = None,
+                        limit: int = None, timezone: str = None, columnar: bool = False) -> dict:
+        """
+        Return the weeks of scores between start_date and end_date (inclusive,
+        widened to whole weeks), newest `limit` weeks only if given. next_cursor
+        is the start of the week preceding the page, or None if there is no
+        earlier week to show. The current week is taken from today's date in
+        the caller's timezone (server local time if None). With columnar, the
+        same window is returned in the compact layout of _columnar_scores.
+        """
+        criteria = []
         group_created_date = None
         
         if scope_type == 'personal':
-            query = query.filter(Score.user_id == user_id)
+            criteria.append(WeeklyScore.user_id == user_id)
         elif scope_type == 'group' and group_id:
-            # Get group members
-            members = self.session.query(GroupMember).filter_by(group_id=group_id).all()
-            member_ids = [m.user_id for m in members]
-            query = query.filter(Score.user_id.in_(member_ids))
+            # Restrict to group members via a subquery rather than loading them
+            member_ids = select(GroupMember.user_id).where(GroupMember.group_id == group_id)
+            criteria.append(WeeklyScore.user_id.in_(member_ids))
             
             # Check historical data setting
             group = self.get_group(group_id)
             if group and not group.include_historical_data:
                 group_created_date = group.created_at.date()
                 # Filter scores to only those on or after group creation
-                query = query.filter(Score.date >= group_created_date)
-        
-        # Execute query
-        scores = query.all()
-        
-        # Process scores into weeks
-        all_scores_dict = {}
-        for score in scores:
-            score: Score
-            score_date: datetime.date = score.date
-            week_start_date = score_date - datetime.timedelta(days=score_date.weekday())
-            if week_start_date not in all_scores_dict:
-                all_scores_dict[week_start_date] = {
-                    "start_of_week": str(week_start_date),
-                    "data": {
-                        str(week_start_date + datetime.timedelta(days=i)): {} for i in range(7)
-                    }
-                }
-            all_scores_dict[week_start_date]["data"][str(score_date)][score.user.username] = score.score
-        
-        # Determine the earliest week to show
-        today = datetime.date.today()
-        current_week_start = today - datetime.timedelta(days=today.weekday())
+                criteria.append(WeeklyScore.week_start >= week_start(group_created_date))
+
+        first_score_week, last_score_week = self.session.query(
+            func.min(WeeklyScore.week_start), func.max(WeeklyScore.week_start)
+        ).filter(*criteria).one()
+
+        # Determine the range of weeks that exist for this scope
+        current_week_start = week_start(today_in(timezone))
         
         if group_created_date:
             # When historical data is OFF, start from the week containing group creation
-            earliest_week_start = group_created_date - datetime.timedelta(days=group_created_date.weekday())
-        elif all_scores_dict:
+            earliest_week_start = week_start(group_created_date)
+        elif first_score_week:
             # When historical data is ON, start from earliest score
-            earliest_week_start = min(all_scores_dict.keys())
+            earliest_week_start = first_score_week
         else:
             # No scores at all, just show current week
             earliest_week_start = current_week_start
+        latest_week_start = max(current_week_start, last_score_week or current_week_start)
+
+        # Narrow it to the requested window
+        lower_bound = earliest_week_start
+        if start_date:
+            lower_bound = max(lower_bound, week_start(start_date))
+        last_week = latest_week_start
+        if end_date:
+            last_week = min(last_week, week_start(end_date))
+        first_week = lower_bound
+        if limit:
+            # Don't step back past the earliest representable date
+            weeks_back = min(limit - 1, (last_week - datetime.date.min).days // 7)
+            first_week = max(first_week, last_week - datetime.timedelta(weeks=weeks_back))
+
+        if first_week > last_week:
+            if columnar:
+                # An empty window: the week the request ended on, with no scores
+                return self._columnar_scores([], last_week, last_week, group_created_date, None)
+            return {"weeks": [], "next_cursor": None}
+
+        next_cursor = None
+        if first_week > lower_bound:
+            next_cursor = str(first_week - datetime.timedelta(days=7))
+
+        # Read pre-bucketed weekly rollups, projecting only the columns we need
+        day_columns = [getattr(WeeklyScore, column) for column in WeeklyScore.DAY_COLUMNS]
+        query = (
+            self.session.query(WeeklyScore.week_start, User.username, *day_columns)
+            .join(User, WeeklyScore.user_id == User.id)
+            .filter(*criteria)
+            .filter(WeeklyScore.week_start >= first_week, WeeklyScore.week_start <= last_week)
+            .yield_per(SCORES_BATCH_SIZE)
+        )
+        if columnar:
+            return self._columnar_scores(query, first_week, last_week, group_created_date, next_cursor)
         
-        # Fill in missing weeks from earliest to current
-        week_cursor = earliest_week_start
-        while week_cursor <= current_week_start:
-            if week_cursor not in all_scores_dict:
-                all_scores_dict[week_cursor] = {
-                    "start_of_week": str(week_cursor),
-                    "data": {
-                        str(week_cursor + datetime.timedelta(days=i)): {} for i in range(7)
-                    }
+        # Materialise only the weeks in the window, in order
+        all_scores_dict = {}
+        week_cursor = first_week
+        while week_cursor <= last_week:
+            all_scores_dict[week_cursor] = {
+                "start_of_week": str(week_cursor),
+                "data": {
+                    str(week_cursor + datetime.timedelta(days=i)): {} for i in range(7)
                 }
+            }
             week_cursor += datetime.timedelta(days=7)
+
+        for row in query:
+            week_data = all_scores_dict[row[0]]["data"]
+            username = row[1]
+            for i, score in enumerate(row[2:]):
+                if score is None:
+                    continue
+                score_date = row[0] + datetime.timedelta(days=i)
+                if group_created_date and score_date < group_created_date:
+                    continue
+                week_data[str(score_date)][username] = score
         
         # Add group_created_at metadata to each week if historical data is off
         if group_created_date:
-            for week_start, week_data in all_scores_dict.items():
+            for week_data in all_scores_dict.values():
                 week_data["group_created_at"] = str(group_created_date)
 
-        # Sort the weeks
-        all_scores_dict = dict(sorted(all_scores_dict.items(), key=lambda x: x[0]))
+        return {"weeks": list(all_scores_dict.values()), "next_cursor": next_cursor}
+
+    @staticmethod
+    def _columnar_scores(rows, first_week: datetime.date, last_week: datetime.date,
+                         group_created_date: datetime.date, next_cursor: str) -> dict:
+        """
+        Lay out (week_start, username, day_0..day_6) rows with each username
+        listed once. `weeks` gives the offset from `start`, in weeks, of each
+        week that has any scores; weeks without scores are left out. Each user's
+        array holds seven scores (Monday to Sunday) per listed week, with 0
+        for a day without a score.
+        """
+        scores_by_week = defaultdict(dict)
+        for row in rows:
+            days = list(row[2:])
+            if group_created_date and row[0] < group_created_date:
+                cutoff = (group_created_date - row[0]).days
+                days[:cutoff] = [None] * min(cutoff, 7)
+            if any(score is not None for score in days):
+                scores_by_week[row[0]][row[1]] = days
+
+        weeks = sorted(scores_by_week)
+        usernames = sorted({username for week_scores in scores_by_week.values() for username in week_scores})
+        no_scores = [None] * 7
+        return {
+            "start": str(first_week),
+            "end": str(last_week + datetime.timedelta(days=6)),
+            "weeks": [(week - first_week).days // 7 for week in weeks],
+            "users": usernames,
+            "scores": [
+                [score or 0 for week in weeks for score in scores_by_week[week].get(username, no_scores)]
+                for username in usernames
+            ],
+            "group_created_at": str(group_created_date) if group_created_date else None,
+            "next_cursor": next_cursor,
+        }
+
+    def get_stats(self, user_id: int, scope_type: str, group_id: int = None,
+                  start_date: datetime.date = None, end_date: datetime.date = None) -> dict:
+        """
+        Summarise scores between start_date and end_date (inclusive) for the
+        user, or for every member of a group: games played, mean score, the
+        distribution of guesses and the best and worst weeks by mean score.
+        Counts come from two GROUP BY queries, one by score and one by week, so
+        individual scores are never loaded. Groups without historical data only
+        count scores from the day the group was created, as in get_scores.
+        """
+        # Rows without a score don't count as games played
+        criteria = [Score.score.isnot(None)]
+        group_created_date = None
+        users = self.session.query(User.id, User.username, User.forename)
+
+        if scope_type == 'group' and group_id:
+            users = users.join(GroupMember).filter(GroupMember.group_id == group_id)
+            member_ids = select(GroupMember.user_id).where(GroupMember.group_id == group_id)
+            criteria.append(Score.user_id.in_(member_ids))
 
-        # Sort the days within each week
-        for week in all_scores_dict.values():
-            week["data"] = dict(sorted(week["data"].items(), key=lambda x: x[0]))
+            group = self.get_group(group_id)
+            if group and not group.include_historical_data:
+                group_created_date = group.created_at.date()
+                criteria.append(Score.date >= group_created_date)
+        else:
+            users = users.filter(User.id == user_id)
+            criteria.append(Score.user_id == user_id)
+
+        if start_date:
+            criteria.append(Score.date >= start_date)
+        if end_date:
+            criteria.append(Score.date <= end_date)
+
+        distributions = defaultdict(lambda: dict.fromkeys(STATS_BUCKETS, 0))
+        totals = defaultdict(int)
+        for score_user_id, score, count in (
+            self.session.query(Score.user_id, Score.score, func.count())
+            .filter(*criteria)
+            .group_by(Score.user_id, Score.score)
+        ):
+            bucket = 'fail' if score > MAX_GUESSES else str(score)
+            distributions[score_user_id][bucket] = distributions[score_user_id].get(bucket, 0) + count
+            totals[score_user_id] += score * count
 
-        # Return as a list
-        return list(all_scores_dict.values())
+        # {user_id: {week_start: [games, total]}}
+        weeks = defaultdict(lambda: defaultdict(lambda: [0, 0]))
+        week_expression = WEEK_START_EXPRESSIONS.get(self.engine.dialect.name)
+        week_column = week_expression(Score.date) if week_expression else Score.date
+        for score_user_id, week, games, total in (
+            self.session.query(Score.user_id, week_column, func.count(), func.sum(Score.score))
+            .filter(*criteria)
+            .group_by(Score.user_id, week_column)
+        ):
+            week = str(week) if week_expression else str(week_start(week))
+            weeks[score_user_id][week][0] += games
+            weeks[score_user_id][week][1] += total
+
+        user_stats = []
+        for stats_user_id, username, forename in users.order_by(User.username):
+            distribution = distributions.get(stats_user_id, dict.fromkeys(STATS_BUCKETS, 0))
+            games = sum(distribution.values())
+            user_weeks = [
+                {"week_start": week, "games": week_games, "total": week_total,
+                 "mean": round(week_total / week_games, 2)}
+                for week, (week_games, week_total) in sorted(weeks.get(stats_user_id, {}).items())
+            ]
+            user_stats.append({
+                "username": username,
+                "forename": forename,
+                "games": games,
+                "mean": round(totals[stats_user_id] / games, 2) if games else None,
+                "distribution": distribution,
+                # Ties go to the week with more games (fewer for the worst), then the most recent
+                "best_week": min(reversed(user_weeks), key=_week_rank, default=None),
+                "worst_week": max(reversed(user_weeks), key=_week_rank, default=None),
+            })
+
+        return {
+            "from": str(start_date) if start_date else None,
+            "to": str(end_date) if end_date else None,
+            "group_created_at": str(group_created_date) if group_created_date else None,
+            "users": user_stats,
+        }
     
+    def get_streaks(self, user_id: int, scope_type: str, group_id: int = None,
+                    weeks: int = 8, timezone: str = None) -> dict:
+        """
+        Return the user's, or every group member's, streaks and their total
+        and games played for each of the latest `weeks` weeks. Streaks come
+        from user_rollup and weekly totals from weekly_score, so score is never
+        read. A current streak still counts if the last day played was
+        yesterday in the caller's timezone, and drops to 0 after that. Groups
+        without historical data only count days from their creation in the
+        weekly totals.
+        """
+        today = today_in(timezone)
+        current_week_start = week_start(today)
+        yesterday = today - datetime.timedelta(days=1)
+        first_week = current_week_start - datetime.timedelta(weeks=weeks - 1)
+        group_created_date = None
+
+        users = self.session.query(
+            User.id, User.username, User.forename,
+            UserRollup.last_played, UserRollup.current_streak, UserRollup.longest_streak
+        ).outerjoin(UserRollup, UserRollup.user_id == User.id)
+        if scope_type == 'group' and group_id:
+            users = users.join(GroupMember, GroupMember.user_id == User.id).filter(GroupMember.group_id == group_id)
+            member_ids = select(GroupMember.user_id).where(GroupMember.group_id == group_id)
+            week_criteria = [WeeklyScore.user_id.in_(member_ids)]
+
+            group = self.get_group(group_id)
+            if group and not group.include_historical_data:
+                group_created_date = group.created_at.date()
+                first_week = max(first_week, week_start(group_created_date))
+        else:
+            users = users.filter(User.id == user_id)
+            week_criteria = [WeeklyScore.user_id == user_id]
+
+        # {user_id: {week_start: [total, games]}}
+        totals = defaultdict(dict)
+        day_columns = [getattr(WeeklyScore, column) for column in WeeklyScore.DAY_COLUMNS]
+        for row in self.session.query(WeeklyScore.user_id, WeeklyScore.week_start, *day_columns).filter(
+            *week_criteria, WeeklyScore.week_start >= first_week, WeeklyScore.week_start <= current_week_start
+        ):
+            week_total = totals[row[0]].setdefault(row[1], [0, 0])
+            for i, score in enumerate(row[2:]):
+                if score is None:
+                    continue
+                if group_created_date and row[1] + datetime.timedelta(days=i) < group_created_date:
+                    continue
+                week_total[0] += score
+                week_total[1] += 1
+
+        week_starts = []
+        week_cursor = first_week
+        while week_cursor <= current_week_start:
+            week_starts.append(week_cursor)
+            week_cursor += datetime.timedelta(days=7)
+
+        user_streaks = []
+        for streak_user_id, username, forename, last_played, current_streak, longest_streak in users.order_by(User.username):
+            user_totals = totals.get(streak_user_id, {})
+            user_streaks.append({
+                "username": username,
+                "forename": forename,
+                "last_played": str(last_played) if last_played else None,
+                "current_streak": current_streak if last_played and last_played >= yesterday else 0,
+                "longest_streak": longest_streak or 0,
+                "weeks": [
+                    {"week_start": str(week), "total": user_totals.get(week, (0, 0))[0],
+                     "games": user_totals.get(week, (0, 0))[1]}
+                    for week in week_starts
+                ],
+            })
+
+        return {
+            "group_created_at": str(group_created_date) if group_created_date else None,
+            "users": user_streaks,
+        }
+
     def add_score(self, date: str, user_id: int, score: int) -> None:
-        # Upsert logic
         date_obj = datetime.datetime.strptime(date, "%Y-%m-%d").date()
-        existing_score = self.session.query(Score).filter_by(user_id=user_id, date=date_obj).first()
-        
-        if existing_score:
-            existing_score.score = score
+        connection = self.session.connection()
+        self._upsert(
+            connection, Score, {"date": date_obj, "user_id": user_id, "score": score},
+            key_columns=["date", "user_id"], update_values={Score.score: score}
+        )
+        self._record_play(connection, user_id, date_obj)
+        self._set_weekly_score(connection, user_id, date_obj, score)
+        self._bump_versions(('user_scores', user_id))
+        self.session.commit()
+        self._invalidate_user_scores(user_id)
+
+    def import_scores(self, user_id: int, entries: List) -> List[str]:
+        """
+        Apply many score writes and deletions for one user in a single
+        transaction. entries are (date, score) pairs with distinct dates, where
+        a score of None deletes that day. Returns the outcome for each entry:
+        'inserted', 'updated', 'unchanged', 'deleted' or 'not_found'.
+        """
+        if not entries:
+            return []
+        dates = [date_obj for date_obj, _ in entries]
+        existing = dict(
+            self.session.query(Score.date, Score.score)
+            .filter(Score.user_id == user_id, Score.date >= min(dates), Score.date <= max(dates))
+        )
+
+        outcomes = []
+        upserts = []
+        deletions = []
+        for date_obj, score in entries:
+            if score is None:
+                if date_obj in existing:
+                    deletions.append(date_obj)
+                    outcomes.append('deleted')
+                else:
+                    outcomes.append('not_found')
+            elif date_obj not in existing:
+                upserts.append({"date": date_obj, "user_id": user_id, "score": score})
+                outcomes.append('inserted')
+            elif existing[date_obj] != score:
+                upserts.append({"date": date_obj, "user_id": user_id, "score": score})
+                outcomes.append('updated')
+            else:
+                outcomes.append('unchanged')
+
+        if not upserts and not deletions:
+            return outcomes
+
+        connection = self.session.connection()
+        self._upsert_scores(connection, upserts)
+        for i in range(0, len(deletions), SCORES_WRITE_BATCH_SIZE):
+            connection.execute(delete(Score).where(
+                Score.user_id == user_id, Score.date.in_(deletions[i:i + SCORES_WRITE_BATCH_SIZE])
+            ))
+        changed_dates = [row["date"] for row in upserts] + deletions
+        rebuild_user_weeks(connection, user_id, {week_start(date_obj) for date_obj in changed_dates})
+        rebuild_user_rollup(connection, user_id)
+        self._bump_versions(('user_scores', user_id))
+        self.session.commit()
+        self._invalidate_user_scores(user_id)
+        return outcomes
+
+    def _upsert(self, connection, model, row: dict, key_columns: List[str], update_values: dict) -> None:
+        """
+        Insert row, or apply update_values to the existing row with the same
+        key_columns, as one INSERT ... ON CONFLICT DO UPDATE where the dialect
+        supports it. Elsewhere falls back to UPDATE then INSERT.
+        """
+        dialect_insert = UPSERT_DIALECTS.get(self.engine.dialect.name)
+        if dialect_insert is not None:
+            connection.execute(
+                dialect_insert(model).values(**row)
+                .on_conflict_do_update(index_elements=key_columns, set_=update_values)
+            )
+            return
+        updated = connection.execute(
+            update(model)
+            .where(*(getattr(model, column) == row[column] for column in key_columns))
+            .values(update_values)
+        ).rowcount
+        if not updated:
+            connection.execute(insert(model).values(**row))
+
+    def _upsert_scores(self, connection, rows: List[dict]) -> None:
+        # Insert or overwrite (date, user_id) score rows with set-based statements
+        dialect_insert = UPSERT_DIALECTS.get(self.engine.dialect.name)
+        for i in range(0, len(rows), SCORES_WRITE_BATCH_SIZE):
+            chunk = rows[i:i + SCORES_WRITE_BATCH_SIZE]
+            if dialect_insert is not None:
+                stmt = dialect_insert(Score).values(chunk)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[Score.date, Score.user_id], set_={"score": stmt.excluded.score}
+                )
+                connection.execute(stmt)
+                continue
+            for row in chunk:
+                updated = connection.execute(
+                    update(Score)
+                    .where(Score.date == row["date"], Score.user_id == row["user_id"])
+                    .values(score=row["score"])
+                ).rowcount
+                if not updated:
+                    connection.execute(insert(Score).values(**row))
+
+    def _set_weekly_score(self, connection, user_id: int, date_obj: datetime.date, score) -> None:
+        # Keep the weekly rollup in step with score; committed by the caller
+        day_column = getattr(WeeklyScore, WeeklyScore.DAY_COLUMNS[date_obj.weekday()])
+        week_criteria = (WeeklyScore.user_id == user_id, WeeklyScore.week_start == week_start(date_obj))
+        if score is not None:
+            self._upsert(
+                connection, WeeklyScore,
+                {"user_id": user_id, "week_start": week_start(date_obj), day_column.key: score},
+                key_columns=["user_id", "week_start"], update_values={day_column: score}
+            )
+            return
+        connection.execute(update(WeeklyScore).where(*week_criteria).values({day_column: None}))
+        all_days_empty = [getattr(WeeklyScore, column).is_(None) for column in WeeklyScore.DAY_COLUMNS]
+        connection.execute(delete(WeeklyScore).where(*week_criteria, *all_days_empty))
+
+    def _get_rollup_for_update(self, connection, user_id: int):
+        return connection.execute(
+            select(UserRollup.last_played, UserRollup.current_streak, UserRollup.longest_streak)
+            .where(UserRollup.user_id == user_id)
+            .with_for_update()
+        ).first()
+
+    def _record_play(self, connection, user_id: int, date_obj: datetime.date) -> None:
+        """
+        Update the user's streaks for a score just written on date_obj, before
+        weekly_score is updated. Playing on or after the last played day is
+        O(1); a new score on an earlier day may join two runs, so the streaks
+        are recomputed from the user's history. Committed by the caller.
+        """
+        rollup = self._get_rollup_for_update(connection, user_id)
+        if rollup is None:
+            current = longest = 1
+        elif date_obj > rollup.last_played:
+            current = rollup.current_streak + 1 if date_obj == rollup.last_played + datetime.timedelta(days=1) else 1
+            longest = max(rollup.longest_streak, current)
+        elif date_obj == rollup.last_played:
+            return
         else:
-            new_score = Score(
-                date=date_obj,
-                user_id=user_id,
-                score=score
+            # weekly_score still holds the day as it was before this write
+            day_column = getattr(WeeklyScore, WeeklyScore.DAY_COLUMNS[date_obj.weekday()])
+            previous = connection.execute(select(day_column).where(
+                WeeklyScore.user_id == user_id, WeeklyScore.week_start == week_start(date_obj)
+            )).scalar()
+            if previous is None:
+                rebuild_user_rollup(connection, user_id)
+            return
+        values = {"last_played": date_obj, "current_streak": current, "longest_streak": longest}
+        self._upsert(
+            connection, UserRollup, {"user_id": user_id, **values},
+            key_columns=["user_id"], update_values=values
+        )
+
+    def _remove_play(self, connection, user_id: int, date_obj: datetime.date) -> None:
+        """
+        Update the user's streaks for a score just deleted from date_obj.
+        Trimming the last day off a run that isn't the longest is O(1);
+        anything else is recomputed from the user's history. Committed by the caller.
+        """
+        rollup = self._get_rollup_for_update(connection, user_id)
+        if rollup is not None and date_obj == rollup.last_played and 1 < rollup.current_streak < rollup.longest_streak:
+            connection.execute(update(UserRollup).where(UserRollup.user_id == user_id).values(
+                last_played=date_obj - datetime.timedelta(days=1), current_streak=rollup.current_streak - 1
+            ))
+            return
+        rebuild_user_rollup(connection, user_id)
+
+    def _invalidate_user_scores(self, user_id: int) -> None:
+        group_ids = [row[0] for row in self.session.query(GroupMember.group_id).filter_by(user_id=user_id)]
+        self.scores_cache.invalidate(('personal', user_id), *(('group', group_id) for group_id in group_ids))
+
+    def _bump_versions(self, *keys) -> None:
+        # Increment the DataVersion counters for (scope, scope_id) keys; committed by the caller
+        connection = self.session.connection()
+        for scope, scope_id in keys:
+            self._upsert(
+                connection, DataVersion, {"scope": scope, "scope_id": scope_id, "version": 1},
+                key_columns=["scope", "scope_id"], update_values={DataVersion.version: DataVersion.version + 1}
             )
-            self.session.add(new_score)
-        self.session.commit()
+
+    def get_scores_versions(self, user_id: int, scope_type: str, group_id: int = None) -> List:
+        """Return the (scope, scope_id, version) counters that get_scores output depends on."""
+        if scope_type == 'group' and group_id:
+            member_ids = select(GroupMember.user_id).where(GroupMember.group_id == group_id)
+            # The caller's own membership version is included so that token
+            # claims can be checked against it without another lookup
+            condition = or_(
+                and_(DataVersion.scope == 'group', DataVersion.scope_id == group_id),
+                and_(DataVersion.scope == 'user_scores', DataVersion.scope_id.in_(member_ids)),
+                and_(DataVersion.scope == 'user', DataVersion.scope_id == user_id),
+            )
+        else:
+            condition = and_(DataVersion.scope == 'user_scores', DataVersion.scope_id == user_id)
+        return self._get_versions(condition)
+
+    def get_groups_versions(self, user_id: int) -> List:
+        """Return the (scope, scope_id, version) counters that a user's group list depends on."""
+        group_ids = select(GroupMember.group_id).where(GroupMember.user_id == user_id)
+        return self._get_versions(or_(
+            and_(DataVersion.scope == 'user', DataVersion.scope_id == user_id),
+            and_(DataVersion.scope == 'group', DataVersion.scope_id.in_(group_ids)),
+        ))
+
+    def get_membership_version(self, user_id: int) -> int:
+        version = self.session.query(DataVersion.version).filter_by(scope='user', scope_id=user_id).scalar()
+        return version or 0
+
+    def get_membership_claims(self, user_id: int):
+        """Return the user's membership version and a {group_id: role} map, for embedding in a token."""
+        roles = dict(self.session.query(GroupMember.group_id, GroupMember.role).filter_by(user_id=user_id))
+        return self.get_membership_version(user_id), roles
+
+    def _get_versions(self, condition) -> List:
+        rows = self.session.query(DataVersion.scope, DataVersion.scope_id, DataVersion.version).filter(condition)
+        return sorted(tuple(row) for row in rows)
 
     def get_users(self, user_id: int = None, scope_type: str = None, group_id: int = None) -> List[User]:
         query = self.session.query(User)
@@ -205,9 +658,43 @@ class Database:
     def get_group(self, group_id: int) -> Group:
         return self.session.query(Group).filter_by(id=group_id).first()
 
+    def get_group_with_members(self, group_id: int) -> Group:
+        """Load a group with its members and their users in one joined query."""
+        return (
+            self.session.query(Group)
+            .options(joinedload(Group.members).joinedload(GroupMember.user))
+            .filter(Group.id == group_id)
+            .one_or_none()
+        )
+
     def get_user_groups(self, user_id: int) -> List[Group]:
         return self.session.query(Group).join(GroupMember).filter(GroupMember.user_id == user_id).all()
 
+    def get_group_summaries(self, user_id: int) -> List:
+        """
+        Return one row per group the user belongs to with id, name,
+        include_historical_data, member_count, role (the user's) and
+        is_default, in a single aggregate query.
+        """
+        own_membership = aliased(GroupMember)
+        all_members = aliased(GroupMember)
+        return (
+            self.session.query(
+                Group.id,
+                Group.name,
+                Group.include_historical_data,
+                func.count(all_members.id).label('member_count'),
+                own_membership.role,
+                (User.default_group_id == Group.id).label('is_default'),
+            )
+            .join(own_membership, and_(own_membership.group_id == Group.id, own_membership.user_id == user_id))
+            .join(User, User.id == own_membership.user_id)
+            .join(all_members, all_members.group_id == Group.id)
+            .group_by(Group.id, Group.name, Group.include_historical_data, own_membership.role, User.default_group_id)
+            .order_by(Group.id)
+            .all()
+        )
+
     def get_group_by_invite_code(self, invite_code: str) -> Group:
         return self.session.query(Group).filter_by(invite_code=invite_code).first()
 
@@ -232,18 +719,21 @@ class Database:
             role='admin'
         )
         self.session.add(member)
+        self._bump_versions(('group', new_group.id), ('user', user_id))
         self.session.commit()
         return new_group
 
     def join_group(self, group_id, user_id):
         # Check capacity
         count = self.session.query(GroupMember).filter_by(group_id=group_id).count()
-        if count >= 4:
-            return False, "Group is full (maximum 4 members)"
+        if count >= GROUP_CAPACITY:
+            return False, f"Group is full (maximum {GROUP_CAPACITY} members)"
             
         member = GroupMember(group_id=group_id, user_id=user_id, role='member')
         self.session.add(member)
+        self._bump_versions(('group', group_id), ('user', user_id))
         self.session.commit()
+        self.scores_cache.invalidate(('group', group_id))
         return True, "Joined successfully"
 
     def leave_group(self, group_id, user_id):
@@ -270,7 +760,9 @@ class Database:
         if remaining == 0:
             self.session.query(Group).filter_by(id=group_id).delete()
             
+        self._bump_versions(('group', group_id), ('user', user_id))
         self.session.commit()
+        self.scores_cache.invalidate(('group', group_id))
         return True, "Left successfully"
 
     def get_group_members(self, group_id):
@@ -285,7 +777,9 @@ class Database:
             for key, value in kwargs.items():
                 if hasattr(group, key):
                     setattr(group, key, value)
+            self._bump_versions(('group', group_id))
             self.session.commit()
+            self.scores_cache.invalidate(('group', group_id))
             return True
         return False
 
@@ -295,12 +789,15 @@ class Database:
             user.default_group_id = None
         
         self.session.query(GroupMember).filter_by(group_id=group_id, user_id=user_id).delete()
+        self._bump_versions(('group', group_id), ('user', user_id))
         self.session.commit()
+        self.scores_cache.invalidate(('group', group_id))
 
     def update_member_role(self, group_id, user_id, role):
         member = self.session.query(GroupMember).filter_by(group_id=group_id, user_id=user_id).first()
         if member:
             member.role = role
+            self._bump_versions(('group', group_id), ('user', user_id))
             self.session.commit()
             return True
         return False
@@ -312,6 +809,7 @@ class Database:
             while self.session.query(Group).filter_by(invite_code=new_code).first():
                 new_code = generate_invite_code()
             group.invite_code = new_code
+            self._bump_versions(('group', group_id))
             self.session.commit()
             return new_code
         return None
@@ -321,8 +819,14 @@ class Database:
 
     def delete_score(self, date: str, user_id: int) -> None:
         date_obj = datetime.datetime.strptime(date, "%Y-%m-%d").date()
-        self.session.query(Score).filter_by(user_id=user_id, date=date_obj).delete()
+        connection = self.session.connection()
+        deleted = connection.execute(delete(Score).where(Score.user_id == user_id, Score.date == date_obj)).rowcount
+        if deleted:
+            self._remove_play(connection, user_id, date_obj)
+        self._set_weekly_score(connection, user_id, date_obj, None)
+        self._bump_versions(('user_scores', user_id))
         self.session.commit()
+        self._invalidate_user_scores(user_id)
 
     def delete_group(self, group_id: int) -> None:
         self.session.query(User).filter_by(default_group_id=group_id).update(
@@ -331,8 +835,11 @@ class Database:
         
         group = self.get_group(group_id)
         if group:
+            member_ids = [m.user_id for m in group.members]
             self.session.delete(group)
+            self._bump_versions(('group', group_id), *(('user', member_id) for member_id in member_ids))
             self.session.commit()
+            self.scores_cache.invalidate(('group', group_id))
 
     def set_default_scope(self, user_id: int, group_id: int = None) -> bool:
         user = self.get_user_by_id(user_id)
@@ -345,5 +852,29 @@ class Database:
                 return False
         
         user.default_group_id = group_id
+        self._bump_versions(('user', user_id))
         self.session.commit()
         return True
+
+    def get_wordle_answer(self, date: datetime.date) -> WordleAnswer:
+        return self.session.query(WordleAnswer).filter_by(date=date).first()
+
+    def get_wordle_answers(self, start_date: datetime.date, end_date: datetime.date) -> List[WordleAnswer]:
+        """Return the known (non-negative) answers between two dates inclusive, oldest first."""
+        return (
+            self.session.query(WordleAnswer)
+            .filter(WordleAnswer.date >= start_date, WordleAnswer.date <= end_date, WordleAnswer.answer.isnot(None))
+            .order_by(WordleAnswer.date)
+            .all()
+        )
+
+    def save_wordle_answer(self, date: datetime.date, answer: str = None) -> WordleAnswer:
+        """Record the answer for a date, or a failed lookup if answer is None."""
+        wordle_answer = self.get_wordle_answer(date)
+        if wordle_answer is None:
+            wordle_answer = WordleAnswer(date=date)
+            self.session.add(wordle_answer)
+        wordle_answer.answer = answer
+        wordle_answer.fetched_at = datetime.datetime.utcnow()
+        self.session.commit()
+        return wordle_answer
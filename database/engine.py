@@ -0,0 +1,102 @@
+"""
+Engine construction for the supported databases.
+
+File-backed SQLite gets a production profile: every pooled connection is
+switched to WAL with synchronous=NORMAL so readers never block on the single
+writer, waits on locks instead of failing immediately, and enforces foreign
+keys. Connections come from a QueuePool so each request thread holds its own.
+WAL keeps recent commits in <database>-wal beside the database file until
+they are checkpointed, so the file must live in a directory that persists
+with it; checkpoint_wal folds them in when the server stops.
+In-memory SQLite (used by the tests) keeps one shared connection, since each
+new connection would otherwise open a separate empty database.
+"""
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.pool import QueuePool, StaticPool
+
+# Applied to every new SQLite connection, in order
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,       # milliseconds
+    'cache_size': -65536,       # negative means KiB, so 64 MiB per connection
+    'mmap_size': 268435456,     # 256 MiB
+    'foreign_keys': 'ON',
+}
+
+# journal_mode and mmap_size have no effect on in-memory databases
+MEMORY_SQLITE_PRAGMAS = {
+    name: value for name, value in SQLITE_PRAGMAS.items() if name not in ('journal_mode', 'mmap_size')
+}
+
+# Connections held per process for file-backed SQLite
+SQLITE_POOL_SIZE = 10
+SQLITE_MAX_OVERFLOW = 10
+
+
+def is_memory_sqlite(database_url: str) -> bool:
+    url = make_url(database_url)
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def _apply_pragmas(engine: Engine, pragmas: dict) -> None:
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+
+
+def checkpoint_wal(engine: Engine) -> None:
+    """
+    Copy every commit in the write-ahead log into the database file and empty
+    the log, so the database file alone is complete. Only file-backed SQLite
+    has a log to checkpoint; other engines are left alone.
+    """
+    if engine.dialect.name != 'sqlite' or is_memory_sqlite(engine.url):
+        return
+    with engine.connect() as connection:
+        connection.exec_driver_sql('PRAGMA wal_checkpoint(TRUNCATE)')
+
+
+def create_database_engine(database_url: str) -> Engine:
+    if make_url(database_url).get_backend_name() != 'sqlite':
+        # For other databases (PostgreSQL, MySQL, etc.)
+        return create_engine(
+            database_url,
+            echo=False,
+            pool_size=5,
+            max_overflow=10,
+            pool_timeout=30,
+            pool_recycle=1800,
+            pool_pre_ping=True
+        )
+
+    if is_memory_sqlite(database_url):
+        engine = create_engine(
+            database_url,
+            echo=False,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool
+        )
+        _apply_pragmas(engine, MEMORY_SQLITE_PRAGMAS)
+        return engine
+
+    # The pool hands each connection to one thread at a time, so sqlite3's
+    # same-thread check only gets in the way of returning it to the pool
+    engine = create_engine(
+        database_url,
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=QueuePool,
+        pool_size=SQLITE_POOL_SIZE,
+        max_overflow=SQLITE_MAX_OVERFLOW,
+        pool_timeout=30
+    )
+    _apply_pragmas(engine, SQLITE_PRAGMAS)
+    return engine
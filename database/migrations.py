@@ -0,0 +1,97 @@
+"""
+Versioned schema migrations.
+
+Base.metadata.create_all only creates tables that are missing, so anything
+that changes an existing table (indexes, columns, backfills) is written as a
+numbered migration here. Applied versions are recorded in the schema_version
+table and each migration runs in its own transaction, so a database file can
+be upgraded in place at startup or with scripts/migrate_db.py.
+
+Migrations must be idempotent against a freshly created schema, because
+create_all already builds everything declared on the models.
+"""
+import datetime
+from typing import Callable, List, NamedTuple
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from database.models.UserRollup import UserRollup
+from database.rollups import rebuild_user_rollups, rebuild_weekly_scores
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+
+
+MIGRATIONS: List[Migration] = []
+
+schema_version = Table(
+    'schema_version', MetaData(),
+    Column('version', Integer, primary_key=True),
+    Column('description', String(255), nullable=False),
+    Column('applied_at', DateTime, nullable=False),
+)
+
+
+def migration(version: int, description: str):
+    """Register the decorated function as the migration for version."""
+    def register(func: Callable[[Connection], None]):
+        if any(m.version == version for m in MIGRATIONS):
+            raise ValueError(f"Duplicate migration version {version}")
+        MIGRATIONS.append(Migration(version, description, func))
+        MIGRATIONS.sort(key=lambda m: m.version)
+        return func
+    return register
+
+
+def get_applied_versions(engine: Engine) -> List[int]:
+    schema_version.create(engine, checkfirst=True)
+    with engine.connect() as connection:
+        return [row[0] for row in connection.execute(select(schema_version.c.version))]
+
+
+def run_migrations(engine: Engine) -> List[Migration]:
+    """Apply all pending migrations in version order and return them."""
+    applied_versions = set(get_applied_versions(engine))
+    applied = []
+    for pending in MIGRATIONS:
+        if pending.version in applied_versions:
+            continue
+        with engine.begin() as connection:
+            pending.apply(connection)
+            connection.execute(schema_version.insert().values(
+                version=pending.version,
+                description=pending.description,
+                applied_at=datetime.datetime.utcnow()
+            ))
+        applied.append(pending)
+    return applied
+
+
+@migration(1, "Add lookup indexes on score, group_member and user")
+def add_lookup_indexes(connection: Connection) -> None:
+    # score(user_id, date, score) covers the personal and group score reads;
+    # group_member(user_id, group_id) serves get_user_groups
+    connection.execute(text(
+        'CREATE INDEX IF NOT EXISTS ix_score_user_date_score ON score (user_id, date, score)'
+    ))
+    connection.execute(text(
+        'CREATE INDEX IF NOT EXISTS ix_group_member_user_group ON group_member (user_id, group_id)'
+    ))
+    connection.execute(text(
+        'CREATE INDEX IF NOT EXISTS ix_user_default_group_id ON "user" (default_group_id)'
+    ))
+
+
+@migration(2, "Backfill weekly_score rollup from score")
+def backfill_weekly_scores(connection: Connection) -> None:
+    rebuild_weekly_scores(connection)
+
+
+@migration(3, "Add user_rollup and backfill streaks from score")
+def backfill_user_rollups(connection: Connection) -> None:
+    UserRollup.__table__.create(connection, checkfirst=True)
+    rebuild_user_rollups(connection)
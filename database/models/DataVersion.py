@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String
+
+from database.models.base import Base
+
+class DataVersion(Base):
+    """
+    Change counter for a slice of data, bumped whenever it is written so that
+    readers can tell cheaply whether anything has changed. Scopes:
+    'user_scores' (a user's scores), 'group' (a group's settings and members)
+    and 'user' (a user's group memberships and default scope).
+    """
+    __tablename__ = 'data_version'
+    scope = Column(String(20), primary_key=True)
+    scope_id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, relationship
 
 from database.models.base import Base
@@ -13,7 +13,10 @@ class GroupMember(Base):
     role = Column(String(10), nullable=False, default='member')  # 'admin' or 'member'
     joined_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     
-    __table_args__ = (UniqueConstraint('group_id', 'user_id'),)
+    __table_args__ = (
+        UniqueConstraint('group_id', 'user_id'),
+        Index('ix_group_member_user_group', 'user_id', 'group_id'),
+    )
     
     # Relationships
     group: Mapped['Group'] = relationship('Group', back_populates='members')
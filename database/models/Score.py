@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Date, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy import Column, Date, ForeignKey, Index, Integer, UniqueConstraint
 from sqlalchemy.orm import Mapped, relationship
 
 from database.models.base import Base
@@ -11,7 +11,10 @@ class Score(Base):
     user_id = Column(Integer, ForeignKey('user.id'))  # Foreign Key
     score = Column(Integer)
     
-    __table_args__ = (UniqueConstraint('date', 'user_id', name='uq_score_date_user'),)
+    __table_args__ = (
+        UniqueConstraint('date', 'user_id', name='uq_score_date_user'),
+        Index('ix_score_user_date_score', 'user_id', 'date', 'score'),
+    )
 
     # Relationship to User
     user: Mapped['User'] = relationship('User', back_populates='scores')
\ No newline at end of file
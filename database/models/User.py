@@ -1,6 +1,6 @@
 from typing import List
 
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import Mapped, relationship
 
 from database.models.base import Base
@@ -14,6 +14,8 @@ class User(Base):
     password_hash = Column(String(255), nullable=False)
     default_group_id = Column(Integer, ForeignKey('group.id', ondelete='SET NULL'), nullable=True)
     
+    __table_args__ = (Index('ix_user_default_group_id', 'default_group_id'),)
+    
     # Relationships
     scores: Mapped[List['Score']] = relationship('Score', back_populates='user')
     group_memberships: Mapped[List['GroupMember']] = relationship('GroupMember', back_populates='user')
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Date, ForeignKey, Integer
+
+from database.models.base import Base
+
+class UserRollup(Base):
+    """
+    Per-user play streaks, maintained alongside Score. current_streak is the
+    run of consecutive days played ending on last_played, whether or not that
+    run is still alive today. Users with no scores have no row.
+    """
+    __tablename__ = 'user_rollup'
+    user_id = Column(Integer, ForeignKey('user.id'), primary_key=True)
+    last_played = Column(Date, nullable=False)
+    current_streak = Column(Integer, nullable=False)
+    longest_streak = Column(Integer, nullable=False)
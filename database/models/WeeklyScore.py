@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Date, ForeignKey, Integer, UniqueConstraint
+
+from database.models.base import Base
+
+class WeeklyScore(Base):
+    """Rollup of a user's scores for one week, maintained alongside Score."""
+    __tablename__ = 'weekly_score'
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey('user.id'), nullable=False)
+    week_start = Column(Date, nullable=False)  # Monday of the week
+    # Score for each day of the week, Monday (day_0) to Sunday (day_6)
+    day_0 = Column(Integer)
+    day_1 = Column(Integer)
+    day_2 = Column(Integer)
+    day_3 = Column(Integer)
+    day_4 = Column(Integer)
+    day_5 = Column(Integer)
+    day_6 = Column(Integer)
+
+    __table_args__ = (UniqueConstraint('user_id', 'week_start', name='uq_weekly_score_user_week'),)
+
+    DAY_COLUMNS = tuple(f'day_{i}' for i in range(7))
+
+    @property
+    def days(self):
+        return [getattr(self, column) for column in self.DAY_COLUMNS]
@@ -0,0 +1,15 @@
+from datetime import datetime
+from sqlalchemy import Column, Date, DateTime, String
+
+from database.models.base import Base
+
+class WordleAnswer(Base):
+    """
+    Wordle answer for a date, as scraped. answer is NULL when the last
+    lookup failed; such rows are negative cache entries that are retried
+    once they are older than the negative cache period.
+    """
+    __tablename__ = 'wordle_answer'
+    date = Column(Date, primary_key=True)
+    answer = Column(String(5))
+    fetched_at = Column(DateTime, nullable=False, default=datetime.utcnow)
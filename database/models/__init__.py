@@ -2,4 +2,8 @@ from database.models.base import Base
 from database.models.User import User
 from database.models.Score import Score
 from database.models.Group import Group
-from database.models.GroupMember import GroupMember
\ No newline at end of file
+from database.models.GroupMember import GroupMember
+from database.models.WeeklyScore import WeeklyScore
+from database.models.DataVersion import DataVersion
+from database.models.WordleAnswer import WordleAnswer
+from database.models.UserRollup import UserRollup
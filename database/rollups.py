@@ -0,0 +1,188 @@
+"""
+Maintenance for the weekly_score and user_rollup rollups.
+
+Database.add_score and Database.delete_score keep both in step with score
+inside the same transaction. The functions here rebuild them from scratch
+(for backfills and historical edits) and compare them against the raw scores.
+"""
+from itertools import groupby
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+import datetime
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.engine import Connection
+
+from database.models.Score import Score
+from database.models.UserRollup import UserRollup
+from database.models.WeeklyScore import WeeklyScore
+from utils.dates import week_start
+
+# Rows inserted per executemany batch during a rebuild
+REBUILD_BATCH_SIZE = 5000
+
+WeekKey = Tuple[int, datetime.date]
+
+
+class RollupMismatch(NamedTuple):
+    user_id: int
+    week_start: datetime.date
+    expected: List
+    actual: List
+
+
+class Streaks(NamedTuple):
+    last_played: datetime.date
+    current_streak: int
+    longest_streak: int
+
+
+class StreakMismatch(NamedTuple):
+    user_id: int
+    expected: Optional[Streaks]
+    actual: Optional[Streaks]
+
+
+def _weekly_scores_from_raw(connection: Connection) -> Dict[WeekKey, List]:
+    weeks = {}
+    rows = connection.execute(
+        select(Score.user_id, Score.date, Score.score).execution_options(yield_per=REBUILD_BATCH_SIZE)
+    )
+    for user_id, score_date, score in rows:
+        if score is None:
+            continue
+        key = (user_id, week_start(score_date))
+        weeks.setdefault(key, [None] * 7)[score_date.weekday()] = score
+    return weeks
+
+
+def _weekly_scores_from_rollup(connection: Connection) -> Dict[WeekKey, List]:
+    columns = [getattr(WeeklyScore, column) for column in WeeklyScore.DAY_COLUMNS]
+    rows = connection.execute(select(WeeklyScore.user_id, WeeklyScore.week_start, *columns))
+    return {(row[0], row[1]): list(row[2:]) for row in rows}
+
+
+def rebuild_weekly_scores(connection: Connection) -> int:
+    """Replace the contents of weekly_score with rollups of score. Returns the row count."""
+    weeks = _weekly_scores_from_raw(connection)
+    connection.execute(delete(WeeklyScore))
+    rows = [
+        {"user_id": user_id, "week_start": week, **dict(zip(WeeklyScore.DAY_COLUMNS, days))}
+        for (user_id, week), days in weeks.items()
+    ]
+    for i in range(0, len(rows), REBUILD_BATCH_SIZE):
+        connection.execute(insert(WeeklyScore), rows[i:i + REBUILD_BATCH_SIZE])
+    return len(rows)
+
+
+def check_weekly_scores(connection: Connection) -> List[RollupMismatch]:
+    """Return every week where weekly_score disagrees with score."""
+    expected = _weekly_scores_from_raw(connection)
+    actual = _weekly_scores_from_rollup(connection)
+    empty = [None] * 7
+    mismatches = []
+    for key in sorted(expected.keys() | actual.keys()):
+        expected_days = expected.get(key, empty)
+        actual_days = actual.get(key, empty)
+        if expected_days != actual_days:
+            mismatches.append(RollupMismatch(key[0], key[1], expected_days, actual_days))
+    return mismatches
+
+
+def rebuild_user_weeks(connection: Connection, user_id: int, week_starts) -> None:
+    """Recompute a user's weekly_score rows for the given weeks from score."""
+    week_starts = sorted(set(week_starts))
+    if not week_starts:
+        return
+    wanted = set(week_starts)
+    weeks = {}
+    rows = connection.execute(
+        select(Score.date, Score.score).where(
+            Score.user_id == user_id,
+            Score.date >= week_starts[0],
+            Score.date < week_starts[-1] + datetime.timedelta(days=7),
+        )
+    )
+    for score_date, score in rows:
+        week = week_start(score_date)
+        if score is None or week not in wanted:
+            continue
+        weeks.setdefault(week, [None] * 7)[score_date.weekday()] = score
+
+    for i in range(0, len(week_starts), REBUILD_BATCH_SIZE):
+        connection.execute(delete(WeeklyScore).where(
+            WeeklyScore.user_id == user_id,
+            WeeklyScore.week_start.in_(week_starts[i:i + REBUILD_BATCH_SIZE]),
+        ))
+    if weeks:
+        connection.execute(insert(WeeklyScore), [
+            {"user_id": user_id, "week_start": week, **dict(zip(WeeklyScore.DAY_COLUMNS, days))}
+            for week, days in weeks.items()
+        ])
+
+
+def compute_streaks(dates: Iterable[datetime.date]) -> Optional[Streaks]:
+    """Streaks for a user who played on the given distinct dates, in ascending order, or None if there are none."""
+    last_played = None
+    current = longest = 0
+    for date in dates:
+        if last_played is not None and date == last_played + datetime.timedelta(days=1):
+            current += 1
+        else:
+            current = 1
+        longest = max(longest, current)
+        last_played = date
+    return Streaks(last_played, current, longest) if last_played else None
+
+
+def _played_dates(connection: Connection, *criteria):
+    # (user_id, date) for every scored day, ordered for grouping by user
+    return connection.execute(
+        select(Score.user_id, Score.date)
+        .where(Score.score.is_not(None), *criteria)
+        .order_by(Score.user_id, Score.date)
+        .execution_options(yield_per=REBUILD_BATCH_SIZE)
+    )
+
+
+def _streaks_from_raw(connection: Connection, *criteria) -> Dict[int, Streaks]:
+    return {
+        user_id: compute_streaks(date for _, date in rows)
+        for user_id, rows in groupby(_played_dates(connection, *criteria), key=lambda row: row[0])
+    }
+
+
+def _streaks_from_rollup(connection: Connection) -> Dict[int, Streaks]:
+    rows = connection.execute(select(
+        UserRollup.user_id, UserRollup.last_played, UserRollup.current_streak, UserRollup.longest_streak
+    ))
+    return {row[0]: Streaks(*row[1:]) for row in rows}
+
+
+def rebuild_user_rollups(connection: Connection) -> int:
+    """Replace the contents of user_rollup with streaks computed from score. Returns the row count."""
+    streaks = _streaks_from_raw(connection)
+    connection.execute(delete(UserRollup))
+    rows = [{"user_id": user_id, **user_streaks._asdict()} for user_id, user_streaks in streaks.items()]
+    for i in range(0, len(rows), REBUILD_BATCH_SIZE):
+        connection.execute(insert(UserRollup), rows[i:i + REBUILD_BATCH_SIZE])
+    return len(rows)
+
+
+def rebuild_user_rollup(connection: Connection, user_id: int) -> Optional[Streaks]:
+    """Recompute one user's streaks from their whole score history."""
+    streaks = _streaks_from_raw(connection, Score.user_id == user_id).get(user_id)
+    connection.execute(delete(UserRollup).where(UserRollup.user_id == user_id))
+    if streaks is not None:
+        connection.execute(insert(UserRollup).values(user_id=user_id, **streaks._asdict()))
+    return streaks
+
+
+def check_user_rollups(connection: Connection) -> List[StreakMismatch]:
+    """Return every user whose user_rollup row disagrees with score."""
+    expected = _streaks_from_raw(connection)
+    actual = _streaks_from_rollup(connection)
+    return [
+        StreakMismatch(user_id, expected.get(user_id), actual.get(user_id))
+        for user_id in sorted(expected.keys() | actual.keys())
+        if expected.get(user_id) != actual.get(user_id)
+    ]
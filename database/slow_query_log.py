@@ -0,0 +1,192 @@
+"""
+Opt-in log of slow SQL statements.
+
+SlowQueryLog hooks an engine's before/after_cursor_execute events and writes
+one JSON object per line for every statement that takes at least the
+threshold: the SQL, the shape of its parameters (types only, never values),
+the Database method and route that issued it, and how long it took. The first
+time a statement is seen to be slow, its plan is captured with EXPLAIN QUERY
+PLAN (SQLite) or EXPLAIN (PostgreSQL); on SQLite the tables it scans in full
+are listed under full_scans.
+
+Every gunicorn worker appends to the same file, so the log is not rotated in
+process (each worker would rotate it on its own). Rotate it externally, for
+example with logrotate; the file is reopened once it has been moved away.
+
+    SLOW_QUERY_LOG=logs/slow_queries.log SLOW_QUERY_THRESHOLD_MS=50
+"""
+import datetime
+import json
+import logging
+from logging.handlers import WatchedFileHandler
+import os
+import re
+import sys
+import threading
+import time
+
+from flask import has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# How many distinct statements to remember as already explained
+PLAN_CACHE_SIZE = 1000
+
+EXPLAIN_PREFIXES = {
+    'sqlite': 'EXPLAIN QUERY PLAN ',
+    'postgresql': 'EXPLAIN ',
+}
+
+# Only these statements are explained; EXPLAIN on anything else is an error or meaningless
+EXPLAINABLE = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH')
+
+# Dialects where a failed statement aborts the surrounding transaction, so the
+# EXPLAIN runs inside a savepoint that is rolled back if it fails
+SAVEPOINT_DIALECTS = {'postgresql'}
+EXPLAIN_SAVEPOINT = 'slow_query_explain'
+
+# SQLite plan lines that read a whole table (or a whole index, which is as bad
+# for big tables). SCAN CONSTANT ROW reads no table at all.
+SQLITE_FULL_SCAN = re.compile(r'^SCAN (?!CONSTANT ROW)(?:TABLE )?(\w+)')
+
+DATABASE_SOURCE = os.path.join('database', 'Database.py')
+
+
+def _type_name(value) -> str:
+    return 'null' if value is None else type(value).__name__
+
+
+def parameters_shape(parameters, executemany: bool = False):
+    """Describe parameters by type so that logs never contain user data."""
+    if executemany:
+        rows = list(parameters)
+        return {'rows': len(rows), 'row': parameters_shape(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: _type_name(value) for key, value in parameters.items()}
+    return [_type_name(value) for value in parameters or ()]
+
+
+def calling_database_method():
+    """Name of the innermost Database method on the current call stack, if any."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        # Private helpers and comprehensions are attributed to the public method that called them
+        name = frame.f_code.co_name
+        if frame.f_code.co_filename.endswith(DATABASE_SOURCE) and name[0] not in '_<':
+            return name
+        frame = frame.f_back
+    return None
+
+
+def current_route():
+    if not has_request_context():
+        return None
+    rule = request.url_rule.rule if request.url_rule is not None else request.path
+    return f"{request.method} {rule}"
+
+
+def create_file_logger(path: str) -> logging.Logger:
+    """
+    A logger appending bare messages to a file, apart from the root logger.
+    The file is opened on first write, and reopened if it has been rotated.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    logger = logging.getLogger(f'wordlewise.slow_queries.{os.path.abspath(path)}')
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    if not logger.handlers:
+        handler = WatchedFileHandler(path, encoding='utf-8', delay=True)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+    return logger
+
+
+class SlowQueryLog:
+    """
+    Logs statements slower than threshold_ms to logger. Statements already
+    explained are remembered by their SQL text, so each plan is captured once
+    per process.
+    """
+
+    def __init__(self, logger: logging.Logger, threshold_ms: float = 100, explain: bool = True,
+                 clock=time.perf_counter) -> None:
+        self.logger = logger
+        self.threshold = threshold_ms / 1000
+        self.explain = explain
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._explained = set()
+
+    def attach(self, engine: Engine) -> None:
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def detach(self, engine: Engine) -> None:
+        event.remove(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.remove(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        context.slow_query_started_at = self._clock()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        started_at = getattr(context, 'slow_query_started_at', None)
+        if started_at is None:
+            return
+        elapsed = self._clock() - started_at
+        if elapsed < self.threshold:
+            return
+
+        record = {
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='milliseconds'),
+            'duration_ms': round(elapsed * 1000, 3),
+            'statement': ' '.join(statement.split()),
+            'parameters': parameters_shape(parameters, executemany),
+            'method': calling_database_method(),
+            'route': current_route(),
+        }
+        if self.explain and self._first_sighting(statement):
+            record.update(self._plan(conn, statement, parameters, executemany))
+        self.logger.info(json.dumps(record, default=str))
+
+    def _first_sighting(self, statement: str) -> bool:
+        with self._lock:
+            if statement in self._explained:
+                return False
+            if len(self._explained) >= PLAN_CACHE_SIZE:
+                self._explained.clear()
+            self._explained.add(statement)
+            return True
+
+    def _plan(self, conn, statement: str, parameters, executemany: bool) -> dict:
+        prefix = EXPLAIN_PREFIXES.get(conn.dialect.name)
+        if prefix is None or not statement.lstrip().upper().startswith(EXPLAINABLE):
+            return {}
+        if executemany:
+            parameters = next(iter(parameters), ())
+        # A raw cursor on the same connection, so the plan sees the same
+        # transaction and these events don't fire for the EXPLAIN itself
+        savepoint = conn.dialect.name in SAVEPOINT_DIALECTS
+        cursor = conn.connection.driver_connection.cursor()
+        try:
+            if savepoint:
+                cursor.execute(f'SAVEPOINT {EXPLAIN_SAVEPOINT}')
+            try:
+                cursor.execute(prefix + statement, parameters)
+                rows = cursor.fetchall()
+            except Exception:
+                if savepoint:
+                    cursor.execute(f'ROLLBACK TO SAVEPOINT {EXPLAIN_SAVEPOINT}')
+                raise
+            if savepoint:
+                cursor.execute(f'RELEASE SAVEPOINT {EXPLAIN_SAVEPOINT}')
+        except Exception as e:
+            return {'plan_error': str(e)}
+        finally:
+            cursor.close()
+
+        if conn.dialect.name == 'sqlite':
+            plan = [row[-1] for row in rows]
+            full_scans = sorted({m.group(1) for m in map(SQLITE_FULL_SCAN.match, plan) if m})
+            return {'plan': plan, 'full_scans': full_scans}
+        return {'plan': [row[0] for row in rows]}
@@ -1,12 +1,31 @@
 #!/bin/bash
 set -e
 
+DATABASE_URL="${DATABASE_URL:-sqlite:///wordlewise.db}"
+DATABASE_FILE="${DATABASE_URL#sqlite:///}"
+
+# Databases used to be mounted as a single file at /app/wordlewise.db. If one is
+# still mounted there and the configured database doesn't exist yet, copy it
+# (with any WAL files) into place rather than starting on an empty database.
+LEGACY_DATABASE_FILE="/app/wordlewise.db"
+if [ "$DATABASE_URL" != "${DATABASE_URL#sqlite:///}" ] && [ ! -f "$DATABASE_FILE" ] \
+    && [ -f "$LEGACY_DATABASE_FILE" ] && [ -s "$LEGACY_DATABASE_FILE" ] \
+    && [ "$(realpath -m "$DATABASE_FILE")" != "$LEGACY_DATABASE_FILE" ]; then
+    echo "Copying existing database from $LEGACY_DATABASE_FILE to $DATABASE_FILE..."
+    mkdir -p "$(dirname "$DATABASE_FILE")"
+    for suffix in "" "-wal" "-shm"; do
+        if [ -f "$LEGACY_DATABASE_FILE$suffix" ]; then
+            cp -p "$LEGACY_DATABASE_FILE$suffix" "$DATABASE_FILE$suffix"
+        fi
+    done
+fi
+
 # Check if we are in development mode
 if [ "$FLASK_ENV" = "development" ]; then
     echo "Environment: development"
     
     # Check if database exists
-    if [ ! -f "wordlewise.db" ]; then
+    if [ ! -f "$DATABASE_FILE" ]; then
         echo "Database file not found. Initializing and seeding database..."
         uv run scripts/seed_db.py --force
     else
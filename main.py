@@ -1,7 +1,7 @@
 from config.app import create_app
+from config.server import run_server
 
 app = create_app()
 
 if __name__ == '__main__':
-    print("Starting server...")
-    app.run(host="0.0.0.0", port=5000)
+    run_server(app)
@@ -1,12 +1,16 @@
 import datetime
 from flask import Blueprint, jsonify, request, current_app
-from flask_jwt_extended import create_access_token
 
 from config.limiter import limiter
+from utils.auth_helpers import create_user_token
+from utils.password_hasher import PasswordHasherBusy
 from utils.serializers import serialise_user
 
 auth_bp = Blueprint('auth', __name__)
 
+def busy_response(e):
+    return jsonify({'success': False, 'error': str(e), 'access_token': None, 'user': None}), 503
+
 @auth_bp.route('/login', methods=['POST'])
 @limiter.limit("5 per minute")
 def login():
@@ -16,8 +20,10 @@ def login():
     password = data['password']
     try:
         user = database.login(username, password)
-        access_token = create_access_token(identity=username, expires_delta=datetime.timedelta(minutes=30))
+        access_token = create_user_token(database, user, datetime.timedelta(minutes=30))
         return jsonify({'success': True, 'error': None, 'access_token': access_token, 'user': serialise_user(user)})
+    except PasswordHasherBusy as e:
+        return busy_response(e)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e), 'access_token': None, 'user': None})
 
@@ -44,7 +50,9 @@ def register():
 
     try:
         user = database.register_user(username, password, forename)
-        access_token = create_access_token(identity=username, expires_delta=datetime.timedelta(minutes=30))
+        access_token = create_user_token(database, user, datetime.timedelta(minutes=30))
         return jsonify({'success': True, 'error': None, 'access_token': access_token, 'user': serialise_user(user)})
+    except PasswordHasherBusy as e:
+        return busy_response(e)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
@@ -1,7 +1,11 @@
 from flask import Blueprint, jsonify, request, current_app
 from flask_jwt_extended import jwt_required
 
-from utils.auth_helpers import get_current_user, require_group_member, require_group_admin
+from utils.auth_helpers import (
+    get_authenticated_user, get_current_user, require_group_admin,
+    require_loaded_group_admin, require_loaded_group_member
+)
+from utils.etag import compute_etag, not_modified_response, with_etag
 
 groups_bp = Blueprint('groups', __name__)
 
@@ -10,22 +14,24 @@ groups_bp = Blueprint('groups', __name__)
 def get_groups():
     database = current_app.config['database']
     try:
-        user = get_current_user(database)
-        groups = database.get_user_groups(user.id)
+        user = get_authenticated_user(database)
+
+        etag = compute_etag(user.id, database.get_groups_versions(user.id))
+        not_modified = not_modified_response(etag)
+        if not_modified is not None:
+            return not_modified
 
         result = []
-        for group in groups:
-            membership = database.get_membership(group.id, user.id)
-            member_count = len(group.members)
+        for group in database.get_group_summaries(user.id):
             result.append({
                 "id": group.id,
                 "name": group.name,
-                "member_count": member_count,
-                "role": membership.role,
+                "member_count": group.member_count,
+                "role": group.role,
                 "include_historical_data": bool(group.include_historical_data),
-                "is_default": user.default_group_id == group.id
+                "is_default": bool(group.is_default)
             })
-        return jsonify(result)
+        return with_etag(jsonify(result), etag)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -71,10 +77,10 @@ def create_group():
 def get_group_details(group_id):
     database = current_app.config['database']
     try:
-        user = get_current_user(database)
-        membership = require_group_member(database, group_id, user)
+        user = get_authenticated_user(database)
+        group = database.get_group_with_members(group_id)
+        membership = require_loaded_group_member(group, user)
 
-        group = database.get_group(group_id)
         members = []
         for m in group.members:
             members.append({
@@ -214,7 +220,8 @@ def update_member_role(group_id, member_id):
     database = current_app.config['database']
     try:
         user = get_current_user(database)
-        require_group_admin(database, group_id, user)
+        group = database.get_group_with_members(group_id)
+        require_loaded_group_admin(group, user)
 
         if user.id == member_id:
              return jsonify({"success": False, "error": "Cannot change your own role."}), 400
@@ -224,9 +231,9 @@ def update_member_role(group_id, member_id):
             return jsonify({"success": False, "error": "Invalid role"}), 400
 
         if role == 'member':
-            target_membership = database.get_membership(group_id, member_id)
-            if target_membership.role == 'admin':
-                admins = [m for m in database.get_group(group_id).members if m.role == 'admin']
+            target_membership = next((m for m in group.members if m.user_id == member_id), None)
+            if target_membership and target_membership.role == 'admin':
+                admins = [m for m in group.members if m.role == 'admin']
                 if len(admins) <= 1:
                      return jsonify({"success": False, "error": "Cannot demote last admin."}), 400
 
@@ -0,0 +1,20 @@
+import hmac
+from http import HTTPStatus
+
+from flask import Blueprint, Response, current_app, jsonify, request
+
+metrics_bp = Blueprint('metrics', __name__)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    # With METRICS_TOKEN set, scrapers must send it as a bearer token. Compared
+    # as bytes, since compare_digest rejects str holding non-ASCII characters
+    token = current_app.config['METRICS_TOKEN']
+    if token:
+        supplied = request.headers.get('Authorization', '').encode('utf-8', errors='replace')
+        if not hmac.compare_digest(supplied, f'Bearer {token}'.encode('utf-8')):
+            return jsonify({'error': 'Unauthorized'}), HTTPStatus.UNAUTHORIZED
+
+    return Response(current_app.config['metrics'].render(), content_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,21 +1,51 @@
+import datetime
 from flask import Blueprint, jsonify, request, current_app
 from flask_jwt_extended import jwt_required
 from http import HTTPStatus
 
-from utils.auth_helpers import get_current_user, require_group_member
+from database.Database import MAX_GUESSES
+from utils.auth_helpers import get_authenticated_user, remember_membership_version, require_group_member
+from utils.etag import compute_etag, not_modified_response, with_etag
+from utils.timezones import InvalidTimezone, get_timezone, today_in
 
 scores_bp = Blueprint('scores', __name__)
 
+PAGINATION_PARAMS = ('from', 'to', 'limit', 'cursor')
+
+# Response layouts for GET /scores; weeks is the default
+SCORES_FORMATS = ('weeks', 'columnar')
+
+# Largest page of weeks GET /scores returns; bigger limits are clamped to it
+MAX_PAGE_WEEKS = 520
+
+# Most entries accepted by one POST /scores/batch (over five years of days)
+MAX_BATCH_SIZE = 5000
+
+# Scores accepted by POST /scores/batch: the guesses taken, or one more for a failed game
+MIN_SCORE = 1
+MAX_SCORE = MAX_GUESSES + 1
+
+def parse_date_param(name):
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError(f"{name} must be a date in YYYY-MM-DD format")
+
 @scores_bp.route('/scores', methods=['GET'])
 @jwt_required()
 def get_scores():
     database = current_app.config['database']
     try:
-        user = get_current_user(database)
+        user = get_authenticated_user(database)
         
-        timezone = request.args.get('timezone')
-        if timezone:
-            database.set_timezone(timezone)
+        timezone = request.args.get('timezone') or None
+        try:
+            today = today_in(timezone)
+        except InvalidTimezone as e:
+            return jsonify({'error': str(e)}), 400
 
         scope_type = request.args.get('scope', 'personal')
         group_id = request.args.get('groupId')
@@ -23,13 +53,72 @@ def get_scores():
         if group_id:
             group_id = int(group_id)
 
+        if scope_type == 'group' and not group_id:
+            return jsonify({'error': 'Group ID required for group scope'}), 400
+
+        response_format = request.args.get('format', 'weeks')
+        if response_format not in SCORES_FORMATS:
+            return jsonify({'error': f"format must be one of: {', '.join(SCORES_FORMATS)}"}), 400
+        columnar = response_format == 'columnar'
+
+        # One lookup fetches the counters for the ETag and, for group scope,
+        # the caller's membership version used to validate their token claims
+        versions = database.get_scores_versions(user.id, scope_type, group_id)
         if scope_type == 'group':
-            if not group_id:
-                return jsonify({'error': 'Group ID required for group scope'}), 400
+            remember_membership_version(user.id, versions)
             require_group_member(database, group_id, user)
 
-        all_weeks = database.get_scores(user.id, scope_type, group_id)
-        return jsonify(all_weeks)
+        # Windowed/paginated requests get an envelope with a cursor for the next page
+        paginated = any(param in request.args for param in PAGINATION_PARAMS)
+        start_date = end_date = limit = None
+        if paginated:
+            try:
+                start_date = parse_date_param('from')
+                end_date = parse_date_param('cursor') or parse_date_param('to')
+                limit = request.args.get('limit', type=int)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            if 'limit' in request.args and (limit is None or limit < 1):
+                return jsonify({'error': 'limit must be a positive integer'}), 400
+            if limit is not None:
+                limit = min(limit, MAX_PAGE_WEEKS)
+
+        # The response only changes when a version counter moves or the current
+        # week does. The caller's membership version is left out so that every
+        # member of a group gets the same tag. The query parameters (including
+        # format) keep each layout under its own tag and cache entry.
+        etag = compute_etag(
+            [v for v in versions if v[0] != 'user'],
+            str(today),
+            sorted(request.args.items(multi=True))
+        )
+        not_modified = not_modified_response(etag)
+        if not_modified is not None:
+            return not_modified
+
+        # Group views are shared by every member, so the cache is keyed on the
+        # group rather than the caller. The ETag already covers the version
+        # counters (including group settings such as include_historical_data),
+        # the current date and the query parameters.
+        cache_tag = ('group', group_id) if scope_type == 'group' else ('personal', user.id)
+        cache_key = (cache_tag, etag)
+        body = database.scores_cache.get(cache_key)
+        cache_status = 'HIT'
+        if body is None:
+            cache_status = 'MISS'
+            if paginated or columnar:
+                payload = database.get_scores_page(
+                    user.id, scope_type, group_id, start_date, end_date, limit,
+                    timezone=timezone, columnar=columnar
+                )
+            else:
+                payload = database.get_scores(user.id, scope_type, group_id, timezone=timezone)
+            body = current_app.json.dumps(payload)
+            database.scores_cache.set(cache_key, body, tags=[cache_tag])
+
+        resp = current_app.response_class(body, mimetype='application/json')
+        resp.headers['X-Cache'] = cache_status
+        return with_etag(resp, etag)
     except Exception as e:
         print(e)
         if hasattr(e, 'code'):
@@ -41,9 +130,10 @@ def get_scores():
 def add_score():
     database = current_app.config['database']
     try:
-        user = get_current_user(database)
+        user = get_authenticated_user(database)
         data = request.json
-        database.set_timezone(data['timezone'])
+        if data.get('timezone'):
+            get_timezone(data['timezone'])
 
         score = data.get('score')
         if score is None:
@@ -54,6 +144,65 @@ def add_score():
         resp = jsonify('')
         resp.headers.add('Access-Control-Allow-Origin', '*')
         return resp
+    except InvalidTimezone as e:
+        return jsonify(str(e)), HTTPStatus.BAD_REQUEST
     except Exception as e:
         print(e)
         return jsonify(str(e)), HTTPStatus.INTERNAL_SERVER_ERROR
+
+@scores_bp.route('/scores/batch', methods=['POST'])
+@jwt_required()
+def import_scores():
+    database = current_app.config['database']
+    try:
+        user = get_authenticated_user(database)
+        data = request.get_json(silent=True)
+        entries = data.get('scores') if isinstance(data, dict) else None
+        if not isinstance(entries, list) or not entries:
+            return jsonify({'success': False, 'error': 'scores must be a non-empty list'}), HTTPStatus.BAD_REQUEST
+        if len(entries) > MAX_BATCH_SIZE:
+            return jsonify({
+                'success': False, 'error': f'At most {MAX_BATCH_SIZE} scores can be imported at once'
+            }), HTTPStatus.BAD_REQUEST
+
+        # Validate everything before writing anything
+        parsed = []
+        errors = []
+        seen_dates = set()
+        for index, entry in enumerate(entries):
+            error = None
+            date_obj = None
+            score = entry.get('score') if isinstance(entry, dict) else None
+            if not isinstance(entry, dict):
+                error = 'Entry must be an object'
+            else:
+                try:
+                    date_obj = datetime.datetime.strptime(str(entry.get('date')), "%Y-%m-%d").date()
+                except ValueError:
+                    error = 'date must be in YYYY-MM-DD format'
+            if error is None and score is not None and (isinstance(score, bool) or not isinstance(score, int)):
+                error = 'score must be an integer or null'
+            if error is None and score is not None and not MIN_SCORE <= score <= MAX_SCORE:
+                error = f'score must be between {MIN_SCORE} and {MAX_SCORE}'
+            if error is None and date_obj in seen_dates:
+                error = 'Duplicate date'
+            if error is not None:
+                errors.append({'index': index, 'error': error})
+                continue
+            seen_dates.add(date_obj)
+            parsed.append((date_obj, score))
+
+        if errors:
+            return jsonify({'success': False, 'error': 'Invalid scores', 'errors': errors}), HTTPStatus.BAD_REQUEST
+
+        outcomes = database.import_scores(user.id, parsed)
+        return jsonify({
+            'success': True,
+            'results': [
+                {'date': str(date_obj), 'status': outcome}
+                for (date_obj, _), outcome in zip(parsed, outcomes)
+            ]
+        })
+    except Exception as e:
+        print(e)
+        return jsonify({'success': False, 'error': str(e)}), HTTPStatus.INTERNAL_SERVER_ERROR
@@ -0,0 +1,111 @@
+from flask import Blueprint, jsonify, request, current_app
+from flask_jwt_extended import jwt_required
+from http import HTTPStatus
+
+from routes.scores import parse_date_param
+from utils.auth_helpers import get_authenticated_user, remember_membership_version, require_group_member
+from utils.etag import compute_etag, not_modified_response, with_etag
+from utils.timezones import InvalidTimezone, today_in
+
+stats_bp = Blueprint('stats', __name__)
+
+# Most weeks of totals returned by GET /stats/streaks
+MAX_STREAK_WEEKS = 104
+
+@stats_bp.route('/stats', methods=['GET'])
+@jwt_required()
+def get_stats():
+    database = current_app.config['database']
+    try:
+        user = get_authenticated_user(database)
+
+        scope_type = request.args.get('scope', 'personal')
+        if scope_type not in ('personal', 'group'):
+            return jsonify({'error': 'scope must be personal or group'}), 400
+        group_id = request.args.get('groupId', type=int)
+        if scope_type == 'group' and not group_id:
+            return jsonify({'error': 'Group ID required for group scope'}), 400
+
+        try:
+            start_date = parse_date_param('from')
+            end_date = parse_date_param('to')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        if start_date and end_date and start_date > end_date:
+            return jsonify({'error': 'from must not be after to'}), 400
+
+        # Stats are derived from the same data as GET /scores, so share its version counters
+        versions = database.get_scores_versions(user.id, scope_type, group_id)
+        if scope_type == 'group':
+            remember_membership_version(user.id, versions)
+            require_group_member(database, group_id, user)
+
+        # The body names the caller, so their id keeps users from sharing a tag
+        etag = compute_etag(
+            user.id,
+            [v for v in versions if v[0] != 'user'],
+            sorted(request.args.items(multi=True))
+        )
+        not_modified = not_modified_response(etag)
+        if not_modified is not None:
+            return not_modified
+
+        stats = database.get_stats(user.id, scope_type, group_id, start_date, end_date)
+        return with_etag(jsonify(stats), etag)
+    except Exception as e:
+        if hasattr(e, 'code'):
+            return jsonify({'error': str(e)}), e.code
+        current_app.logger.exception('Failed to %s %s', request.method, request.path)
+        return jsonify(str(e)), HTTPStatus.INTERNAL_SERVER_ERROR
+
+@stats_bp.route('/stats/streaks', methods=['GET'])
+@jwt_required()
+def get_streaks():
+    database = current_app.config['database']
+    try:
+        user = get_authenticated_user(database)
+
+        timezone = request.args.get('timezone') or None
+        try:
+            today = today_in(timezone)
+        except InvalidTimezone as e:
+            return jsonify({'error': str(e)}), 400
+
+        scope_type = request.args.get('scope', 'personal')
+        if scope_type not in ('personal', 'group'):
+            return jsonify({'error': 'scope must be personal or group'}), 400
+        group_id = request.args.get('groupId', type=int)
+        if scope_type == 'group' and not group_id:
+            return jsonify({'error': 'Group ID required for group scope'}), 400
+
+        try:
+            weeks = int(request.args.get('weeks', 8))
+        except ValueError:
+            weeks = None
+        if weeks is None or not 1 <= weeks <= MAX_STREAK_WEEKS:
+            return jsonify({'error': f'weeks must be between 1 and {MAX_STREAK_WEEKS}'}), 400
+
+        versions = database.get_scores_versions(user.id, scope_type, group_id)
+        if scope_type == 'group':
+            remember_membership_version(user.id, versions)
+            require_group_member(database, group_id, user)
+
+        # Current streaks lapse and the weeks move on with the date, so it is part
+        # of the tag; the caller's id keeps users from sharing one
+        etag = compute_etag(
+            user.id,
+            [v for v in versions if v[0] != 'user'],
+            str(today),
+            sorted(request.args.items(multi=True))
+        )
+        not_modified = not_modified_response(etag)
+        if not_modified is not None:
+            return not_modified
+
+        streaks = database.get_streaks(user.id, scope_type, group_id, weeks=weeks, timezone=timezone)
+        return with_etag(jsonify(streaks), etag)
+    except Exception as e:
+        if hasattr(e, 'code'):
+            return jsonify({'error': str(e)}), e.code
+        current_app.logger.exception('Failed to %s %s', request.method, request.path)
+        return jsonify(str(e)), HTTPStatus.INTERNAL_SERVER_ERROR
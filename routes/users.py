@@ -2,7 +2,7 @@ from flask import Blueprint, jsonify, request, current_app
 from flask_jwt_extended import jwt_required
 from http import HTTPStatus
 
-from utils.auth_helpers import get_current_user, require_group_member
+from utils.auth_helpers import get_authenticated_user, require_group_member
 
 users_bp = Blueprint('users', __name__)
 
@@ -11,7 +11,7 @@ users_bp = Blueprint('users', __name__)
 def get_users():
     database = current_app.config['database']
     try:
-        user = get_current_user(database)
+        user = get_authenticated_user(database)
         scope_param = request.args.get('scope')
         group_id_param = request.args.get('groupId')
 
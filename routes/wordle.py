@@ -1,55 +1,161 @@
 import datetime
 import base64
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, current_app
 from flask_jwt_extended import jwt_required
-import requests
 from bs4 import BeautifulSoup
+from http import HTTPStatus
+import requests
+
+from utils.http_client import CircuitOpenError, HttpClient, SingleFlight
+from utils.timezones import today_in
 
 wordle_bp = Blueprint('wordle', __name__)
 
+# How long a failed lookup is remembered before the page is scraped again
+NEGATIVE_CACHE_PERIOD = datetime.timedelta(minutes=10)
+
+# Longest range /wordle/answers will return in one response
+MAX_ANSWER_RANGE_DAYS = 366
+
+# A past date's answer never changes, so it can be cached indefinitely
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# The last timezone in which a date ends; only dates before today there are past for every user
+LATEST_TIMEZONE = 'Etc/GMT+12'
+
+# Shared by all requests so connections to the upstream site are reused
+http_client = HttpClient()
+
+# Concurrent requests for the same date share one fetch
+answer_fetches = SingleFlight()
+
+class AnswerNotFound(Exception):
+    pass
+
+def scrape_wordle_answer(date_obj):
+    """Fetch the answer for a date from rockpapershotgun.com."""
+    formatted_date = f"{date_obj.day:02d}-{date_obj.month:02d}-{str(date_obj.year)[2:]}"
+    url = f"https://www.rockpapershotgun.com/wordle-hint-and-answer-today-{formatted_date}"
+
+    response = http_client.get(url)
+    response.raise_for_status()
+
+    soup = BeautifulSoup(response.text, 'html.parser')
+
+    answer_section = soup.find('h2', string=lambda s: s and 'What is today\'s Wordle answer' in s)
+    if not answer_section:
+        raise AnswerNotFound("Could not find answer section")
+
+    paragraphs = answer_section.find_next_siblings('p')
+    for p in paragraphs:
+        strong_tag = p.find('strong')
+        if strong_tag:
+            return strong_tag.text.strip().lower().replace('.', '')
+
+    raise AnswerNotFound('Could not find answer on the page. The format may have changed.')
+
+def page_missing(error):
+    """Whether an HTTP error means there is no page for the date, rather than an upstream fault."""
+    return error.response is not None and error.response.status_code == HTTPStatus.NOT_FOUND
+
+def fetch_and_store_answer(database, date_obj):
+    """
+    Scrape the answer for a date and record the outcome. A page without an
+    answer, or no page at all, is recorded as a failed lookup; transport
+    errors and upstream outages are not, so they are retried on the next request.
+    """
+    try:
+        answer = scrape_wordle_answer(date_obj)
+    except AnswerNotFound:
+        database.save_wordle_answer(date_obj, None)
+        raise
+    except requests.HTTPError as e:
+        if page_missing(e):
+            database.save_wordle_answer(date_obj, None)
+        raise
+    database.save_wordle_answer(date_obj, answer)
+    return answer
+
+def playable_url(answer):
+    encoded_word = base64.b64encode(answer.encode()).decode()
+    return f"https://www.thewordfinder.com/wordle-maker/?game={encoded_word}"
+
+def parse_date(value, name):
+    if not value:
+        raise ValueError(f"{name} parameter is required")
+    try:
+        return datetime.datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError(f"{name} must be a date in YYYY-MM-DD format")
+
 @wordle_bp.route('/wordle/answer', methods=['GET'])
 @jwt_required()
 def get_wordle_answer():
+    database = current_app.config['database']
     try:
         date_str = request.args.get('date')
         if not date_str:
              return jsonify({'success': False, 'error': 'Date parameter is required'}), 400
-             
-        date_obj = datetime.datetime.strptime(date_str, "%Y-%m-%d").date()
-
-        formatted_date = f"{date_obj.day:02d}-{date_obj.month:02d}-{str(date_obj.year)[2:]}"
-        url = f"https://www.rockpapershotgun.com/wordle-hint-and-answer-today-{formatted_date}"
-
-        response = requests.get(url)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.text, 'html.parser')
 
-        answer_section = soup.find('h2', string=lambda s: s and 'What is today\'s Wordle answer' in s)
-        if not answer_section:
-            raise Exception("Could not find answer section")
+        date_obj = datetime.datetime.strptime(date_str, "%Y-%m-%d").date()
 
-        paragraphs = answer_section.find_next_siblings('p')
-        for p in paragraphs:
-            strong_tag = p.find('strong')
-            if strong_tag:
-                answer = strong_tag.text.strip().lower().replace('.', '')
-                encoded_word = base64.b64encode(answer.encode()).decode()
-                playable_url = f"https://www.thewordfinder.com/wordle-maker/?game={encoded_word}"
+        cached = database.get_wordle_answer(date_obj)
+        if cached and cached.answer is None and datetime.datetime.utcnow() - cached.fetched_at < NEGATIVE_CACHE_PERIOD:
+            return jsonify({
+                'success': False,
+                'error': 'Could not find answer on the page. The format may have changed.'
+            })
 
-                return jsonify({
-                    'success': True,
-                    'answer': answer,
-                    'playable_url': playable_url
-                })
+        if cached and cached.answer:
+            answer = cached.answer
+        else:
+            answer = answer_fetches.do(date_obj, lambda: fetch_and_store_answer(database, date_obj))
 
-        return jsonify({
-            'success': False,
-            'error': 'Could not find answer on the page. The format may have changed.'
+        resp = jsonify({
+            'success': True,
+            'answer': answer,
+            'playable_url': playable_url(answer)
         })
+        if date_obj < today_in(LATEST_TIMEZONE):
+            resp.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        return resp
 
+    except CircuitOpenError as e:
+        return jsonify({'success': False, 'error': str(e)}), HTTPStatus.SERVICE_UNAVAILABLE
+    except requests.RequestException as e:
+        if isinstance(e, requests.HTTPError) and page_missing(e):
+            return jsonify({'success': False, 'error': str(e)})
+        return jsonify({'success': False, 'error': 'Could not reach the answer page'}), HTTPStatus.BAD_GATEWAY
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         })
+
+@wordle_bp.route('/wordle/answers', methods=['GET'])
+@jwt_required()
+def get_wordle_answers():
+    database = current_app.config['database']
+    try:
+        start_date = parse_date(request.args.get('from'), 'from')
+        end_date = parse_date(request.args.get('to'), 'to')
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    if end_date < start_date:
+        return jsonify({'success': False, 'error': 'to must not be before from'}), 400
+    if (end_date - start_date).days >= MAX_ANSWER_RANGE_DAYS:
+        return jsonify({'success': False, 'error': f'Range must be at most {MAX_ANSWER_RANGE_DAYS} days'}), 400
+
+    answers = database.get_wordle_answers(start_date, end_date)
+    resp = jsonify({
+        'success': True,
+        'answers': [
+            {'date': str(a.date), 'answer': a.answer, 'playable_url': playable_url(a.answer)}
+            for a in answers
+        ]
+    })
+    # Only cache ranges that are entirely in the past and fully known
+    if end_date < today_in(LATEST_TIMEZONE) and len(answers) == (end_date - start_date).days + 1:
+        resp.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    return resp
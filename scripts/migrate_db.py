@@ -0,0 +1,49 @@
+import sys
+import os
+import argparse
+from dotenv import load_dotenv
+
+# Add parent directory to path to allow imports from backend root
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(backend_dir)
+
+# Change working directory to backend root to ensure relative paths work
+os.chdir(backend_dir)
+
+from sqlalchemy import create_engine
+from database.migrations import MIGRATIONS, get_applied_versions, run_migrations
+from database.models.base import Base
+
+load_dotenv()
+
+def get_database_url():
+    """Get database URL from environment or default."""
+    url = os.environ.get('DATABASE_URL')
+    if not url:
+        print("DATABASE_URL not found in environment, using default.")
+        return 'sqlite:///wordlewise.db'
+    return url
+
+def migrate_database():
+    parser = argparse.ArgumentParser(description="Apply pending schema migrations.")
+    parser.add_argument("--status", action="store_true", help="List migrations and whether they have been applied, without applying anything.")
+    args = parser.parse_args()
+
+    engine = create_engine(get_database_url())
+
+    if args.status:
+        applied_versions = set(get_applied_versions(engine))
+        for m in MIGRATIONS:
+            state = "applied" if m.version in applied_versions else "pending"
+            print(f"  {m.version:>3}  {state:<8} {m.description}")
+        return
+
+    Base.metadata.create_all(engine, checkfirst=True)
+    applied = run_migrations(engine)
+    if not applied:
+        print("Database is up to date.")
+    for m in applied:
+        print(f"  - Applied migration {m.version}: {m.description}")
+
+if __name__ == "__main__":
+    migrate_database()
@@ -0,0 +1,52 @@
+import sys
+import os
+import argparse
+from dotenv import load_dotenv
+
+# Add parent directory to path to allow imports from backend root
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(backend_dir)
+
+# Change working directory to backend root to ensure relative paths work
+os.chdir(backend_dir)
+
+from database.Database import Database
+from database.rollups import check_user_rollups, check_weekly_scores, rebuild_user_rollups, rebuild_weekly_scores
+
+load_dotenv()
+
+def get_database_url():
+    """Get database URL from environment or default."""
+    url = os.environ.get('DATABASE_URL')
+    if not url:
+        print("DATABASE_URL not found in environment, using default.")
+        return 'sqlite:///wordlewise.db'
+    return url
+
+def rebuild_rollups():
+    parser = argparse.ArgumentParser(description="Rebuild or verify the weekly_score and user_rollup rollups.")
+    parser.add_argument("--check", action="store_true", help="Compare the rollup against raw scores instead of rebuilding it.")
+    args = parser.parse_args()
+
+    db = Database(get_database_url())
+
+    if args.check:
+        with db.engine.connect() as connection:
+            mismatches = check_weekly_scores(connection)
+            streak_mismatches = check_user_rollups(connection)
+        for m in mismatches:
+            print(f"  - user {m.user_id}, week {m.week_start}: expected {m.expected}, found {m.actual}")
+        print(f"{len(mismatches)} mismatched week(s).")
+        for m in streak_mismatches:
+            print(f"  - user {m.user_id} streaks: expected {m.expected}, found {m.actual}")
+        print(f"{len(streak_mismatches)} mismatched user streak(s).")
+        sys.exit(1 if mismatches or streak_mismatches else 0)
+
+    with db.engine.begin() as connection:
+        count = rebuild_weekly_scores(connection)
+        streak_count = rebuild_user_rollups(connection)
+    print(f"Rebuilt weekly_score with {count} row(s).")
+    print(f"Rebuilt user_rollup with {streak_count} row(s).")
+
+if __name__ == "__main__":
+    rebuild_rollups()
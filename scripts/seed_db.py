@@ -2,7 +2,8 @@ import sys
 import os
 import argparse
 import random
-from datetime import date, timedelta
+import time
+from datetime import date, datetime, timedelta
 from dotenv import load_dotenv
 
 # Add parent directory to path to allow imports from backend root
@@ -12,11 +13,22 @@ sys.path.append(backend_dir)
 # Change working directory to backend root to ensure relative paths work
 os.chdir(backend_dir)
 
-from database.Database import Database
-from database.models import User, Score, Group, GroupMember
+from sqlalchemy import insert
+
+from database.Database import GROUP_CAPACITY, Database
+from database.models import User, Score, Group, GroupMember, WeeklyScore, UserRollup
+from utils.dates import week_start
+from utils.invite_code import INVITE_CODE_ALPHABET
+from utils.sample_data import PLAY_PROBABILITY, SCORE_OPTIONS, SCORE_WEIGHTS
 
 load_dotenv()
 
+# Rows generated before each write in bulk mode
+BULK_BATCH_SIZE = 200000
+
+# Rows per multi-row INSERT statement on SQLite
+ROWS_PER_INSERT = 500
+
 def get_database_url():
     """Get database URL from environment or default."""
     url = os.environ.get('DATABASE_URL')
@@ -35,8 +47,15 @@ def clear_data(db):
     try:
         print("Recreating database schema...")
         from database.models.base import Base
-        Base.metadata.drop_all(db.engine)
-        Base.metadata.create_all(db.engine)
+        with db.engine.connect() as connection:
+            # user and group reference each other, so no drop order satisfies enforced foreign keys
+            if connection.dialect.name == 'sqlite':
+                connection.exec_driver_sql('PRAGMA foreign_keys=OFF')
+            Base.metadata.drop_all(connection)
+            Base.metadata.create_all(connection)
+            connection.commit()
+            if connection.dialect.name == 'sqlite':
+                connection.exec_driver_sql('PRAGMA foreign_keys=ON')
         print("Schema recreated successfully.")
     except Exception as e:
         print(f"Error recreating schema: {e}")
@@ -89,34 +108,152 @@ def create_groups(db, users):
             db.join_group(group_all.id, jasper.id)
             print(f"  - Created group: '{group_all.name}' with members Will, Kate, Jasper")
 
-def add_scores(db, users):
-    """Add random scores for users over the last 30 days."""
+def add_scores(db, users, days=30):
+    """Add random scores for users over the last `days` days."""
     print("Adding scores...")
     today = date.today()
-    start_date = today - timedelta(days=30)
-    
-    # Define score weights for a realistic distribution
-    # 1: 1%, 2: 5%, 3: 30%, 4: 40%, 5: 15%, 6: 5%, X: 4%
-    weights = [1, 5, 30, 40, 15, 5, 4]
-    options = [1, 2, 3, 4, 5, 6, None]
+    start_date = today - timedelta(days=days)
 
     current_date = start_date
     while current_date <= today:
         date_str = current_date.strftime("%Y-%m-%d")
         
         for username, user in users.items():
-            # Randomly skip some days (80% chance to play)
-            if random.random() > 0.2:
-                score_val = random.choices(options, weights=weights)[0]
+            # Randomly skip some days
+            if random.random() < PLAY_PROBABILITY:
+                score_val = random.choices(SCORE_OPTIONS, weights=SCORE_WEIGHTS)[0]
                 if score_val:
                     db.add_score(date_str, user.id, score_val)
         
         current_date += timedelta(days=1)
-    print("  - Added sample scores for the last 30 days.")
+    print(f"  - Added sample scores for the last {days} days.")
+
+def _bulk_insert(connection, table, columns, rows):
+    """
+    Insert rows (tuples in `columns` order). On SQLite they go straight to the
+    driver as multi-row INSERTs, skipping SQLAlchemy's per-row processing.
+    """
+    if not rows:
+        return
+    if connection.dialect.name != 'sqlite':
+        connection.execute(insert(table), [dict(zip(columns, row)) for row in rows])
+        return
+    row_placeholder = f"({', '.join('?' for _ in columns)})"
+    prefix = f'INSERT INTO "{table.name}" ({", ".join(columns)}) VALUES '
+    full_chunks = len(rows) - len(rows) % ROWS_PER_INSERT
+    statement = prefix + ', '.join([row_placeholder] * ROWS_PER_INSERT)
+    for i in range(0, full_chunks, ROWS_PER_INSERT):
+        connection.exec_driver_sql(statement, tuple(value for row in rows[i:i + ROWS_PER_INSERT] for value in row))
+    if full_chunks < len(rows):
+        connection.exec_driver_sql(prefix + row_placeholder, rows[full_chunks:])
+
+def bulk_seed(db, users, days, groups, seed):
+    """
+    Generate `users` users with `days` days of scores each, and `groups`
+    groups of up to four members, writing with executemany in one transaction.
+    The same seed always produces the same data (relative to today's date).
+    Every user's password is "password", hashed once and shared.
+    """
+    rng = random.Random(seed)
+    password_hash = db.password_hasher.hash("password")
+    sqlite = db.engine.dialect.name == 'sqlite'
+
+    today = date.today()
+    dates = [today - timedelta(days=days - 1 - d) for d in range(days)]
+    week_starts = sorted({week_start(d) for d in dates})
+    week_index = {w: i for i, w in enumerate(week_starts)}
+    # SQLite is given dates as ISO strings to skip per-row type processing
+    day_values = [d.isoformat() if sqlite else d for d in dates]
+    week_values = [w.isoformat() if sqlite else w for w in week_starts]
+    day_week = [week_index[week_start(d)] for d in dates]
+    day_weekday = [d.weekday() for d in dates]
+
+    # Skipped days and failed games (X) both leave no score
+    daily_options = SCORE_OPTIONS[:6] + [None]
+    daily_weights = [w * PLAY_PROBABILITY for w in SCORE_WEIGHTS[:6]]
+    daily_weights.append(SCORE_WEIGHTS[6] * PLAY_PROBABILITY + 100 * (1 - PLAY_PROBABILITY))
+
+    with db.engine.begin() as connection:
+        print(f"Creating {users} users...")
+        _bulk_insert(connection, User.__table__, ('id', 'username', 'forename', 'password_hash'), [
+            (user_id, f"user{user_id}", f"User {user_id}"[:10], password_hash) for user_id in range(1, users + 1)
+        ])
+
+        print(f"Creating {groups} groups...")
+        invite_codes = set()
+        while len(invite_codes) < groups:
+            invite_codes.add(''.join(rng.choice(INVITE_CODE_ALPHABET) for _ in range(8)))
+        group_rows, member_rows = [], []
+        for group_id, invite_code in enumerate(sorted(invite_codes), start=1):
+            first = (group_id - 1) * GROUP_CAPACITY
+            member_ids = list(dict.fromkeys(
+                (first + k) % users + 1 for k in range(min(GROUP_CAPACITY, users))
+            ))
+            created_at = datetime.combine(rng.choice(dates), datetime.min.time())
+            group_rows.append({
+                'id': group_id, 'name': f"Group {group_id}"[:15], 'invite_code': invite_code,
+                'created_at': created_at, 'created_by_user_id': member_ids[0],
+                'include_historical_data': 1 if rng.random() < 0.5 else 0,
+            })
+            for position, user_id in enumerate(member_ids):
+                member_rows.append({
+                    'group_id': group_id, 'user_id': user_id,
+                    'role': 'admin' if position == 0 else 'member', 'joined_at': created_at,
+                })
+        if group_rows:
+            connection.execute(insert(Group), group_rows)
+            connection.execute(insert(GroupMember), member_rows)
+
+        print(f"Adding scores for {days} days...")
+        # Secondary indexes are quicker to build once at the end than to maintain row by row
+        for index in Score.__table__.indexes:
+            index.drop(connection)
+        score_columns = ('date', 'user_id', 'score')
+        weekly_columns = ('user_id', 'week_start') + WeeklyScore.DAY_COLUMNS
+        rollup_columns = ('user_id', 'last_played', 'current_streak', 'longest_streak')
+        score_rows, weekly_rows, rollup_rows, total = [], [], [], 0
+        for user_id in range(1, users + 1):
+            weeks = {}
+            last_played, current, longest = None, 0, 0
+            for d, score in enumerate(rng.choices(daily_options, daily_weights, k=days)):
+                if score is None:
+                    continue
+                score_rows.append((day_values[d], user_id, score))
+                current = current + 1 if last_played == d - 1 else 1
+                longest = max(longest, current)
+                last_played = d
+                week = weeks.get(day_week[d])
+                if week is None:
+                    week = weeks[day_week[d]] = [None] * 7
+                week[day_weekday[d]] = score
+            weekly_rows.extend((user_id, week_values[w], *scores) for w, scores in weeks.items())
+            if last_played is not None:
+                rollup_rows.append((user_id, day_values[last_played], current, longest))
+
+            if len(score_rows) >= BULK_BATCH_SIZE:
+                total += len(score_rows)
+                # Date order keeps inserts into the (date, user_id) unique index local
+                score_rows.sort()
+                _bulk_insert(connection, Score.__table__, score_columns, score_rows)
+                _bulk_insert(connection, WeeklyScore.__table__, weekly_columns, weekly_rows)
+                score_rows, weekly_rows = [], []
+        total += len(score_rows)
+        score_rows.sort()
+        _bulk_insert(connection, Score.__table__, score_columns, score_rows)
+        _bulk_insert(connection, WeeklyScore.__table__, weekly_columns, weekly_rows)
+        _bulk_insert(connection, UserRollup.__table__, rollup_columns, rollup_rows)
+        for index in Score.__table__.indexes:
+            index.create(connection)
+    print(f"  - Added {total} scores.")
 
 def seed_database():
     parser = argparse.ArgumentParser(description="Seed the database with test data.")
     parser.add_argument("--force", action="store_true", help="Force execution without confirmation (required in production).")
+    parser.add_argument("--bulk", action="store_true", help="Generate synthetic users, groups and scores in bulk instead of the sample data.")
+    parser.add_argument("--users", type=int, default=1000, help="Users to generate in bulk mode (default: 1000).")
+    parser.add_argument("--days", type=int, help="Days of scores per user (default: 30, or 365 in bulk mode).")
+    parser.add_argument("--groups", type=int, help="Groups to generate in bulk mode (default: one per four users).")
+    parser.add_argument("--seed", type=int, help="Random seed, for reproducible data.")
     args = parser.parse_args()
 
     flask_env = os.environ.get('FLASK_ENV', 'production')
@@ -142,11 +279,18 @@ def seed_database():
     db_url = get_database_url()
     db = Database(db_url)
 
+    random.seed(args.seed)
     try:
         clear_data(db)
-        users = create_users(db)
-        create_groups(db, users)
-        add_scores(db, users)
+        if args.bulk:
+            groups = args.groups if args.groups is not None else args.users // GROUP_CAPACITY
+            started = time.perf_counter()
+            bulk_seed(db, args.users, args.days or 365, groups, args.seed or 0)
+            print(f"  - Took {time.perf_counter() - started:.1f}s.")
+        else:
+            users = create_users(db)
+            create_groups(db, users)
+            add_scores(db, users, args.days or 30)
         print("\nSeeding complete!")
     except Exception as e:
         print(f"\nAn error occurred during seeding: {e}")
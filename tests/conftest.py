@@ -1,6 +1,7 @@
 import pytest
 import sys
 import os
+from sqlalchemy import event
 
 # Add the project root to the python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -14,7 +15,8 @@ def app():
     test_config = {
         "TESTING": True,
         "JWT_SECRET_KEY": "test-secret-key",
-        "DATABASE_URL": "sqlite:///:memory:"
+        "DATABASE_URL": "sqlite:///:memory:",
+        "BCRYPT_ROUNDS": 4
     }
     app = create_app(test_config)
     
@@ -37,3 +39,26 @@ def runner(app):
 def db(app):
     """Get the database instance."""
     return app.config['database']
+
+class QueryCounter:
+    """Counts SQL statements executed on an engine while active."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._on_execute)
+
+@pytest.fixture
+def query_counter(db):
+    """Context manager counting the queries issued through the database engine."""
+    return QueryCounter(db.engine)
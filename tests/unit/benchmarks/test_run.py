@@ -0,0 +1,23 @@
+from benchmarks.datasets import seed_dataset
+from benchmarks.run import build_cases, compare, run_case
+
+def test_cases_run_on_small_dataset(app, db):
+    dataset = seed_dataset(db, users=5, years=0.1, groups=2)
+
+    cases = build_cases(app, dataset)
+    result = run_case(db.engine, cases['db.get_scores group historical'], repeat=2)
+
+    assert set(cases) >= {'db.get_scores personal', 'GET /groups', 'POST /scores'}
+    assert result['queries'] == 3
+    assert result['p50_ms'] > 0 and result['peak_kib'] > 0
+
+def test_compare_flags_regressions():
+    baseline = {'case': {'p50_ms': 10.0, 'p95_ms': 12.0, 'queries': 2, 'peak_kib': 100.0}}
+    same = {'case': {'p50_ms': 11.0, 'p95_ms': 12.0, 'queries': 2, 'peak_kib': 100.0}}
+    worse = {'case': {'p50_ms': 20.0, 'p95_ms': 12.0, 'queries': 3, 'peak_kib': 100.0}}
+
+    assert compare(same, baseline, threshold=0.25) == []
+    assert compare(worse, baseline, threshold=0.25) == [
+        'case: p50_ms 10.0 -> 20.0', 'case: queries 2 -> 3'
+    ]
+    assert compare({'new case': worse['case']}, baseline, threshold=0.25) == []
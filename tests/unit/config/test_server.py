@@ -0,0 +1,53 @@
+import pytest
+
+from config.server import dispose_inherited_connections, get_server_options, run_server, run_waitress
+
+def test_server_options_from_environment(monkeypatch):
+    monkeypatch.setenv('PORT', '8000')
+    monkeypatch.setenv('WEB_WORKERS', '3')
+    monkeypatch.setenv('WEB_THREADS', '1')
+    monkeypatch.setenv('WEB_TIMEOUT', '60')
+
+    options = get_server_options()
+
+    assert options['bind'] == '0.0.0.0:8000'
+    assert options['workers'] == 3
+    assert options['worker_class'] == 'sync'
+    assert options['timeout'] == 60
+    assert options['preload_app'] is True
+
+def test_threaded_workers_use_gthread(monkeypatch):
+    monkeypatch.setenv('WEB_THREADS', '4')
+    assert get_server_options()['worker_class'] == 'gthread'
+
+def test_dispose_inherited_connections_replaces_pool(app):
+    engine = app.config['database'].engine
+    pool = engine.pool
+    dispose_inherited_connections(app)
+    assert engine.pool is not pool
+
+def test_unknown_server_rejected(app, monkeypatch):
+    monkeypatch.setenv('SERVER', 'uwsgi')
+    with pytest.raises(ValueError, match='SERVER must be one of'):
+        run_server(app)
+
+def test_wal_checkpointed_when_server_stops(app, monkeypatch):
+    checkpointed = []
+    monkeypatch.setenv('SERVER', 'flask')
+    monkeypatch.setattr(app, 'run', lambda **kwargs: None)
+    monkeypatch.setattr('config.server.checkpoint_wal', checkpointed.append)
+    run_server(app)
+    assert checkpointed == [app.config['database'].engine]
+
+def test_waitress_maps_keepalive_and_warns_about_gunicorn_settings(app, monkeypatch, capsys):
+    import waitress
+    served = {}
+    monkeypatch.setattr(waitress, 'serve', lambda app, **kwargs: served.update(kwargs))
+    monkeypatch.setenv('WEB_KEEPALIVE', '7')
+    monkeypatch.setenv('WEB_TIMEOUT', '60')
+    monkeypatch.delenv('WEB_WORKERS', raising=False)
+
+    run_waitress(app, get_server_options())
+
+    assert served['channel_timeout'] == 7
+    assert 'WEB_TIMEOUT' in capsys.readouterr().out
@@ -101,3 +101,183 @@ def test_get_users(db):
     assert len(users) == 2
     assert any(u.username == "user1" for u in users)
     assert any(u.username == "user2" for u in users)
+
+def _add_history(db, user_id, start, days):
+    db.import_scores(user_id, [(start + datetime.timedelta(days=i), i % 6 + 1) for i in range(days)])
+
+def test_get_scores_query_count_independent_of_history(db, query_counter):
+    """get_scores issues a fixed number of queries however long the history is."""
+    u1 = db.register_user("user1", "pass", "User One")
+    u2 = db.register_user("user2", "pass", "User Two")
+    group = db.create_group("G1", u1.id)
+    db.join_group(group.id, u2.id)
+
+    with freezegun.freeze_time("2023-01-03"):
+        _add_history(db, u1.id, datetime.date(2022, 12, 26), 7)
+        with query_counter as short_personal:
+            db.get_scores(u1.id, 'personal')
+        with query_counter as short_group:
+            db.get_scores(u1.id, 'group', group.id)
+        short_counts = (short_personal.count, short_group.count)
+
+        _add_history(db, u1.id, datetime.date(2020, 1, 1), 1000)
+        _add_history(db, u2.id, datetime.date(2020, 1, 1), 1000)
+        with query_counter as long_personal:
+            result = db.get_scores(u1.id, 'personal')
+        with query_counter as long_group:
+            db.get_scores(u1.id, 'group', group.id)
+
+    assert (long_personal.count, long_group.count) == short_counts
+    assert result[0]["data"]["2020-01-01"]["user1"] == 1
+
+def test_get_scores_page_window_and_cursor(db):
+    """Windows are widened to whole weeks and pages walk back via next_cursor."""
+    user = db.register_user("user1", "pass", "User One")
+    db.add_score("2023-01-01", user.id, 1) # Week of Dec 26
+    db.add_score("2023-01-10", user.id, 2) # Week of Jan 9
+
+    with freezegun.freeze_time("2023-01-25"): # Week of Jan 23
+        page = db.get_scores_page(user.id, 'personal', limit=2)
+        assert [w["start_of_week"] for w in page["weeks"]] == ["2023-01-16", "2023-01-23"]
+        assert page["next_cursor"] == "2023-01-09"
+
+        page = db.get_scores_page(user.id, 'personal', end_date=datetime.date(2023, 1, 9), limit=2)
+        assert [w["start_of_week"] for w in page["weeks"]] == ["2023-01-02", "2023-01-09"]
+        assert page["weeks"][1]["data"]["2023-01-10"]["user1"] == 2
+        assert page["next_cursor"] == "2022-12-26"
+
+        page = db.get_scores_page(user.id, 'personal', end_date=datetime.date(2022, 12, 26), limit=2)
+        assert [w["start_of_week"] for w in page["weeks"]] == ["2022-12-26"]
+        assert page["next_cursor"] is None
+
+        weeks = db.get_scores(user.id, 'personal', start_date=datetime.date(2023, 1, 4),
+                              end_date=datetime.date(2023, 1, 11))
+        assert [w["start_of_week"] for w in weeks] == ["2023-01-02", "2023-01-09"]
+
+def test_login_rehashes_when_cost_changes(db):
+    db.register_user("user1", "pass", "User One")
+    user = db.session.query(User).filter_by(username="user1").one()
+    assert user.password_hash.startswith("$2b$04$")
+
+    db.password_hasher.rounds = 5
+    db.login("user1", "pass")
+    assert user.password_hash.startswith("$2b$05$")
+    assert db.login("user1", "pass") is user
+
+def test_login_migrates_md5_hash(db):
+    import hashlib
+    user = User(username="legacy", password_hash=hashlib.md5(b"pass").hexdigest(), forename="Legacy")
+    db.session.add(user)
+    db.session.commit()
+
+    db.login("legacy", "pass")
+    assert user.password_hash.startswith("$2b$04$")
+    with pytest.raises(Exception, match='Password incorrect'):
+        db.login("legacy", "wrong")
+
+def test_get_scores_current_week_in_callers_timezone(db):
+    user = db.register_user("user1", "pass", "User One")
+    db.add_score("2023-01-01", user.id, 3)
+
+    # Late on Sunday in London is already Monday in Auckland
+    with freezegun.freeze_time("2023-01-01 23:30:00"):
+        london = db.get_scores(user.id, 'personal', timezone='Europe/London')
+        auckland = db.get_scores(user.id, 'personal', timezone='Pacific/Auckland')
+
+    assert [w["start_of_week"] for w in london] == ["2022-12-26"]
+    assert [w["start_of_week"] for w in auckland] == ["2022-12-26", "2023-01-02"]
+
+def test_add_score_concurrent_writers(tmp_path):
+    """Workers racing to write the same day never collide on the unique constraint."""
+    import threading
+    from database.Database import Database
+    from database.models.WeeklyScore import WeeklyScore
+    from utils.password_hasher import PasswordHasher
+
+    url = f"sqlite:///{tmp_path / 'race.db'}"
+    hasher = PasswordHasher(rounds=4)
+    workers = [Database(url, password_hasher=hasher) for _ in range(4)]
+    user = workers[0].register_user("user1", "pass", "User One")
+    barrier = threading.Barrier(len(workers))
+    errors = []
+
+    def write(database, score):
+        barrier.wait()
+        try:
+            for _ in range(20):
+                database.add_score("2023-01-02", user.id, score)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            database.session.remove()
+
+    threads = [threading.Thread(target=write, args=(d, i + 1)) for i, d in enumerate(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    check = Database(url, password_hasher=hasher)
+    scores = check.session.query(Score).filter_by(user_id=user.id).all()
+    weekly = check.session.query(WeeklyScore).filter_by(user_id=user.id).all()
+    assert len(scores) == 1 and len(weekly) == 1
+    assert weekly[0].day_0 == scores[0].score
+
+def test_add_score_round_trips(db, query_counter):
+    """Inserting and updating a score each take one statement per table touched."""
+    user_id = db.register_user("user1", "pass", "User One").id
+    with query_counter as counter:
+        db.add_score("2023-01-02", user_id, 3)
+    insert_count = counter.count
+    with query_counter as counter:
+        db.add_score("2023-01-02", user_id, 4)
+    update_count = counter.count
+
+    # score upsert, user_rollup read and upsert, weekly_score and data_version upserts,
+    # then the group lookup for cache invalidation; rescoring the same day leaves the streaks alone
+    assert insert_count == 6
+    assert update_count == 5
+
+def test_delete_score_removes_empty_week(db):
+    from database.models.WeeklyScore import WeeklyScore
+    user = db.register_user("user1", "pass", "User One")
+    db.add_score("2023-01-02", user.id, 3)
+    db.add_score("2023-01-03", user.id, 4)
+
+    db.delete_score("2023-01-02", user.id)
+    weekly = db.session.query(WeeklyScore).filter_by(user_id=user.id).one()
+    assert weekly.days == [None, 4, None, None, None, None, None]
+    db.delete_score("2023-01-03", user.id)
+    assert db.session.query(WeeklyScore).filter_by(user_id=user.id).count() == 0
+
+def test_add_score_without_dialect_upsert(db, monkeypatch):
+    """Dialects without ON CONFLICT support fall back to UPDATE then INSERT."""
+    from database import Database as database_module
+    from database.models.WeeklyScore import WeeklyScore
+    monkeypatch.setattr(database_module, "UPSERT_DIALECTS", {})
+    user = db.register_user("user1", "pass", "User One")
+
+    db.add_score("2023-01-02", user.id, 3)
+    db.add_score("2023-01-02", user.id, 5)
+
+    assert [s.score for s in db.session.query(Score).filter_by(user_id=user.id)] == [5]
+    assert db.session.query(WeeklyScore).filter_by(user_id=user.id).one().day_0 == 5
+
+@pytest.mark.parametrize("dialect_weeks", [True, False], ids=["sql weeks", "folded weeks"])
+def test_get_stats_weeks_match_week_start(db, monkeypatch, dialect_weeks):
+    """Weeks bucketed in SQL, or folded from days where the dialect has no expression, run Monday to Sunday."""
+    from database import Database as database_module
+    if not dialect_weeks:
+        monkeypatch.setattr(database_module, "WEEK_START_EXPRESSIONS", {})
+    user = db.register_user("user1", "pass", "User One")
+    # Sat 2023-12-30 to Fri 2024-01-12 covers every weekday and a year boundary
+    for day in range(14):
+        date = datetime.date(2023, 12, 30) + datetime.timedelta(days=day)
+        db.add_score(date.isoformat(), user.id, 2 if date < datetime.date(2024, 1, 8) else 5)
+
+    stats = db.get_stats(user.id, 'personal')['users'][0]
+
+    assert stats['best_week'] == {'week_start': '2024-01-01', 'games': 7, 'total': 14, 'mean': 2.0}
+    assert stats['worst_week'] == {'week_start': '2024-01-08', 'games': 5, 'total': 25, 'mean': 5.0}
+    assert stats['games'] == 14
@@ -0,0 +1,66 @@
+import threading
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from database.engine import checkpoint_wal, create_database_engine, is_memory_sqlite
+
+def _pragma(connection, name):
+    return connection.execute(text(f'PRAGMA {name}')).scalar()
+
+def test_file_sqlite_profile(tmp_path):
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    assert isinstance(engine.pool, QueuePool)
+    with engine.connect() as connection:
+        assert _pragma(connection, 'journal_mode') == 'wal'
+        assert _pragma(connection, 'synchronous') == 1  # NORMAL
+        assert _pragma(connection, 'busy_timeout') == 5000
+        assert _pragma(connection, 'foreign_keys') == 1
+
+def test_checkpoint_wal_empties_log(tmp_path):
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    with engine.begin() as connection:
+        connection.execute(text('CREATE TABLE t (x INTEGER)'))
+        connection.execute(text('INSERT INTO t VALUES (1)'))
+    # A pooled connection stays open, so the log is not checkpointed on close
+    held = engine.connect()
+    assert (tmp_path / 'app.db-wal').stat().st_size > 0
+
+    checkpoint_wal(engine)
+    assert (tmp_path / 'app.db-wal').stat().st_size == 0
+    held.close()
+
+def test_memory_sqlite_shares_one_connection():
+    assert is_memory_sqlite("sqlite:///:memory:")
+    assert is_memory_sqlite("sqlite://")
+    assert not is_memory_sqlite("sqlite:///app.db")
+
+    engine = create_database_engine("sqlite:///:memory:")
+    assert isinstance(engine.pool, StaticPool)
+    with engine.connect() as connection:
+        assert _pragma(connection, 'foreign_keys') == 1
+
+def test_file_sqlite_readers_use_separate_connections(tmp_path):
+    """Concurrent threads each check out their own connection rather than sharing one."""
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    barrier = threading.Barrier(4)
+    seen = []
+
+    def read():
+        with engine.connect() as connection:
+            seen.append(id(connection.connection.dbapi_connection))
+            barrier.wait(timeout=5)
+            connection.execute(text('SELECT 1'))
+
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(set(seen)) == 4
+
+def test_foreign_keys_enforced(db):
+    with pytest.raises(IntegrityError):
+        db.add_score("2023-01-02", 999, 3)
+    db.session.rollback()
@@ -0,0 +1,97 @@
+import datetime
+import re
+import pytest
+from sqlalchemy import create_engine, event, inspect, text
+
+from database.Database import Database
+from database.migrations import MIGRATIONS, get_applied_versions, run_migrations
+from database.models.base import Base
+
+LOOKUP_INDEXES = ['ix_score_user_date_score', 'ix_group_member_user_group', 'ix_user_default_group_id']
+
+def _index_names(engine):
+    inspector = inspect(engine)
+    return {ix['name'] for table in ('score', 'group_member', 'user') for ix in inspector.get_indexes(table)}
+
+def test_migrations_upgrade_existing_database(tmp_path):
+    """An existing file created before the indexes existed is upgraded in place."""
+    url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        for name in LOOKUP_INDEXES:
+            connection.execute(text(f'DROP INDEX {name}'))
+    assert not set(LOOKUP_INDEXES) & _index_names(engine)
+
+    applied = run_migrations(engine)
+
+    assert [m.version for m in applied] == [m.version for m in MIGRATIONS]
+    assert set(LOOKUP_INDEXES) <= _index_names(engine)
+    assert run_migrations(engine) == []
+    assert get_applied_versions(engine) == [m.version for m in MIGRATIONS]
+
+def test_database_applies_migrations_on_startup(tmp_path):
+    db = Database(f"sqlite:///{tmp_path / 'fresh.db'}")
+    assert get_applied_versions(db.engine) == [m.version for m in MIGRATIONS]
+    assert set(LOOKUP_INDEXES) <= _index_names(db.engine)
+
+def test_database_queries_use_indexes(db):
+    """Every filtered statement issued by Database methods is planned with an index."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and re.search(r'\bWHERE\b', statement):
+            statements.append((statement, parameters))
+
+    u1 = db.register_user("user1", "pass", "User One")
+    u2 = db.register_user("user2", "pass", "User Two")
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        db.login("user1", "pass")
+        group = db.create_group("G1", u1.id, include_historical=False)
+        db.join_group(group.id, u2.id)
+        db.add_score("2023-01-01", u1.id, 3)
+        db.add_score("2023-01-01", u1.id, 4)
+        db.import_scores(u1.id, [(datetime.date(2023, 1, 2), 5), (datetime.date(2023, 1, 3), None)])
+        db.get_scores(u1.id, 'personal')
+        db.get_scores(u1.id, 'group', group.id)
+        db.get_scores_page(u1.id, 'group', group.id, end_date=datetime.date(2023, 1, 1), limit=2)
+        db.get_users(u1.id, 'group', group.id)
+        db.get_user_groups(u1.id)
+        db.get_group_summaries(u1.id)
+        db.get_group_by_invite_code(group.invite_code)
+        db.get_group_member_details(group.id)
+        db.get_group_with_members(group.id)
+        db.get_scores_versions(u1.id, 'personal')
+        db.get_scores_versions(u1.id, 'group', group.id)
+        db.get_groups_versions(u1.id)
+        db.get_membership_version(u1.id)
+        db.get_membership_claims(u1.id)
+        db.get_membership(group.id, u2.id)
+        db.get_stats(u1.id, 'personal')
+        db.get_stats(u1.id, 'group', group.id, start_date=datetime.date(2023, 1, 1))
+        db.get_streaks(u1.id, 'personal')
+        db.get_streaks(u1.id, 'group', group.id)
+        db.save_wordle_answer(datetime.date(2023, 1, 1), 'crane')
+        db.get_wordle_answer(datetime.date(2023, 1, 1))
+        db.get_wordle_answers(datetime.date(2023, 1, 1), datetime.date(2023, 1, 7))
+        db.set_default_scope(u2.id, group.id)
+        db.update_group(group.id, name="G2")
+        db.update_member_role(group.id, u2.id, 'admin')
+        db.regenerate_invite_code(group.id)
+        db.delete_score("2023-01-01", u1.id)
+        db.leave_group(group.id, u2.id)
+        db.remove_member(group.id, u2.id)
+        db.delete_group(group.id)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+
+    assert statements
+    with db.engine.connect() as connection:
+        for statement, parameters in statements:
+            plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            for row in plan:
+                detail = row[3]
+                # SEARCH means an index lookup; SCAN walks a whole table or index
+                assert not detail.startswith('SCAN') or 'CONSTANT ROW' in detail, \
+                    f"{detail!r} in plan for: {statement}"
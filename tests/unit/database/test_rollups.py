@@ -0,0 +1,135 @@
+import datetime
+import random
+import freezegun
+from sqlalchemy import insert
+
+from database.models.Score import Score
+from database.models.UserRollup import UserRollup
+from database.models.WeeklyScore import WeeklyScore
+from database.rollups import (
+    Streaks, check_user_rollups, check_weekly_scores, compute_streaks, rebuild_user_rollups, rebuild_weekly_scores
+)
+
+def test_add_and_delete_score_maintain_weekly_rollup(db):
+    user = db.register_user("user1", "pass", "User One")
+    db.add_score("2023-01-02", user.id, 3) # Monday
+    db.add_score("2023-01-08", user.id, 5) # Sunday
+    db.add_score("2023-01-02", user.id, 4) # Update
+
+    weekly = db.session.query(WeeklyScore).filter_by(user_id=user.id).one()
+    assert weekly.week_start == datetime.date(2023, 1, 2)
+    assert weekly.days == [4, None, None, None, None, None, 5]
+
+    db.delete_score("2023-01-02", user.id)
+    assert weekly.days == [None, None, None, None, None, None, 5]
+
+    db.delete_score("2023-01-08", user.id)
+    assert db.session.query(WeeklyScore).count() == 0
+
+    with db.engine.connect() as connection:
+        assert check_weekly_scores(connection) == []
+
+def test_rebuild_weekly_scores_backfills_from_raw(db):
+    user = db.register_user("user1", "pass", "User One")
+    # Raw inserts bypass the rollup, as for data written before it existed
+    with db.engine.begin() as connection:
+        connection.execute(insert(Score), [
+            {"user_id": user.id, "date": datetime.date(2023, 1, 1), "score": 2},
+            {"user_id": user.id, "date": datetime.date(2023, 1, 3), "score": 6},
+        ])
+        mismatches = check_weekly_scores(connection)
+        assert [(m.week_start, m.expected, m.actual) for m in mismatches] == [
+            (datetime.date(2022, 12, 26), [None] * 6 + [2], [None] * 7),
+            (datetime.date(2023, 1, 2), [None, 6] + [None] * 5, [None] * 7),
+        ]
+
+        assert rebuild_weekly_scores(connection) == 2
+        assert check_weekly_scores(connection) == []
+
+    with freezegun.freeze_time("2023-01-03"):
+        result = db.get_scores(user.id, 'personal')
+    assert result[0]["data"]["2023-01-01"]["user1"] == 2
+    assert result[1]["data"]["2023-01-03"]["user1"] == 6
+
+def test_get_scores_excludes_days_before_group_creation(db):
+    u1 = db.register_user("user1", "pass", "User One")
+    db.add_score("2023-01-02", u1.id, 3) # Monday, before the group existed
+    db.add_score("2023-01-04", u1.id, 4) # Wednesday
+
+    group = db.create_group("G1", u1.id, include_historical=False)
+    db.update_group(group.id, created_at=datetime.datetime(2023, 1, 3, 12, 0))
+    with freezegun.freeze_time("2023-01-03"):
+        result = db.get_scores(u1.id, 'group', group.id)
+
+    assert len(result) == 1
+    assert result[0]["group_created_at"] == "2023-01-03"
+    assert result[0]["data"]["2023-01-02"] == {}
+    assert result[0]["data"]["2023-01-04"] == {"user1": 4}
+
+def _streaks(db, user_id):
+    rollup = db.session.query(UserRollup).filter_by(user_id=user_id).one_or_none()
+    return rollup and (str(rollup.last_played), rollup.current_streak, rollup.longest_streak)
+
+def test_compute_streaks():
+    d = datetime.date
+    assert compute_streaks([]) is None
+    assert compute_streaks([d(2023, 1, 1), d(2023, 1, 2), d(2023, 1, 3), d(2023, 1, 5), d(2023, 1, 6)]) == \
+        Streaks(d(2023, 1, 6), 2, 3)
+
+def test_add_and_delete_score_maintain_streaks(db):
+    user_id = db.register_user("user1", "pass", "User One").id
+    for day in ("2023-01-01", "2023-01-02", "2023-01-03", "2023-01-05", "2023-01-06"):
+        db.add_score(day, user_id, 4)
+    assert _streaks(db, user_id) == ("2023-01-06", 2, 3)
+
+    db.delete_score("2023-01-06", user_id)  # trims the current run, which isn't the longest
+    assert _streaks(db, user_id) == ("2023-01-05", 1, 3)
+    db.add_score("2023-01-06", user_id, 4)
+
+    db.add_score("2023-01-04", user_id, 3)  # fills the gap, joining the runs
+    assert _streaks(db, user_id) == ("2023-01-06", 6, 6)
+
+    db.add_score("2023-01-02", user_id, 2)  # rescoring a played day changes nothing
+    db.delete_score("2023-01-03", user_id)  # splits the run
+    assert _streaks(db, user_id) == ("2023-01-06", 3, 3)
+
+    db.add_score("2023-01-10", user_id, 5)
+    db.delete_score("2023-01-10", user_id)
+    assert _streaks(db, user_id) == ("2023-01-06", 3, 3)
+
+    for day in ("2023-01-01", "2023-01-02", "2023-01-04", "2023-01-05", "2023-01-06"):
+        db.delete_score(day, user_id)
+    assert _streaks(db, user_id) is None
+
+def test_incremental_streaks_match_rebuild(db):
+    """Random adds, rescores and deletes in any order leave the same streaks as a rebuild."""
+    rng = random.Random(7)
+    user_id = db.register_user("user1", "pass", "User One").id
+    start = datetime.date(2023, 1, 1)
+    for _ in range(300):
+        day = (start + datetime.timedelta(days=rng.randrange(40))).isoformat()
+        if rng.random() < 0.3:
+            db.delete_score(day, user_id)
+        else:
+            db.add_score(day, user_id, rng.randint(1, 6))
+
+    with db.engine.connect() as connection:
+        assert check_user_rollups(connection) == []
+
+def test_import_scores_recomputes_streaks(db):
+    user_id = db.register_user("user1", "pass", "User One").id
+    db.import_scores(user_id, [(datetime.date(2023, 1, day), 3) for day in (1, 2, 3, 7, 8)])
+    assert _streaks(db, user_id) == ("2023-01-08", 2, 3)
+
+def test_rebuild_user_rollups_backfills_from_raw(db):
+    user_id = db.register_user("user1", "pass", "User One").id
+    with db.engine.begin() as connection:
+        connection.execute(insert(Score), [
+            {"user_id": user_id, "date": datetime.date(2023, 1, day), "score": 2} for day in (1, 2, 4)
+        ])
+        [mismatch] = check_user_rollups(connection)
+        assert mismatch.expected == Streaks(datetime.date(2023, 1, 4), 1, 2)
+        assert mismatch.actual is None
+
+        assert rebuild_user_rollups(connection) == 1
+        assert check_user_rollups(connection) == []
@@ -0,0 +1,121 @@
+import json
+import logging
+import pytest
+from types import SimpleNamespace
+from sqlalchemy import text
+
+from config.app import create_app
+from database.slow_query_log import SlowQueryLog, create_file_logger, parameters_shape
+
+def _records(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+@pytest.fixture
+def slow_log(db, tmp_path):
+    """Logs every statement on the test database (threshold 0) to a temporary file."""
+    path = tmp_path / 'slow.log'
+    log = SlowQueryLog(create_file_logger(str(path)), threshold_ms=0)
+    log.attach(db.engine)
+    yield path
+    log.detach(db.engine)
+
+def test_records_method_parameter_shape_and_plan_once(db, slow_log):
+    user_id = db.register_user("testuser", "password", "Test User").id
+    db.session.remove()
+    slow_log.write_text('')
+
+    db.get_user_groups(user_id)
+    db.session.remove()
+    db.get_user_groups(user_id)
+
+    records = [r for r in _records(slow_log) if 'group_member' in r['statement']]
+    assert len(records) == 2
+    first, second = records
+    assert first['method'] == 'get_user_groups'
+    assert first['route'] is None
+    assert first['parameters'] == ['int']
+    assert str(user_id) not in json.dumps(first['parameters'])
+    assert first['plan']
+    assert 'plan' not in second
+
+def test_flags_full_table_scans(db, slow_log):
+    db.session.execute(text("SELECT * FROM score WHERE score = :score"), {'score': 4})
+    record = next(r for r in _records(slow_log) if r['statement'].startswith('SELECT * FROM score'))
+    assert record['full_scans'] == ['score']
+    assert record['parameters'] == ['int']
+    assert record['method'] is None
+
+def test_constant_rows_are_not_full_scans(db, slow_log):
+    db.session.execute(text("SELECT 1 AS one"))
+    record = next(r for r in _records(slow_log) if r['statement'] == 'SELECT 1 AS one')
+    assert record['full_scans'] == []
+
+def test_failed_explain_rolls_back_to_savepoint_on_postgresql():
+    """On PostgreSQL an EXPLAIN error must not abort the caller's transaction."""
+    executed = []
+
+    class Cursor:
+        def execute(self, sql, parameters=None):
+            executed.append(sql.split()[0] if sql.startswith('EXPLAIN') else sql)
+            if sql.startswith('EXPLAIN'):
+                raise RuntimeError('cannot explain')
+
+        def close(self):
+            pass
+
+    conn = SimpleNamespace(
+        dialect=SimpleNamespace(name='postgresql'),
+        connection=SimpleNamespace(driver_connection=SimpleNamespace(cursor=Cursor)),
+    )
+    log = SlowQueryLog(logging.getLogger(__name__))
+    assert log._plan(conn, 'SELECT 1', {}, False) == {'plan_error': 'cannot explain'}
+    assert executed == [
+        'SAVEPOINT slow_query_explain', 'EXPLAIN', 'ROLLBACK TO SAVEPOINT slow_query_explain'
+    ]
+
+def test_log_reopened_after_external_rotation(tmp_path):
+    path = tmp_path / 'slow.log'
+    logger = create_file_logger(str(path))
+    logger.info('before')
+    path.rename(tmp_path / 'slow.log.1')
+    logger.info('after')
+    assert path.read_text() == 'after\n'
+    assert (tmp_path / 'slow.log.1').read_text() == 'before\n'
+
+def test_skips_statements_under_threshold(db, tmp_path):
+    path = tmp_path / 'slow.log'
+    ticks = iter([0.0, 0.049, 1.0, 1.05])
+    log = SlowQueryLog(create_file_logger(str(path)), threshold_ms=50, clock=lambda: next(ticks))
+    log.attach(db.engine)
+    try:
+        db.session.execute(text("SELECT 1"))
+        db.session.execute(text("SELECT 2"))
+    finally:
+        log.detach(db.engine)
+    assert [r['statement'] for r in _records(path)] == ['SELECT 2']
+
+def test_records_route_when_configured(tmp_path):
+    path = tmp_path / 'logs' / 'slow.log'
+    app = create_app({
+        "TESTING": True,
+        "JWT_SECRET_KEY": "test-secret-key",
+        "DATABASE_URL": "sqlite:///:memory:",
+        "BCRYPT_ROUNDS": 4,
+        "SLOW_QUERY_LOG": str(path),
+        "SLOW_QUERY_THRESHOLD_MS": 0,
+    })
+    client = app.test_client()
+    app.config['database'].register_user("testuser", "password", "Test User")
+    token = client.post('/login', json={'username': 'testuser', 'password': 'password'}).json['access_token']
+    client.get('/groups', headers={'Authorization': f'Bearer {token}'})
+    app.config['database'].session.remove()
+
+    routes = {(r['route'], r['method']) for r in _records(path)}
+    assert ('GET /groups', 'get_group_summaries') in routes
+    assert ('POST /login', 'login') in routes
+    assert ('GET /groups', 'get_groups_versions') in routes
+
+def test_parameters_shape():
+    assert parameters_shape({'a': 1, 'b': None, 'c': 'x'}) == {'a': 'int', 'b': 'null', 'c': 'str'}
+    assert parameters_shape((1.5, b'x')) == ['float', 'bytes']
+    assert parameters_shape([(1, 'a'), (2, 'b')], executemany=True) == {'rows': 2, 'row': ['int', 'str']}
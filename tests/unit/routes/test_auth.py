@@ -171,3 +171,29 @@ def test_register_password_longer_than_8_chars(client, db):
     assert response.status_code == 200
     assert response.json['success'] == True
     assert response.json['user']['username'] == 'validuser'
+
+def test_login_returns_503_when_hasher_saturated(client, db, monkeypatch):
+    from utils.password_hasher import PasswordHasherBusy
+    db.register_user("testuser", "password", "Test User")
+
+    def busy(*args):
+        raise PasswordHasherBusy("Server is busy, please try again shortly")
+    monkeypatch.setattr(db.password_hasher, 'check', busy)
+
+    resp = client.post('/login', json={'username': 'testuser', 'password': 'password'})
+    assert resp.status_code == 503
+    assert resp.json['success'] == False
+
+def test_login_token_carries_membership_claims(app, client, db):
+    from flask_jwt_extended import decode_token
+    user = db.register_user("testuser", "password", "Test User")
+    group = db.create_group("G1", user.id)
+
+    resp = client.post('/login', json={'username': 'testuser', 'password': 'password'})
+    with app.app_context():
+        claims = decode_token(resp.json['access_token'])
+
+    assert claims['sub'] == 'testuser'
+    assert claims['uid'] == user.id
+    assert claims['roles'] == {str(group.id): 'admin'}
+    assert claims['mv'] == db.get_membership_version(user.id)
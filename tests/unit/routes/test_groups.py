@@ -1,4 +1,5 @@
 import pytest
+import datetime
 from flask import json
 
 @pytest.fixture
@@ -219,3 +220,71 @@ def test_default_scope(auth_client):
     resp = client.get('/user/default-scope', headers=headers)
     assert resp.json['type'] == 'group'
     assert resp.json['groupId'] == group_id
+
+def test_get_groups_etag(auth_client, db):
+    client, headers, user = auth_client
+    group = db.create_group("G1", user.id)
+
+    resp = client.get('/groups', headers=headers)
+    etag = resp.headers['ETag']
+    resp = client.get('/groups', headers={**headers, 'If-None-Match': etag})
+    assert resp.status_code == 304
+
+    other = db.register_user("other", "password", "Other")
+    db.join_group(group.id, other.id)
+    resp = client.get('/groups', headers={**headers, 'If-None-Match': etag})
+    assert resp.status_code == 200
+    assert resp.json[0]['member_count'] == 2
+    etag = resp.headers['ETag']
+
+    db.add_score(str(datetime.date.today()), other.id, 3)
+    resp = client.get('/groups', headers={**headers, 'If-None-Match': etag})
+    assert resp.status_code == 304
+
+    db.update_group(group.id, name="Renamed")
+    resp = client.get('/groups', headers={**headers, 'If-None-Match': etag})
+    assert resp.status_code == 200
+    assert resp.json[0]['name'] == "Renamed"
+
+def test_get_groups_query_count_constant(auth_client, db, query_counter):
+    client, headers, user = auth_client
+    other = db.register_user("other", "password", "Other")
+
+    group = db.create_group("G0", other.id)
+    db.join_group(group.id, user.id)
+    with query_counter as one_group:
+        resp = client.get('/groups', headers=headers)
+    assert len(resp.json) == 1
+
+    for i in range(1, 6):
+        group = db.create_group(f"G{i}", other.id)
+        db.join_group(group.id, user.id)
+    db.set_default_scope(user.id, group.id)
+    with query_counter as six_groups:
+        resp = client.get('/groups', headers=headers)
+
+    assert six_groups.count == one_group.count
+    assert [g['name'] for g in resp.json] == [f"G{i}" for i in range(6)]
+    assert all(g['member_count'] == 2 and g['role'] == 'member' for g in resp.json)
+    assert [g['is_default'] for g in resp.json] == [False] * 5 + [True]
+
+def test_get_group_details_single_query(auth_client, db, query_counter):
+    client, headers, user = auth_client
+    group_id = db.create_group("G1", user.id).id
+    db.session.expunge_all()
+
+    with query_counter as one_member:
+        resp = client.get(f'/groups/{group_id}', headers=headers)
+    assert len(resp.json['members']) == 1
+
+    for i in range(3):
+        other = db.register_user(f"other{i}", "password", f"Other {i}")
+        db.join_group(group_id, other.id)
+    db.session.expunge_all()
+
+    with query_counter as four_members:
+        resp = client.get(f'/groups/{group_id}', headers=headers)
+
+    assert one_member.count == four_members.count == 1
+    assert resp.json['current_user_role'] == 'admin'
+    assert sorted(m['username'] for m in resp.json['members']) == ['other0', 'other1', 'other2', 'testuser']
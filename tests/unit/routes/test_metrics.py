@@ -0,0 +1,81 @@
+import pytest
+
+from config.app import create_app
+
+
+@pytest.fixture
+def app():
+    app = create_app({
+        "TESTING": True,
+        "JWT_SECRET_KEY": "test-secret-key",
+        "DATABASE_URL": "sqlite:///:memory:",
+        "BCRYPT_ROUNDS": 4,
+        "METRICS_ENABLED": True,
+    })
+    yield app
+    app.config['database'].session.remove()
+
+
+def test_metrics_report_requests_queries_and_cache(client, db):
+    db.register_user("testuser", "password", "Test User")
+    token = client.post('/login', json={'username': 'testuser', 'password': 'password'}).json['access_token']
+    client.get('/groups', headers={'Authorization': f'Bearer {token}'})
+
+    response = client.get('/metrics')
+    body = response.get_data(as_text=True)
+
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain; version=0.0.4')
+    assert 'http_requests_total{endpoint="/groups",method="GET",status="200"} 1' in body
+    assert 'http_requests_total{endpoint="/login",method="POST",status="200"} 1' in body
+    assert 'http_request_db_queries_count{endpoint="/groups",method="GET"} 1' in body
+    assert 'http_request_db_queries_bucket{endpoint="/groups",method="GET",le="0"} 0' in body
+    assert 'http_response_size_bytes_count{endpoint="/groups",method="GET"} 1' in body
+    assert '# TYPE scores_cache_hits_total counter' in body
+    assert 'scores_cache_hits_total 0' in body
+    assert '# TYPE scores_cache_size gauge' in body
+
+
+def test_metrics_endpoint_is_not_recorded(client):
+    client.get('/metrics')
+    body = client.get('/metrics').get_data(as_text=True)
+    assert 'endpoint="/metrics"' not in body
+
+
+def test_metrics_count_rate_limited_requests():
+    app = create_app({
+        "TESTING": True,
+        "JWT_SECRET_KEY": "test-secret-key",
+        "DATABASE_URL": "sqlite:///:memory:",
+        "BCRYPT_ROUNDS": 4,
+        "RATELIMIT_ENABLED": True,
+        "METRICS_ENABLED": True,
+    })
+    client = app.test_client()
+    statuses = [client.post('/login', json={'username': 'x', 'password': 'y'}).status_code for _ in range(6)]
+
+    assert 429 in statuses
+    body = client.get('/metrics').get_data(as_text=True)
+    assert 'http_requests_total{endpoint="/login",method="POST",status="429"}' in body
+    app.config['database'].session.remove()
+
+
+def test_metrics_off_by_default(monkeypatch):
+    monkeypatch.delenv('METRICS_ENABLED', raising=False)
+    app = create_app({
+        "TESTING": True,
+        "JWT_SECRET_KEY": "test-secret-key",
+        "DATABASE_URL": "sqlite:///:memory:",
+        "BCRYPT_ROUNDS": 4,
+    })
+    assert app.test_client().get('/metrics').status_code == 404
+    assert app.config['metrics'] is None
+
+
+def test_metrics_token_required_when_set(app, client):
+    app.config['METRICS_TOKEN'] = 'scrape-token'
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer scrape-token'}).status_code == 200
+    # Non-ASCII credentials are rejected, not an error
+    assert client.get('/metrics', headers={'Authorization': 'Bearer sécret'.encode('utf-8')}).status_code == 401
@@ -113,3 +113,314 @@ def test_get_scores_group_not_member(client, db):
     }
     resp = client.get('/scores', query_string=query_params, headers=headers)
     assert resp.status_code == 403
+
+def test_get_scores_group_query_count_constant(client, db, query_counter):
+    u1 = db.register_user("u1", "pass", "U1")
+    g1 = db.create_group("G1", u1.id)
+    u2 = db.register_user("u2", "pass", "U2")
+    db.join_group(g1.id, u2.id)
+    login_resp = client.post('/login', json={'username': 'u1', 'password': 'pass'})
+    headers = {'Authorization': f"Bearer {login_resp.json['access_token']}"}
+    query_params = {'scope': 'group', 'groupId': g1.id, 'timezone': 'Europe/London'}
+
+    db.add_score("2023-01-01", u1.id, 3)
+    with query_counter as short_history:
+        resp = client.get('/scores', query_string=query_params, headers=headers)
+    assert resp.status_code == 200
+
+    start = datetime.date(2021, 1, 1)
+    for i in range(300):
+        day = (start + datetime.timedelta(days=i)).strftime("%Y-%m-%d")
+        db.add_score(day, u1.id, 4)
+        db.add_score(day, u2.id, 5)
+    with query_counter as long_history:
+        resp = client.get('/scores', query_string=query_params, headers=headers)
+    assert resp.status_code == 200
+
+    assert long_history.count == short_history.count
+
+def test_get_scores_paginated(auth_client, db):
+    client, headers, user = auth_client
+    today = datetime.date.today()
+    this_week = today - datetime.timedelta(days=today.weekday())
+    db.add_score(str(this_week - datetime.timedelta(weeks=3)), user.id, 4)
+
+    resp = client.get('/scores', query_string={'limit': 2}, headers=headers)
+    assert resp.status_code == 200
+    assert [w['start_of_week'] for w in resp.json['weeks']] == [
+        str(this_week - datetime.timedelta(weeks=1)), str(this_week)
+    ]
+    assert resp.json['next_cursor'] == str(this_week - datetime.timedelta(weeks=2))
+
+    resp = client.get('/scores', query_string={'limit': 2, 'cursor': resp.json['next_cursor']}, headers=headers)
+    assert len(resp.json['weeks']) == 2
+    assert resp.json['weeks'][0]['data'][str(this_week - datetime.timedelta(weeks=3))]['testuser'] == 4
+    assert resp.json['next_cursor'] is None
+
+def test_get_scores_invalid_window(auth_client):
+    client, headers, _ = auth_client
+    resp = client.get('/scores', query_string={'from': 'yesterday'}, headers=headers)
+    assert resp.status_code == 400
+    resp = client.get('/scores', query_string={'limit': 0}, headers=headers)
+    assert resp.status_code == 400
+
+def test_get_scores_extreme_window(auth_client):
+    client, headers, _ = auth_client
+    resp = client.get('/scores', query_string={'limit': 1000000}, headers=headers)
+    assert resp.status_code == 200
+    assert resp.json['next_cursor'] is None
+
+    resp = client.get('/scores', query_string={'cursor': '0001-01-01', 'limit': 2}, headers=headers)
+    assert resp.status_code == 200
+    assert resp.json == {'weeks': [], 'next_cursor': None}
+
+def test_get_scores_etag(client, db):
+    u1 = db.register_user("u1", "pass", "U1")
+    g1 = db.create_group("G1", u1.id)
+    u2 = db.register_user("u2", "pass", "U2")
+    db.join_group(g1.id, u2.id)
+    login_resp = client.post('/login', json={'username': 'u1', 'password': 'pass'})
+    headers = {'Authorization': f"Bearer {login_resp.json['access_token']}"}
+    query_params = {'scope': 'group', 'groupId': g1.id}
+
+    resp = client.get('/scores', query_string=query_params, headers=headers)
+    etag = resp.headers['ETag']
+    assert resp.status_code == 200
+
+    resp = client.get('/scores', query_string=query_params, headers={**headers, 'If-None-Match': etag})
+    assert resp.status_code == 304
+    assert resp.headers['ETag'] == etag
+
+    # Another member's score changes the group view
+    db.add_score(str(datetime.date.today()), u2.id, 4)
+    resp = client.get('/scores', query_string=query_params, headers={**headers, 'If-None-Match': etag})
+    assert resp.status_code == 200
+    assert resp.headers['ETag'] != etag
+
+    # Different parameters never share a tag
+    resp = client.get('/scores', query_string={**query_params, 'limit': 1},
+                      headers={**headers, 'If-None-Match': resp.headers['ETag']})
+    assert resp.status_code == 200
+
+def test_get_scores_not_modified_skips_score_tables(auth_client, db):
+    from sqlalchemy import event
+    client, headers, user = auth_client
+    db.add_score(str(datetime.date.today()), user.id, 3)
+    etag = client.get('/scores', headers=headers).headers['ETag']
+
+    statements = []
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        resp = client.get('/scores', headers={**headers, 'If-None-Match': etag})
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+
+    assert resp.status_code == 304
+    assert statements
+    assert not any('weekly_score' in s or 'FROM score' in s for s in statements)
+
+def test_get_scores_group_cache_shared_and_invalidated(client, db):
+    u1 = db.register_user("u1", "pass", "U1")
+    g1 = db.create_group("G1", u1.id)
+    u2 = db.register_user("u2", "pass", "U2")
+    db.join_group(g1.id, u2.id)
+    headers = {}
+    for username in ('u1', 'u2'):
+        login_resp = client.post('/login', json={'username': username, 'password': 'pass'})
+        headers[username] = {'Authorization': f"Bearer {login_resp.json['access_token']}"}
+    query_params = {'scope': 'group', 'groupId': g1.id}
+
+    resp = client.get('/scores', query_string=query_params, headers=headers['u1'])
+    assert resp.headers['X-Cache'] == 'MISS'
+    # The other member is served the same cached body
+    resp = client.get('/scores', query_string=query_params, headers=headers['u2'])
+    assert resp.headers['X-Cache'] == 'HIT'
+
+    today = str(datetime.date.today())
+    db.add_score(today, u2.id, 2)
+    assert db.scores_cache.stats()['size'] == 0
+    resp = client.get('/scores', query_string=query_params, headers=headers['u1'])
+    assert resp.headers['X-Cache'] == 'MISS'
+    assert resp.json[-1]['data'][today]['u2'] == 2
+
+def _capture_statements(db):
+    from sqlalchemy import event
+    statements = []
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    return statements, lambda: event.remove(db.engine, 'before_cursor_execute', capture)
+
+def test_get_scores_group_trusts_current_token_claims(client, db):
+    u1 = db.register_user("u1", "pass", "U1")
+    g1 = db.create_group("G1", u1.id)
+    login_resp = client.post('/login', json={'username': 'u1', 'password': 'pass'})
+    headers = {'Authorization': f"Bearer {login_resp.json['access_token']}"}
+    query_params = {'scope': 'group', 'groupId': g1.id}
+    etag = client.get('/scores', query_string=query_params, headers=headers).headers['ETag']
+
+    statements, stop = _capture_statements(db)
+    try:
+        resp = client.get('/scores', query_string=query_params, headers={**headers, 'If-None-Match': etag})
+    finally:
+        stop()
+
+    assert resp.status_code == 304
+    # A single version lookup: no user or membership queries
+    assert len(statements) == 1
+    assert 'data_version' in statements[0]
+
+def test_get_scores_group_rejects_stale_token_claims(client, db):
+    u1 = db.register_user("u1", "pass", "U1")
+    g1 = db.create_group("G1", u1.id)
+    u2 = db.register_user("u2", "pass", "U2")
+    db.join_group(g1.id, u2.id)
+    login_resp = client.post('/login', json={'username': 'u2', 'password': 'pass'})
+    headers = {'Authorization': f"Bearer {login_resp.json['access_token']}"}
+    query_params = {'scope': 'group', 'groupId': g1.id}
+    assert client.get('/scores', query_string=query_params, headers=headers).status_code == 200
+
+    # The token still claims membership, but the version has moved on
+    db.remove_member(g1.id, u2.id)
+    resp = client.get('/scores', query_string=query_params, headers=headers)
+    assert resp.status_code == 403
+
+def test_get_scores_invalid_timezone(auth_client):
+    client, headers, _ = auth_client
+    resp = client.get('/scores', query_string={'timezone': 'Not/AZone'}, headers=headers)
+    assert resp.status_code == 400
+
+def test_import_scores_batch(auth_client, db):
+    from database.rollups import check_weekly_scores
+    client, headers, user = auth_client
+    db.add_score("2023-01-02", user.id, 2)
+    db.add_score("2023-01-03", user.id, 3)
+    db.add_score("2023-01-04", user.id, 4)
+
+    resp = client.post('/scores/batch', json={'scores': [
+        {'date': '2023-01-01', 'score': 5},
+        {'date': '2023-01-02', 'score': 6},
+        {'date': '2023-01-03', 'score': 3},
+        {'date': '2023-01-04', 'score': None},
+        {'date': '2023-01-05', 'score': None},
+    ]}, headers=headers)
+
+    assert resp.status_code == 200
+    assert [r['status'] for r in resp.json['results']] == ['inserted', 'updated', 'unchanged', 'deleted', 'not_found']
+    week = db.get_scores(user.id, 'personal', start_date=datetime.date(2023, 1, 2), end_date=datetime.date(2023, 1, 2))[0]
+    assert week['data']['2023-01-02'] == {'testuser': 6}
+    assert week['data']['2023-01-04'] == {}
+    with db.engine.connect() as connection:
+        assert check_weekly_scores(connection) == []
+
+def test_import_scores_batch_validates_before_writing(auth_client, db):
+    from database.models.Score import Score
+    client, headers, user = auth_client
+
+    resp = client.post('/scores/batch', json={'scores': [
+        {'date': '2023-01-01', 'score': 5},
+        {'date': '01/02/2023', 'score': 5},
+        {'date': '2023-01-03', 'score': 'five'},
+        {'date': '2023-01-01', 'score': 4},
+        {'date': '2023-01-04', 'score': -3},
+        {'date': '2023-01-05', 'score': 99},
+    ]}, headers=headers)
+
+    assert resp.status_code == 400
+    assert [e['index'] for e in resp.json['errors']] == [1, 2, 3, 4, 5]
+    assert db.session.query(Score).count() == 0
+
+    resp = client.post('/scores/batch', json=[1, 2], headers=headers)
+    assert resp.status_code == 400
+
+def test_import_five_years_of_scores(auth_client, db, query_counter):
+    client, headers, user = auth_client
+    start = datetime.date(2019, 1, 1)
+    entries = [{'date': str(start + datetime.timedelta(days=i)), 'score': i % 6 + 1} for i in range(5 * 365)]
+
+    with query_counter:
+        resp = client.post('/scores/batch', json={'scores': entries}, headers=headers)
+
+    assert resp.status_code == 200
+    assert all(r['status'] == 'inserted' for r in resp.json['results'])
+    # Written in batches, not a statement per row
+    assert query_counter.count < 20
+    weeks = db.get_scores(user.id, 'personal', end_date=datetime.date(2019, 1, 6))
+    assert weeks[0]['data']['2019-01-01'] == {'testuser': 1}
+
+def test_get_scores_columnar(auth_client, db):
+    client, headers, user = auth_client
+    db.add_score("2024-01-01", user.id, 3)  # Monday
+    db.add_score("2024-01-14", user.id, 5)  # Sunday of the next week
+    db.add_score("2024-01-29", user.id, 2)  # after the window
+
+    resp = client.get('/scores?format=columnar&from=2024-01-01&to=2024-01-28', headers=headers)
+
+    assert resp.status_code == 200
+    assert resp.json['start'] == '2024-01-01'
+    assert resp.json['end'] == '2024-01-28'
+    # The last two weeks have no scores and are left out
+    assert resp.json['weeks'] == [0, 1]
+    assert resp.json['users'] == ['testuser']
+    assert resp.json['scores'] == [[3, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 5]]
+    assert resp.json['next_cursor'] is None
+
+def test_get_scores_columnar_empty_window(auth_client, db):
+    client, headers, user = auth_client
+    db.add_score("2024-01-10", user.id, 3)
+
+    # A cursor before the first score selects no weeks
+    resp = client.get('/scores?format=columnar&cursor=2023-12-31&limit=4', headers=headers)
+
+    assert resp.status_code == 200
+    assert resp.json['start'] == '2023-12-25'
+    assert resp.json['end'] == '2023-12-31'
+    assert resp.json['weeks'] == []
+    assert resp.json['users'] == []
+    assert resp.json['scores'] == []
+    assert resp.json['next_cursor'] is None
+
+def test_get_scores_columnar_matches_weeks_format(auth_client, db):
+    client, headers, user = auth_client
+    friend = db.register_user("friend", "password", "Friend")
+    group_id = db.create_group("No History", user.id, include_historical=False).id
+    db.join_group(group_id, friend.id)
+    db.update_group(group_id, created_at=datetime.datetime(2024, 1, 10, 12, 0))
+    for day in range(1, 60, 3):
+        db.add_score(str(datetime.date(2024, 1, 1) + datetime.timedelta(days=day)), user.id, day % 6 + 1)
+    for day in range(2, 60, 5):
+        db.add_score(str(datetime.date(2024, 1, 1) + datetime.timedelta(days=day)), friend.id, day % 5 + 2)
+
+    query = f'scope=group&groupId={group_id}&from=2024-01-01&to=2024-02-29'
+    weeks = client.get(f'/scores?{query}', headers=headers).json['weeks']
+    columnar = client.get(f'/scores?{query}&format=columnar', headers=headers).json
+
+    expected = {
+        (date, username): score
+        for week in weeks for date, day_scores in week['data'].items() for username, score in day_scores.items()
+    }
+    start = datetime.date.fromisoformat(columnar['start'])
+    decoded = {}
+    for username, scores in zip(columnar['users'], columnar['scores']):
+        for i, score in enumerate(scores):
+            if score:
+                date = start + datetime.timedelta(weeks=columnar['weeks'][i // 7], days=i % 7)
+                decoded[(str(date), username)] = score
+    assert decoded == expected
+    assert min(date for date, _ in decoded) >= '2024-01-10'
+    assert columnar['group_created_at'] == '2024-01-10'
+
+def test_get_scores_formats_have_separate_etags(auth_client):
+    client, headers, _ = auth_client
+    weeks_etag = client.get('/scores', headers=headers).headers['ETag']
+    resp = client.get('/scores?format=columnar', headers={**headers, 'If-None-Match': weeks_etag})
+    assert resp.status_code == 200
+    assert 'users' in resp.json
+
+def test_get_scores_invalid_format(auth_client):
+    client, headers, _ = auth_client
+    resp = client.get('/scores?format=csv', headers=headers)
+    assert resp.status_code == 400
+    assert resp.json['error'] == 'format must be one of: weeks, columnar'
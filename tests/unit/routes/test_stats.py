@@ -0,0 +1,213 @@
+import pytest
+import datetime
+import freezegun
+from sqlalchemy import event
+
+@pytest.fixture
+def auth_client(client, db):
+    user = db.register_user("testuser", "password", "Test User")
+    login_resp = client.post('/login', json={'username': 'testuser', 'password': 'password'})
+    token = login_resp.json['access_token']
+    return client, {'Authorization': f'Bearer {token}'}, user
+
+def test_personal_stats(auth_client, db):
+    client, headers, user = auth_client
+    # Week of Mon 2024-01-01: 3, 4, 7 (a fail); week of Mon 2024-01-08: 2, 3 (Sunday)
+    for date, score in [("2024-01-01", 3), ("2024-01-02", 4), ("2024-01-07", 7),
+                        ("2024-01-08", 2), ("2024-01-14", 3)]:
+        db.add_score(date, user.id, score)
+
+    resp = client.get('/stats', headers=headers)
+
+    assert resp.status_code == 200
+    [stats] = resp.json['users']
+    assert stats['username'] == 'testuser'
+    assert stats['games'] == 5
+    assert stats['mean'] == 3.8
+    assert stats['distribution'] == {'1': 0, '2': 1, '3': 2, '4': 1, '5': 0, '6': 0, 'fail': 1}
+    assert stats['best_week'] == {'week_start': '2024-01-08', 'games': 2, 'total': 5, 'mean': 2.5}
+    assert stats['worst_week'] == {'week_start': '2024-01-01', 'games': 3, 'total': 14, 'mean': 4.67}
+
+def test_stats_date_window(auth_client, db):
+    client, headers, user = auth_client
+    db.add_score("2024-01-01", user.id, 3)
+    db.add_score("2024-01-08", user.id, 5)
+
+    resp = client.get('/stats?from=2024-01-05&to=2024-01-31', headers=headers)
+
+    [stats] = resp.json['users']
+    assert stats['games'] == 1
+    assert stats['distribution']['5'] == 1
+    assert resp.json['from'] == '2024-01-05'
+
+def test_stats_skip_rows_without_a_score(auth_client, db):
+    from database.models.Score import Score
+    client, headers, user = auth_client
+    db.add_score("2024-01-01", user.id, 3)
+    db.session.add(Score(date=datetime.date(2024, 1, 2), user_id=user.id, score=None))
+    db.session.commit()
+
+    resp = client.get('/stats', headers=headers)
+
+    assert resp.status_code == 200
+    [stats] = resp.json['users']
+    assert stats['games'] == 1
+    assert stats['mean'] == 3.0
+    assert stats['best_week'] == {'week_start': '2024-01-01', 'games': 1, 'total': 3, 'mean': 3.0}
+
+def test_user_without_scores(auth_client):
+    client, headers, _ = auth_client
+    [stats] = client.get('/stats', headers=headers).json['users']
+    assert stats['games'] == 0
+    assert stats['mean'] is None
+    assert stats['best_week'] is None
+
+def test_group_stats_honour_historical_cutoff(auth_client, db):
+    client, headers, user = auth_client
+    friend = db.register_user("friend", "password", "Friend")
+    group = db.create_group("No History", user.id, include_historical=False)
+    db.join_group(group.id, friend.id)
+    db.update_group(group.id, created_at=datetime.datetime(2024, 1, 3, 12, 0))
+    db.add_score("2024-01-02", user.id, 1)  # before the group existed
+    db.add_score("2024-01-03", user.id, 4)
+    db.add_score("2024-01-04", friend.id, 6)
+    outsider = db.register_user("outsider", "password", "Outsider")
+    db.add_score("2024-01-04", outsider.id, 2)
+
+    resp = client.get(f'/stats?scope=group&groupId={group.id}', headers=headers)
+
+    assert resp.status_code == 200
+    assert resp.json['group_created_at'] == '2024-01-03'
+    by_user = {s['username']: s for s in resp.json['users']}
+    assert set(by_user) == {'testuser', 'friend'}
+    assert by_user['testuser']['games'] == 1
+    assert by_user['testuser']['best_week'] == {'week_start': '2024-01-01', 'games': 1, 'total': 4, 'mean': 4.0}
+    assert by_user['friend']['distribution']['6'] == 1
+
+def test_group_stats_require_membership(auth_client, db):
+    client, headers, _ = auth_client
+    other = db.register_user("other", "password", "Other")
+    group = db.create_group("Private", other.id)
+    resp = client.get(f'/stats?scope=group&groupId={group.id}', headers=headers)
+    assert resp.status_code == 403
+
+@pytest.mark.parametrize('query, error', [
+    ('scope=group', 'Group ID required for group scope'),
+    ('scope=everyone', 'scope must be personal or group'),
+    ('from=2024-13-01', 'from must be a date in YYYY-MM-DD format'),
+    ('from=2024-02-01&to=2024-01-01', 'from must not be after to'),
+])
+def test_stats_validation(auth_client, query, error):
+    client, headers, _ = auth_client
+    resp = client.get(f'/stats?{query}', headers=headers)
+    assert resp.status_code == 400
+    assert resp.json['error'] == error
+
+def test_stats_etag_changes_with_scores(auth_client, db):
+    client, headers, user = auth_client
+    db.add_score("2024-01-01", user.id, 3)
+    etag = client.get('/stats', headers=headers).headers['ETag']
+
+    assert client.get('/stats', headers={**headers, 'If-None-Match': etag}).status_code == 304
+    db.add_score("2024-01-02", user.id, 4)
+    assert client.get('/stats', headers={**headers, 'If-None-Match': etag}).status_code == 200
+
+def test_stats_etag_not_shared_between_users(auth_client, db):
+    client, headers, _ = auth_client
+    etag = client.get('/stats', headers=headers).headers['ETag']
+
+    db.register_user("other", "password", "Other User")
+    token = client.post('/login', json={'username': 'other', 'password': 'password'}).json['access_token']
+    resp = client.get('/stats', headers={'Authorization': f'Bearer {token}', 'If-None-Match': etag})
+    assert resp.status_code == 200
+    assert resp.json['users'][0]['username'] == 'other'
+
+def test_stats_query_count(auth_client, db, query_counter):
+    client, headers, user = auth_client
+    for day in range(1, 29):
+        db.add_score(f"2024-02-{day:02d}", user.id, day % 6 + 1)
+    db.session.remove()
+
+    with query_counter as counter:
+        resp = client.get('/stats', headers=headers)
+
+    assert resp.json['users'][0]['games'] == 28
+    # Versions, users, distribution and weeks, however many scores there are
+    assert counter.count == 4
+
+def _login_headers(client):
+    token = client.post('/login', json={'username': 'testuser', 'password': 'password'}).json['access_token']
+    return {'Authorization': f'Bearer {token}'}
+
+def test_streaks(auth_client, db):
+    client, _, user = auth_client
+    for day in ("2024-01-01", "2024-01-02", "2024-01-03", "2024-01-08", "2024-01-09"):
+        db.add_score(day, user.id, 3)
+
+    with freezegun.freeze_time("2024-01-10"):
+        resp = client.get('/stats/streaks?weeks=3', headers=_login_headers(client))
+
+    assert resp.status_code == 200
+    [streaks] = resp.json['users']
+    assert streaks['last_played'] == '2024-01-09'
+    assert streaks['current_streak'] == 2
+    assert streaks['longest_streak'] == 3
+    assert streaks['weeks'] == [
+        {'week_start': '2023-12-25', 'total': 0, 'games': 0},
+        {'week_start': '2024-01-01', 'total': 9, 'games': 3},
+        {'week_start': '2024-01-08', 'total': 6, 'games': 2},
+    ]
+
+def test_streak_lapses_after_a_missed_day(auth_client, db):
+    client, _, user = auth_client
+    db.add_score("2024-01-08", user.id, 3)
+    with freezegun.freeze_time("2024-01-10"):
+        [streaks] = client.get('/stats/streaks', headers=_login_headers(client)).json['users']
+    assert streaks['current_streak'] == 0
+    assert streaks['longest_streak'] == 1
+
+def test_group_streaks_do_not_read_scores(auth_client, db):
+    client, _, user = auth_client
+    friend = db.register_user("friend", "password", "Friend")
+    group_id = db.create_group("No History", user.id, include_historical=False).id
+    db.join_group(group_id, friend.id)
+    db.update_group(group_id, created_at=datetime.datetime(2024, 1, 3, 12, 0))
+    db.add_score("2024-01-02", user.id, 1)  # before the group existed
+    db.add_score("2024-01-03", user.id, 4)
+
+    statements = []
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with freezegun.freeze_time("2024-01-04"):
+        headers = _login_headers(client)
+        db.session.remove()
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            resp = client.get(f'/stats/streaks?scope=group&groupId={group_id}&weeks=2', headers=headers)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+
+    by_user = {s['username']: s for s in resp.json['users']}
+    assert by_user['testuser']['current_streak'] == 2
+    assert by_user['testuser']['weeks'] == [{'week_start': '2024-01-01', 'total': 4, 'games': 1}]
+    assert by_user['friend']['last_played'] is None
+    assert by_user['friend']['current_streak'] == 0
+    assert statements and not any('FROM score' in statement for statement in statements)
+
+def test_streaks_validation(auth_client):
+    client, headers, _ = auth_client
+    for weeks in ('0', 'abc', ''):
+        resp = client.get('/stats/streaks', query_string={'weeks': weeks}, headers=headers)
+        assert resp.status_code == 400
+        assert resp.json['error'] == 'weeks must be between 1 and 104'
+
+def test_streaks_etag_not_shared_between_users(auth_client, db):
+    client, headers, _ = auth_client
+    etag = client.get('/stats/streaks', headers=headers).headers['ETag']
+
+    db.register_user("other", "password", "Other User")
+    token = client.post('/login', json={'username': 'other', 'password': 'password'}).json['access_token']
+    resp = client.get('/stats/streaks', headers={'Authorization': f'Bearer {token}', 'If-None-Match': etag})
+    assert resp.status_code == 200
+    assert resp.json['users'][0]['username'] == 'other'
@@ -1,5 +1,6 @@
 import pytest
 import datetime
+import requests
 from unittest.mock import patch, MagicMock
 
 @pytest.fixture
@@ -12,7 +13,7 @@ def auth_client(client, db):
 def test_get_wordle_answer_success(auth_client):
     client, headers = auth_client
     
-    with patch('requests.get') as mock_get:
+    with patch('routes.wordle.http_client.get') as mock_get:
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.text = """
@@ -35,7 +36,7 @@ def test_get_wordle_answer_success(auth_client):
 def test_get_wordle_answer_not_found(auth_client):
     client, headers = auth_client
     
-    with patch('requests.get') as mock_get:
+    with patch('routes.wordle.http_client.get') as mock_get:
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.text = "<html><body>No answer here</body></html>"
@@ -47,3 +48,116 @@ def test_get_wordle_answer_not_found(auth_client):
         assert resp.status_code == 200
         assert resp.json['success'] == False
         assert 'error' in resp.json
+
+ANSWER_PAGE = """
+<html>
+    <body>
+        <h2>What is today's Wordle answer?</h2>
+        <p><strong>CRANE.</strong></p>
+    </body>
+</html>
+"""
+
+def _mock_page(mock_get, text):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.text = text
+    mock_get.return_value = mock_response
+
+def test_get_wordle_answer_cached_after_first_scrape(auth_client, db):
+    client, headers = auth_client
+
+    with patch('routes.wordle.http_client.get') as mock_get:
+        _mock_page(mock_get, ANSWER_PAGE)
+        resp = client.get('/wordle/answer?date=2024-03-01', headers=headers)
+        assert resp.json['answer'] == 'crane'
+        assert 'immutable' in resp.headers['Cache-Control']
+
+        resp = client.get('/wordle/answer?date=2024-03-01', headers=headers)
+        assert resp.json['answer'] == 'crane'
+        assert mock_get.call_count == 1
+
+    assert db.get_wordle_answer(datetime.date(2024, 3, 1)).answer == 'crane'
+
+def test_get_wordle_answer_today_not_immutable(auth_client):
+    client, headers = auth_client
+    with patch('routes.wordle.http_client.get') as mock_get:
+        _mock_page(mock_get, ANSWER_PAGE)
+        today = datetime.date.today().strftime("%Y-%m-%d")
+        resp = client.get(f'/wordle/answer?date={today}', headers=headers)
+        assert resp.json['success'] == True
+        assert 'immutable' not in resp.headers.get('Cache-Control', '')
+
+def test_get_wordle_answer_negative_cache(auth_client, db):
+    client, headers = auth_client
+    with patch('routes.wordle.http_client.get') as mock_get:
+        _mock_page(mock_get, "<html><body>No answer here</body></html>")
+        resp = client.get('/wordle/answer?date=2024-03-01', headers=headers)
+        assert resp.json['success'] == False
+        resp = client.get('/wordle/answer?date=2024-03-01', headers=headers)
+        assert resp.json['success'] == False
+        assert mock_get.call_count == 1
+
+        # Once the negative entry is stale the page is scraped again
+        cached = db.get_wordle_answer(datetime.date(2024, 3, 1))
+        cached.fetched_at -= datetime.timedelta(hours=1)
+        db.session.commit()
+        _mock_page(mock_get, ANSWER_PAGE)
+        resp = client.get('/wordle/answer?date=2024-03-01', headers=headers)
+        assert resp.json['answer'] == 'crane'
+        assert mock_get.call_count == 2
+
+def test_get_wordle_answer_transport_errors_not_cached(auth_client, db):
+    client, headers = auth_client
+    with patch('routes.wordle.http_client.get') as mock_get:
+        mock_get.side_effect = requests.ConnectTimeout('timed out')
+        resp = client.get('/wordle/answer?date=2024-03-01', headers=headers)
+        assert resp.status_code == 502
+        assert db.get_wordle_answer(datetime.date(2024, 3, 1)) is None
+
+        # The next request tries again rather than serving a cached failure
+        mock_get.side_effect = None
+        _mock_page(mock_get, ANSWER_PAGE)
+        resp = client.get('/wordle/answer?date=2024-03-01', headers=headers)
+        assert resp.json['answer'] == 'crane'
+
+def test_get_wordle_answer_circuit_open(auth_client, db):
+    from utils.http_client import CircuitOpenError
+    client, headers = auth_client
+    with patch('routes.wordle.http_client.get', side_effect=CircuitOpenError('down')):
+        resp = client.get('/wordle/answer?date=2024-03-01', headers=headers)
+    assert resp.status_code == 503
+    assert db.get_wordle_answer(datetime.date(2024, 3, 1)) is None
+
+def test_immutable_only_once_the_date_has_ended_everywhere(auth_client):
+    import freezegun
+    client, headers = auth_client
+    with patch('routes.wordle.http_client.get') as mock_get:
+        _mock_page(mock_get, ANSWER_PAGE)
+        # 2024-03-01 has ended in UTC but not yet in UTC-12
+        with freezegun.freeze_time("2024-03-02 06:00:00"):
+            # Log in again so the token is valid at the frozen time
+            login_resp = client.post('/login', json={'username': 'wordleuser', 'password': 'password'})
+            headers = {'Authorization': f"Bearer {login_resp.json['access_token']}"}
+            resp = client.get('/wordle/answer?date=2024-03-01', headers=headers)
+        assert resp.json['answer'] == 'crane'
+        assert 'immutable' not in resp.headers.get('Cache-Control', '')
+
+def test_get_wordle_answers_range(auth_client, db):
+    client, headers = auth_client
+    db.save_wordle_answer(datetime.date(2024, 3, 1), 'crane')
+    db.save_wordle_answer(datetime.date(2024, 3, 2), 'slate')
+    db.save_wordle_answer(datetime.date(2024, 3, 3), None)
+
+    with patch('routes.wordle.http_client.get') as mock_get:
+        resp = client.get('/wordle/answers?from=2024-03-01&to=2024-03-02', headers=headers)
+        assert not mock_get.called
+    assert [a['answer'] for a in resp.json['answers']] == ['crane', 'slate']
+    assert 'immutable' in resp.headers['Cache-Control']
+
+    resp = client.get('/wordle/answers?from=2024-03-01&to=2024-03-03', headers=headers)
+    assert len(resp.json['answers']) == 2
+    assert 'Cache-Control' not in resp.headers
+
+    resp = client.get('/wordle/answers?from=2024-03-03&to=2024-03-01', headers=headers)
+    assert resp.status_code == 400
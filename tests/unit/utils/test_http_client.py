@@ -0,0 +1,155 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from utils.http_client import CircuitOpenError, HttpClient, SingleFlight
+
+class StubServer:
+    """Local HTTP server replying with a queue of (status, delay) responses."""
+
+    def __init__(self):
+        self.responses = []
+        self.hits = 0
+        self.connections = set()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                stub.hits += 1
+                stub.connections.add(self.client_address)
+                status, delay = stub.responses.pop(0) if stub.responses else (200, 0)
+                time.sleep(delay)
+                body = b'ok'
+                self.send_response(status)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+@pytest.fixture
+def stub():
+    server = StubServer()
+    yield server
+    server.close()
+
+def test_reuses_connections(stub):
+    client = HttpClient()
+    for _ in range(3):
+        assert client.get(stub.url).status_code == 200
+    assert stub.hits == 3
+    assert len(stub.connections) == 1
+
+def test_retries_server_errors_with_backoff(stub):
+    sleeps = []
+    client = HttpClient(retries=2, backoff=0.1, sleep=sleeps.append)
+    stub.responses = [(503, 0), (502, 0)]
+    assert client.get(stub.url).status_code == 200
+    assert stub.hits == 3
+    assert sleeps == [0.1, 0.2]
+
+def test_read_timeout(stub):
+    client = HttpClient(read_timeout=0.1, retries=0)
+    stub.responses = [(200, 0.5)]
+    with pytest.raises(requests.Timeout):
+        client.get(stub.url)
+
+def test_stops_retrying_at_deadline(stub):
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    client = HttpClient(retries=5, backoff=0.4, deadline=1, sleep=sleep, clock=lambda: now[0])
+    stub.responses = [(503, 0)] * 6
+    assert client.get(stub.url).status_code == 503
+    # The second backoff (0.8s) would start a retry after the deadline
+    assert sleeps == [0.4]
+    assert stub.hits == 2
+
+def test_deadline_caps_attempt_timeout(stub):
+    client = HttpClient(read_timeout=10, retries=0, deadline=0.1)
+    stub.responses = [(200, 0.5)]
+    with pytest.raises(requests.Timeout):
+        client.get(stub.url)
+
+def test_circuit_breaker_opens_and_recovers(stub):
+    now = [0.0]
+    client = HttpClient(retries=0, failure_threshold=2, reset_timeout=30, clock=lambda: now[0])
+    stub.responses = [(500, 0), (500, 0)]
+    client.get(stub.url)
+    client.get(stub.url)
+    assert client.circuit_open
+
+    with pytest.raises(CircuitOpenError):
+        client.get(stub.url)
+    assert stub.hits == 2
+
+    # After the reset timeout a trial request is allowed and closes the circuit
+    now[0] = 31
+    assert client.get(stub.url).status_code == 200
+    assert not client.circuit_open
+
+def test_single_flight_coalesces_concurrent_fetches(stub):
+    client = HttpClient()
+    flight = SingleFlight()
+    stub.responses = [(200, 0.3)]
+    results = []
+
+    def fetch():
+        results.append(flight.do('2024-03-01', lambda: client.get(stub.url).text))
+
+    threads = [threading.Thread(target=fetch) for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == ['ok'] * 10
+    assert stub.hits == 1
+
+def test_single_flight_shares_errors():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    errors = []
+
+    def failing():
+        started.set()
+        release.wait()
+        raise ValueError('upstream down')
+
+    def call(fn):
+        try:
+            flight.do('key', fn)
+        except ValueError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call, args=(failing,))
+    leader.start()
+    started.wait()
+    follower = threading.Thread(target=call, args=(lambda: 'not called',))
+    follower.start()
+    time.sleep(0.05)
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert len(errors) == 2
+    assert errors[0] is errors[1]
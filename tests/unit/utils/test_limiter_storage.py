@@ -0,0 +1,119 @@
+import threading
+import pytest
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter, MovingWindowRateLimiter, SlidingWindowCounterRateLimiter
+
+from utils.limiter_storage import SQLiteStorage
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def uri(tmp_path):
+    return f"sqlite:///{tmp_path / 'limits.db'}"
+
+def test_registered_scheme(uri):
+    storage = storage_from_string(uri)
+    assert isinstance(storage, SQLiteStorage)
+    assert storage.check()
+
+def test_rejects_memory_path():
+    with pytest.raises(ValueError, match='file path'):
+        SQLiteStorage("sqlite:///:memory:")
+
+def test_fixed_window_counts_and_expires(uri):
+    clock = FakeClock()
+    storage = SQLiteStorage(uri, clock=clock)
+
+    assert storage.incr("k", 60) == 1
+    assert storage.incr("k", 60, amount=2) == 3
+    assert storage.get("k") == 3
+    assert storage.get_expiry("k") == clock.now + 60
+
+    clock.now += 60
+    assert storage.get("k") == 0
+    assert storage.incr("k", 60) == 1
+
+def test_counters_shared_between_instances(uri):
+    """Separate storages on one file, as in separate worker processes, see the same counters."""
+    limiter_a = FixedWindowRateLimiter(SQLiteStorage(uri))
+    limiter_b = FixedWindowRateLimiter(SQLiteStorage(uri))
+    limit = parse("5/minute")
+
+    results = [(limiter_a if i % 2 else limiter_b).hit(limit, "login", "1.2.3.4") for i in range(6)]
+
+    assert results == [True] * 5 + [False]
+
+def test_concurrent_hits_never_exceed_limit(uri):
+    limit = parse("20/minute")
+    granted = []
+
+    def hit():
+        limiter = MovingWindowRateLimiter(SQLiteStorage(uri))
+        for _ in range(10):
+            granted.append(limiter.hit(limit, "race"))
+
+    threads = [threading.Thread(target=hit) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert granted.count(True) == 20
+
+def test_moving_window(uri):
+    clock = FakeClock()
+    storage = SQLiteStorage(uri, clock=clock)
+
+    assert storage.acquire_entry("k", 2, 60)
+    clock.now += 30
+    assert storage.acquire_entry("k", 2, 60)
+    assert not storage.acquire_entry("k", 2, 60)
+    assert storage.get_moving_window("k", 2, 60) == (clock.now - 30, 2)
+
+    clock.now += 31  # the first entry has left the window
+    assert storage.acquire_entry("k", 2, 60)
+
+def test_sliding_window_counter(uri):
+    limiter = SlidingWindowCounterRateLimiter(SQLiteStorage(uri))
+    limit = parse("3/minute")
+    assert [limiter.hit(limit, "k") for _ in range(4)] == [True, True, True, False]
+    limiter.clear(limit, "k")
+    assert limiter.hit(limit, "k")
+
+def test_sweep_removes_expired_rows(uri):
+    clock = FakeClock()
+    storage = SQLiteStorage(uri, clock=clock, sweep_interval=60)
+    storage.incr("short", 10)
+    storage.incr("long", 600)
+    storage.acquire_entry("moving", 5, 10)
+
+    clock.now += 30
+    assert storage.sweep() == 2
+    assert storage.get("long") == 1
+
+    # Sweeps also happen on their own once the interval has passed
+    storage.incr("short", 10)
+    clock.now += 60
+    storage.incr("other", 10)
+    assert storage._connection().execute("SELECT key FROM limiter_counter ORDER BY key").fetchall() == [
+        ("long",), ("other",)
+    ]
+
+def test_login_limit_uses_configured_storage(tmp_path):
+    from config.app import create_app
+    app = create_app({
+        "TESTING": True,
+        "JWT_SECRET_KEY": "test-secret-key",
+        "DATABASE_URL": "sqlite:///:memory:",
+        "BCRYPT_ROUNDS": 4,
+        "RATELIMIT_STORAGE_URI": f"sqlite:///{tmp_path / 'limits.db'}",
+    })
+    client = app.test_client()
+    statuses = [client.post('/login', json={'username': 'nobody', 'password': 'x'}).status_code for _ in range(6)]
+    assert statuses[-1] == 429
+    assert 429 not in statuses[:5]
@@ -0,0 +1,51 @@
+from utils.lru_cache import LRUCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_lru_eviction_order():
+    cache = LRUCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1 # 'b' is now least recently used
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['size']) == (3, 1, 1, 2)
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = LRUCache(maxsize=2, ttl=10, clock=clock)
+    cache.set('a', 1)
+    clock.now = 9.9
+    assert cache.get('a') == 1
+    clock.now = 10
+    assert cache.get('a') is None
+    assert cache.stats()['expirations'] == 1
+
+def test_invalidate_by_tag():
+    cache = LRUCache(maxsize=10, ttl=60)
+    cache.set('p1', 'x', tags=[('personal', 1)])
+    cache.set('g1-a', 'y', tags=[('group', 1)])
+    cache.set('g1-b', 'z', tags=[('group', 1)])
+    cache.set('g2', 'w', tags=[('group', 2)])
+
+    cache.invalidate(('group', 1), ('group', 3))
+
+    assert cache.get('g1-a') is None
+    assert cache.get('g1-b') is None
+    assert cache.get('p1') == 'x'
+    assert cache.get('g2') == 'w'
+    assert cache.stats()['invalidations'] == 2
+
+def test_zero_size_disables_cache():
+    cache = LRUCache(maxsize=0, ttl=60)
+    cache.set('a', 1)
+    assert cache.get('a') is None
@@ -0,0 +1,41 @@
+import threading
+import bcrypt
+import pytest
+
+from utils.password_hasher import PasswordHasher, PasswordHasherBusy
+
+def test_hash_and_check():
+    hasher = PasswordHasher(rounds=4)
+    password_hash = hasher.hash("secret")
+    assert password_hash.startswith("$2b$04$")
+    assert hasher.check("secret", password_hash)
+    assert not hasher.check("wrong", password_hash)
+
+def test_needs_rehash():
+    hasher = PasswordHasher(rounds=5)
+    assert hasher.needs_rehash(bcrypt.hashpw(b"secret", bcrypt.gensalt(rounds=4)).decode())
+    assert not hasher.needs_rehash(bcrypt.hashpw(b"secret", bcrypt.gensalt(rounds=5)).decode())
+    assert hasher.needs_rehash("5ebe2294ecd0e0f08eab7690d2a6ee69")
+
+def test_rejects_work_beyond_queue_limit():
+    hasher = PasswordHasher(rounds=4, max_workers=1, max_pending=0)
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking():
+        started.set()
+        release.wait()
+        return 'done'
+
+    result = []
+    worker = threading.Thread(target=lambda: result.append(hasher._run(blocking)))
+    worker.start()
+    started.wait()
+    with pytest.raises(PasswordHasherBusy):
+        hasher.hash("secret")
+    release.set()
+    worker.join()
+
+    assert result == ['done']
+    # Capacity is released once the work finishes
+    assert hasher.check("secret", hasher.hash("secret"))
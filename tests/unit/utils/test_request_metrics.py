@@ -0,0 +1,93 @@
+import json
+import os
+
+import pytest
+from flask import Flask
+
+from utils.metrics import Counter, Histogram, RequestMetrics, render_gauges
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram('latency', 'Latency', ('endpoint',), (1, 5))
+    for value in (0.5, 1, 3, 10):
+        histogram.observe(('/a',), value)
+
+    assert histogram.render() == [
+        '# HELP latency Latency',
+        '# TYPE latency histogram',
+        'latency_bucket{endpoint="/a",le="1"} 2',
+        'latency_bucket{endpoint="/a",le="5"} 3',
+        'latency_bucket{endpoint="/a",le="+Inf"} 4',
+        'latency_sum{endpoint="/a"} 14.5',
+        'latency_count{endpoint="/a"} 4',
+    ]
+
+
+def test_counter_escapes_label_values():
+    counter = Counter('hits', 'Hits', ('path',))
+    counter.inc(('say "hi"\\\n',))
+    counter.inc(('say "hi"\\\n',), 2)
+
+    assert counter.render()[-1] == 'hits{path="say \\"hi\\"\\\\\\n"} 3'
+
+
+def test_render_gauges_skips_non_numeric_values():
+    lines = render_gauges('cache', 'Cache', {'size': 2, 'ttl': None, 'enabled': True})
+    assert lines == ['# HELP cache_size Cache (size)', '# TYPE cache_size gauge', 'cache_size 2']
+
+
+def test_request_metrics_records_unmatched_routes_under_one_label():
+    app = Flask(__name__)
+    metrics = RequestMetrics()
+    metrics.init_app(app)
+    client = app.test_client()
+
+    client.get('/nope/1')
+    client.get('/nope/2')
+
+    assert 'http_requests_total{endpoint="<unmatched>",method="GET",status="404"} 2' in metrics.render()
+
+
+def test_request_metrics_times_requests_with_injected_clock():
+    ticks = iter([10.0, 10.25])
+    app = Flask(__name__)
+    metrics = RequestMetrics(clock=lambda: next(ticks))
+    metrics.init_app(app)
+    app.add_url_rule('/ping', 'ping', lambda: 'pong')
+
+    app.test_client().get('/ping')
+
+    assert 'http_request_duration_seconds_sum{endpoint="/ping",method="GET"} 0.25' in metrics.render()
+
+
+def test_request_metrics_add_up_processes_and_keep_exited_totals(tmp_path):
+    stats = {'hits': 3, 'size': 2}
+    app = Flask(__name__)
+    metrics = RequestMetrics()
+    metrics.init_app(app)
+    metrics.add_stats_source('cache', 'Cache', lambda: stats, counters=('hits',), gauges=('size',))
+    metrics.share_between_processes(str(tmp_path))
+    app.add_url_rule('/ping', 'ping', lambda: 'pong')
+    client = app.test_client()
+
+    # Pretend another worker has already served a request and written its snapshot
+    client.get('/ping')
+    metrics.flush()
+    os.replace(tmp_path / f'{os.getpid()}.json', tmp_path / '99999.json')
+    metrics.requests._values.clear()
+
+    client.get('/ping')
+    body = metrics.render()
+    assert 'http_requests_total{endpoint="/ping",method="GET",status="200"} 2' in body
+    assert 'cache_hits_total 6' in body
+    assert 'cache_size 4' in body
+    assert 'pid=' not in body
+
+    # Once that worker exits its totals are kept, but its levels and snapshot are not
+    metrics.mark_process_dead(99999)
+    body = metrics.render()
+    assert not (tmp_path / '99999.json').exists()
+    assert 'http_requests_total{endpoint="/ping",method="GET",status="200"} 2' in body
+    assert 'cache_hits_total 6' in body
+    assert 'cache_size 2' in body
+    assert json.loads((tmp_path / 'archive.json').read_text())['gauges'] == {}
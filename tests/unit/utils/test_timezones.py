@@ -0,0 +1,17 @@
+import datetime
+import freezegun
+import pytest
+
+from utils.timezones import InvalidTimezone, get_timezone, today_in
+
+def test_get_timezone_is_memoized():
+    assert get_timezone('Europe/London') is get_timezone('Europe/London')
+
+def test_get_timezone_rejects_unknown_names():
+    with pytest.raises(InvalidTimezone):
+        get_timezone('Mars/Olympus_Mons')
+
+def test_today_in_timezone():
+    with freezegun.freeze_time("2023-01-01 23:30:00"):
+        assert today_in('Europe/London') == datetime.date(2023, 1, 1)
+        assert today_in('Pacific/Auckland') == datetime.date(2023, 1, 2)
@@ -1,7 +1,30 @@
-from flask import abort
-from flask_jwt_extended import get_jwt_identity
+from collections import namedtuple
+from flask import abort, g
+from flask_jwt_extended import create_access_token, get_jwt, get_jwt_identity
 from database.models.User import User
 
+# Identity and memberships as carried in the access token's claims
+TokenUser = namedtuple('TokenUser', ['id', 'username', 'roles', 'membership_version'])
+
+# Stand-in for a GroupMember row when membership is taken from the token
+TokenMembership = namedtuple('TokenMembership', ['group_id', 'user_id', 'role'])
+
+def create_user_token(database, user, expires_delta):
+    """
+    Issue an access token carrying the user's id and group roles, stamped
+    with their membership version so stale claims can be detected.
+    """
+    membership_version, roles = database.get_membership_claims(user.id)
+    return create_access_token(
+        identity=user.username,
+        expires_delta=expires_delta,
+        additional_claims={
+            'uid': user.id,
+            'mv': membership_version,
+            'roles': {str(group_id): role for group_id, role in roles.items()}
+        }
+    )
+
 def get_current_user(database):
     username = get_jwt_identity()
     user = database.session.query(User).filter_by(username=username).first()
@@ -9,7 +32,33 @@ def get_current_user(database):
         abort(401, 'User not found')
     return user
 
+def get_authenticated_user(database):
+    """
+    Return the caller as a TokenUser built from the token's claims without
+    querying the database, or as a User for tokens issued without claims.
+    """
+    claims = get_jwt()
+    if 'uid' not in claims:
+        return get_current_user(database)
+    return TokenUser(claims['uid'], get_jwt_identity(), claims.get('roles', {}), claims.get('mv'))
+
+def remember_membership_version(user_id, versions):
+    """Note the caller's membership version from a list of (scope, scope_id, version) counters."""
+    g.membership_version = next(
+        (version for scope, scope_id, version in versions if scope == 'user' and scope_id == user_id), 0
+    )
+
+def _claims_are_current(database, user):
+    if 'membership_version' not in g:
+        g.membership_version = database.get_membership_version(user.id)
+    return g.membership_version == user.membership_version
+
 def require_group_member(database, group_id, user):
+    if isinstance(user, TokenUser) and _claims_are_current(database, user):
+        role = user.roles.get(str(group_id))
+        if role is None:
+            abort(403, "You are not a member of this group")
+        return TokenMembership(group_id, user.id, role)
     membership = database.get_membership(group_id, user.id)
     if not membership:
         abort(403, "You are not a member of this group")
@@ -20,3 +69,16 @@ def require_group_admin(database, group_id, user):
     if membership.role != 'admin':
         abort(403, "Admin access required")
     return membership
+
+def require_loaded_group_member(group, user):
+    """Like require_group_member, for a group already loaded by Database.get_group_with_members."""
+    membership = next((m for m in group.members if m.user_id == user.id), None) if group else None
+    if not membership:
+        abort(403, "You are not a member of this group")
+    return membership
+
+def require_loaded_group_admin(group, user):
+    membership = require_loaded_group_member(group, user)
+    if membership.role != 'admin':
+        abort(403, "Admin access required")
+    return membership
@@ -0,0 +1,5 @@
+import datetime
+
+def week_start(date: datetime.date) -> datetime.date:
+    """Return the Monday of the week containing date."""
+    return date - datetime.timedelta(days=date.weekday())
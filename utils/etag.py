@@ -0,0 +1,20 @@
+import hashlib
+from flask import Response, request
+
+def compute_etag(*parts):
+    """Build a strong ETag value from the data version counters and request inputs it depends on."""
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+def not_modified_response(etag):
+    """Return a 304 response if the request's If-None-Match already has etag, else None."""
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    resp = Response(status=304)
+    resp.set_etag(etag)
+    resp.headers['Cache-Control'] = 'private, no-cache'
+    return resp
+
+def with_etag(resp, etag):
+    resp.set_etag(etag)
+    resp.headers['Cache-Control'] = 'private, no-cache'
+    return resp
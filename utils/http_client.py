@@ -0,0 +1,158 @@
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of making a request while the circuit breaker is open."""
+
+
+class HttpClient:
+    """
+    Shared outbound HTTP client. Keeps connections alive in a bounded pool,
+    applies connect/read timeouts to every request, retries connection
+    errors, timeouts and 5xx responses with exponential backoff, gives up
+    once deadline seconds have passed across all attempts (so a call never
+    outlives the server's request timeout), and opens a
+    circuit breaker after failure_threshold consecutive failed requests so
+    that a broken upstream fails fast for reset_timeout seconds. After that a
+    single trial request is let through; success closes the circuit again.
+    """
+
+    RETRY_STATUSES = frozenset({500, 502, 503, 504})
+
+    def __init__(self, connect_timeout: float = 3.05, read_timeout: float = 10, retries: int = 2,
+                 backoff: float = 0.5, deadline: float = 15, pool_maxsize: int = 10,
+                 failure_threshold: int = 5, reset_timeout: float = 30,
+                 sleep=time.sleep, clock=time.monotonic) -> None:
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.deadline = deadline
+        self.backoff = backoff
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._sleep = sleep
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    @property
+    def circuit_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        self._before_request()
+        try:
+            response = self._get_with_retries(url, **kwargs)
+        except Exception:
+            self._record_failure()
+            raise
+        if response.status_code in self.RETRY_STATUSES:
+            self._record_failure()
+        else:
+            self._record_success()
+        return response
+
+    def _get_with_retries(self, url: str, **kwargs) -> requests.Response:
+        timeout = kwargs.pop('timeout', self.timeout)
+        started_at = self._clock()
+        attempt = 0
+        while True:
+            remaining = self.deadline - (self._clock() - started_at)
+            error = None
+            try:
+                response = self.session.get(url, timeout=_capped_timeout(timeout, remaining), **kwargs)
+                if response.status_code not in self.RETRY_STATUSES:
+                    return response
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            delay = self.backoff * (2 ** attempt)
+            # Don't start a retry that would begin after the deadline
+            if attempt >= self.retries or self._clock() - started_at + delay >= self.deadline:
+                if error is not None:
+                    raise error
+                return response
+            self._sleep(delay)
+            attempt += 1
+
+    def _before_request(self) -> None:
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if self._clock() - self._opened_at < self.reset_timeout or self._trial_in_flight:
+                raise CircuitOpenError("Upstream is unavailable, not retrying yet")
+            # Half-open: let this request through as a trial
+            self._trial_in_flight = True
+
+    def _record_success(self) -> None:
+        with self._lock:
+            self._consecutive_failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def _record_failure(self) -> None:
+        with self._lock:
+            self._consecutive_failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._consecutive_failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+
+
+def _capped_timeout(timeout, remaining: float):
+    """Shorten a requests timeout (a number or a (connect, read) pair) to the time remaining."""
+    remaining = max(remaining, 0.001)
+    if isinstance(timeout, tuple):
+        return tuple(remaining if t is None else min(t, remaining) for t in timeout)
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key: the first caller runs the
+    function and every caller that arrives while it is running waits for and
+    receives the same result (or exception).
+    """
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
@@ -1,9 +1,9 @@
 import secrets
 import string
 
+# Uppercase letters and digits, without the easily confused O, 0, I and 1
+INVITE_CODE_ALPHABET = ''.join(c for c in string.ascii_uppercase + string.digits if c not in 'O0I1')
+
 def generate_invite_code(length=8):
     """Generate a random alphanumeric invite code"""
-    alphabet = string.ascii_uppercase + string.digits
-    # Remove ambiguous characters
-    alphabet = alphabet.replace('O', '').replace('0', '').replace('I', '').replace('1', '')
-    return ''.join(secrets.choice(alphabet) for _ in range(length))
+    return ''.join(secrets.choice(INVITE_CODE_ALPHABET) for _ in range(length))
@@ -0,0 +1,223 @@
+"""
+Rate-limit storage kept in a SQLite file, so that every worker process on a
+host shares the same counters and they survive restarts.
+
+Importing this module registers the `sqlite` scheme with the limits library,
+after which Flask-Limiter accepts e.g. RATELIMIT_STORAGE_URI=sqlite:///limits.db
+(three slashes for a relative path, four for an absolute one). It supports the
+fixed window, moving window and sliding window counter strategies.
+"""
+from contextlib import contextmanager
+from math import floor
+import os
+import sqlite3
+import threading
+import time
+
+from limits.storage import MovingWindowSupport, SlidingWindowCounterSupport, Storage
+from limits.storage.base import TimestampedSlidingWindow
+
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS limiter_counter (
+        key TEXT PRIMARY KEY,
+        count INTEGER NOT NULL,
+        expires_at REAL NOT NULL
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS limiter_entry (
+        key TEXT NOT NULL,
+        acquired_at REAL NOT NULL,
+        expires_at REAL NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_limiter_entry_key_acquired ON limiter_entry (key, acquired_at)",
+    "CREATE INDEX IF NOT EXISTS ix_limiter_entry_expires ON limiter_entry (expires_at)",
+    "CREATE INDEX IF NOT EXISTS ix_limiter_counter_expires ON limiter_counter (expires_at)",
+)
+
+# Adds amount to a live counter, or starts a new window if it has expired
+INCREMENT = """
+    INSERT INTO limiter_counter (key, count, expires_at) VALUES (:key, :amount, :expires_at)
+    ON CONFLICT (key) DO UPDATE SET
+        count = CASE WHEN expires_at <= :now THEN excluded.count ELSE count + excluded.count END,
+        expires_at = CASE WHEN expires_at <= :now THEN excluded.expires_at ELSE expires_at END
+    RETURNING count
+"""
+
+
+class SQLiteStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """
+    Counters live in limiter_counter and moving-window hits in limiter_entry.
+    Each thread uses its own connection in autocommit mode; single counter
+    updates are one atomic upsert, and check-then-acquire operations run
+    under BEGIN IMMEDIATE so concurrent workers cannot both take the last
+    slot. Expired rows are swept at most once every sweep_interval seconds.
+    """
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, sweep_interval: float = 60,
+                 busy_timeout: float = 5, clock=time.time, **options) -> None:
+        path = uri.split('://', 1)[1]
+        self.path = path[1:] if path.startswith('/') else path
+        if not self.path or self.path == ':memory:':
+            raise ValueError("SQLite rate-limit storage needs a file path, e.g. sqlite:///limits.db")
+        self.sweep_interval = sweep_interval
+        self.busy_timeout = busy_timeout
+        self._clock = clock
+        self._local = threading.local()
+        self._last_sweep = clock()
+        with self._transaction() as connection:
+            for statement in SCHEMA:
+                connection.execute(statement)
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _connection(self) -> sqlite3.Connection:
+        # Connections are per thread, and never reused across a fork
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    @contextmanager
+    def _transaction(self):
+        # Takes the write lock up front so the reads inside see no interleaved writes
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+
+    def _maybe_sweep(self, now: float) -> None:
+        if now - self._last_sweep >= self.sweep_interval:
+            self._last_sweep = now
+            self.sweep()
+
+    def sweep(self) -> int:
+        """Delete expired counters and moving-window entries. Returns the number of rows removed."""
+        now = self._clock()
+        with self._transaction() as connection:
+            removed = connection.execute('DELETE FROM limiter_counter WHERE expires_at <= ?', (now,)).rowcount
+            removed += connection.execute('DELETE FROM limiter_entry WHERE expires_at <= ?', (now,)).rowcount
+        return removed
+
+    # Fixed window
+
+    def incr(self, key: str, expiry: float, amount: int = 1) -> int:
+        now = self._clock()
+        self._maybe_sweep(now)
+        return self._increment(self._connection(), key, expiry, amount, now)
+
+    def _increment(self, connection, key: str, expiry: float, amount: int, now: float) -> int:
+        return connection.execute(
+            INCREMENT, {'key': key, 'amount': amount, 'expires_at': now + expiry, 'now': now}
+        ).fetchone()[0]
+
+    def decr(self, key: str, amount: int = 1) -> int:
+        row = self._connection().execute(
+            'UPDATE limiter_counter SET count = MAX(count - ?, 0) WHERE key = ? AND expires_at > ? RETURNING count',
+            (amount, key, self._clock())
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get(self, key: str) -> int:
+        row = self._connection().execute(
+            'SELECT count FROM limiter_counter WHERE key = ? AND expires_at > ?', (key, self._clock())
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key: str) -> float:
+        now = self._clock()
+        row = self._connection().execute(
+            'SELECT expires_at FROM limiter_counter WHERE key = ? AND expires_at > ?', (key, now)
+        ).fetchone()
+        return row[0] if row else now
+
+    def check(self) -> bool:
+        try:
+            self._connection().execute('SELECT 1')
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> int:
+        with self._transaction() as connection:
+            removed = connection.execute('DELETE FROM limiter_counter').rowcount
+            removed += connection.execute('DELETE FROM limiter_entry').rowcount
+        return removed
+
+    def clear(self, key: str) -> None:
+        with self._transaction() as connection:
+            connection.execute('DELETE FROM limiter_counter WHERE key = ?', (key,))
+            connection.execute('DELETE FROM limiter_entry WHERE key = ?', (key,))
+
+    # Moving window
+
+    def acquire_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+        now = self._clock()
+        self._maybe_sweep(now)
+        with self._transaction() as connection:
+            in_window = connection.execute(
+                'SELECT COUNT(*) FROM limiter_entry WHERE key = ? AND acquired_at > ?', (key, now - expiry)
+            ).fetchone()[0]
+            if in_window + amount > limit:
+                return False
+            connection.executemany(
+                'INSERT INTO limiter_entry (key, acquired_at, expires_at) VALUES (?, ?, ?)',
+                [(key, now, now + expiry)] * amount
+            )
+        return True
+
+    def get_moving_window(self, key: str, limit: int, expiry: int) -> tuple:
+        now = self._clock()
+        oldest, count = self._connection().execute(
+            'SELECT MIN(acquired_at), COUNT(*) FROM limiter_entry WHERE key = ? AND acquired_at > ?',
+            (key, now - expiry)
+        ).fetchone()
+        return (oldest, count) if count else (now, 0)
+
+    # Sliding window counter
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+        now = self._clock()
+        self._maybe_sweep(now)
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        with self._transaction() as connection:
+            previous_count, previous_ttl, current_count, _ = self._sliding_window(
+                previous_key, current_key, expiry, now
+            )
+            if floor(previous_count * previous_ttl / expiry + current_count) + amount > limit:
+                return False
+            # The current window's counter is kept for two periods so it can serve as the previous one
+            self._increment(connection, current_key, 2 * expiry, amount, now)
+        return True
+
+    def get_sliding_window(self, key: str, expiry: int) -> tuple:
+        now = self._clock()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        return self._sliding_window(previous_key, current_key, expiry, now)
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        previous_key, current_key = self.sliding_window_keys(key, expiry, self._clock())
+        self.clear(previous_key)
+        self.clear(current_key)
+
+    def _sliding_window(self, previous_key: str, current_key: str, expiry: int, now: float) -> tuple:
+        previous_count = self.get(previous_key)
+        current_count = self.get(current_key)
+        previous_ttl = 0.0 if previous_count == 0 else (1 - (((now - expiry) / expiry) % 1)) * expiry
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return previous_count, previous_ttl, current_count, current_ttl
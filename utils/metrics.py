@@ -0,0 +1,365 @@
+"""
+Per-request metrics in the Prometheus text exposition format.
+
+RequestMetrics hooks Flask's before/after_request and the engine's
+before/after_cursor_execute events. Each request's SQL statements and time
+spent in the database are tallied in a thread-local, and when the response
+goes out every series is updated under a single lock acquisition. Histogram
+buckets are fixed up front, so an observation is a bisect plus a few integer
+increments.
+
+Each process keeps its own figures. Under gunicorn, where a scrape reaches
+whichever worker takes it, share_between_processes(directory) has every
+worker write a snapshot of its figures to <directory>/<pid>.json (at most
+FLUSH_INTERVAL seconds after a change, and when it exits), and a scrape adds
+up all the snapshots. When a worker exits, mark_process_dead folds its
+counters into archive.json, so totals keep rising across worker restarts
+instead of appearing to reset, and no per-worker series are left behind.
+"""
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+import glob
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Tuple
+
+from flask import Flask, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+RESPONSE_SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+# Label used for requests that matched no route, so unknown URLs can't create new series
+UNMATCHED_ENDPOINT = '<unmatched>'
+
+# Longest a worker's snapshot lags behind its figures when shared between processes, in seconds
+FLUSH_INTERVAL = 1.0
+
+ARCHIVE_FILE = 'archive.json'
+LOCK_FILE = '.lock'
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Iterable[str], values: Iterable) -> str:
+    pairs = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return '{' + pairs + '}' if pairs else ''
+
+
+def _format_value(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Fixed-bucket histogram series keyed by label values. Callers serialise updates."""
+
+    def __init__(self, name: str, documentation: str, label_names: Labels, buckets: Tuple) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = tuple(buckets)
+        self._counts: Dict[Labels, List[int]] = {}
+        self._sums: Dict[Labels, float] = {}
+
+    def observe(self, labels: Labels, value: float) -> None:
+        counts = self._counts.get(labels)
+        if counts is None:
+            counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+            self._sums[labels] = 0
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[labels] += value
+
+    def snapshot(self) -> list:
+        return [[list(labels), counts, self._sums[labels]] for labels, counts in self._counts.items()]
+
+    def merge(self, snapshot: list) -> None:
+        """Add the observations in another histogram's snapshot to this one."""
+        for labels, counts, total in snapshot:
+            labels = tuple(labels)
+            mine = self._counts.get(labels)
+            if mine is None:
+                self._counts[labels] = list(counts)
+                self._sums[labels] = total
+                continue
+            for i, count in enumerate(counts):
+                mine[i] += count
+            self._sums[labels] += total
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        for labels, counts in sorted(self._counts.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                bucket_labels = _format_labels(self.label_names + ('le',), labels + (bound,))
+                lines.append(f'{self.name}_bucket{bucket_labels} {cumulative}')
+            series_labels = _format_labels(self.label_names, labels)
+            lines.append(f'{self.name}_sum{series_labels} {_format_value(self._sums[labels])}')
+            lines.append(f'{self.name}_count{series_labels} {cumulative}')
+        return lines
+
+
+class Counter:
+    """Monotonic counter series keyed by label values. Callers serialise updates."""
+
+    def __init__(self, name: str, documentation: str, label_names: Labels) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def snapshot(self) -> list:
+        return [[list(labels), value] for labels, value in self._values.items()]
+
+    def merge(self, snapshot: list) -> None:
+        for labels, value in snapshot:
+            self.inc(tuple(labels), value)
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        for labels, value in sorted(self._values.items()):
+            lines.append(f'{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}')
+        return lines
+
+
+def render_gauges(prefix: str, documentation: str, values: dict) -> List[str]:
+    """Render each numeric value in a dict as a gauge named prefix_key."""
+    lines = []
+    for key, value in values.items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            name = f'{prefix}_{key}'
+            lines += [f'# HELP {name} {documentation} ({key})', f'# TYPE {name} gauge', f'{name} {_format_value(value)}']
+    return lines
+
+
+def render_counters(prefix: str, documentation: str, values: dict) -> List[str]:
+    """Render each value in a dict of running totals as a counter named prefix_key_total."""
+    lines = []
+    for key, value in values.items():
+        name = f'{prefix}_{key}_total'
+        lines += [f'# HELP {name} {documentation} ({key})', f'# TYPE {name} counter', f'{name} {_format_value(value)}']
+    return lines
+
+
+class StatsSource(NamedTuple):
+    """A callable returning running totals and current levels, such as a cache's stats()."""
+    prefix: str
+    documentation: str
+    read: Callable[[], dict]
+    counters: Tuple[str, ...]
+    gauges: Tuple[str, ...]
+
+
+class RequestMetrics:
+    """
+    Records latency, SQL statements, database time and response size per
+    endpoint and method, and response counts per endpoint, method and status.
+    Requests to the paths in `exclude` (such as the metrics endpoint itself)
+    are not recorded. Stats sources added with add_stats_source are read on
+    each render (or flush) and exported alongside.
+    """
+
+    def __init__(self, exclude: Iterable[str] = ('/metrics',), clock=time.perf_counter,
+                 flush_interval: float = FLUSH_INTERVAL) -> None:
+        self.exclude = frozenset(exclude)
+        self.flush_interval = flush_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stats_sources: List[StatsSource] = []
+        self._directory = None
+        self._flush_timer = None
+        self.requests, self.duration, self.queries, self.db_time, self.response_size = self._create_series()
+
+    @staticmethod
+    def _create_series():
+        endpoint = ('endpoint', 'method')
+        return (
+            Counter('http_requests_total', 'Responses sent', endpoint + ('status',)),
+            Histogram('http_request_duration_seconds', 'Time to produce a response', endpoint, DURATION_BUCKETS),
+            Histogram('http_request_db_queries', 'SQL statements executed per request', endpoint, QUERY_COUNT_BUCKETS),
+            Histogram('http_request_db_seconds', 'Time spent executing SQL per request', endpoint, DURATION_BUCKETS),
+            Histogram('http_response_size_bytes', 'Response body size', endpoint, RESPONSE_SIZE_BUCKETS),
+        )
+
+    def init_app(self, app: Flask) -> None:
+        """Register the request hooks; do this before other extensions that may reject requests."""
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+
+    def instrument_engine(self, engine: Engine) -> None:
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def add_stats_source(self, prefix: str, documentation: str, read: Callable[[], dict],
+                         counters: Iterable[str], gauges: Iterable[str] = ()) -> None:
+        """
+        Export the running totals named in `counters` as prefix_key_total
+        counters and the levels named in `gauges` as prefix_key gauges. Across
+        processes both are summed, and the totals of exited processes are kept.
+        """
+        self._stats_sources.append(StatsSource(prefix, documentation, read, tuple(counters), tuple(gauges)))
+
+    def share_between_processes(self, directory: str) -> None:
+        """Aggregate every process's figures through snapshot files in directory; call before forking."""
+        os.makedirs(directory, exist_ok=True)
+        for path in glob.glob(os.path.join(directory, '*.json')):
+            os.remove(path)
+        self._directory = directory
+
+    def _before_request(self) -> None:
+        if request.path in self.exclude:
+            return
+        # [statements, seconds in the database] for the current request
+        self._local.tally = [0, 0.0]
+        g.metrics_started_at = self._clock()
+
+    def _after_request(self, response):
+        tally = getattr(self._local, 'tally', None)
+        if tally is None:
+            return response
+        duration = self._clock() - g.metrics_started_at
+        endpoint = request.url_rule.rule if request.url_rule is not None else UNMATCHED_ENDPOINT
+        labels = (endpoint, request.method)
+        size = response.content_length or 0
+        with self._lock:
+            self.requests.inc(labels + (str(response.status_code),))
+            self.duration.observe(labels, duration)
+            self.queries.observe(labels, tally[0])
+            self.db_time.observe(labels, tally[1])
+            self.response_size.observe(labels, size)
+            if self._directory is not None and self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_interval, self._timed_flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        return response
+
+    def _teardown_request(self, exception=None) -> None:
+        self._local.tally = None
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if getattr(self._local, 'tally', None) is not None:
+            context.metrics_started_at = self._clock()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        tally = getattr(self._local, 'tally', None)
+        started_at = getattr(context, 'metrics_started_at', None)
+        if tally is not None and started_at is not None:
+            tally[0] += 1
+            tally[1] += self._clock() - started_at
+
+    def _state(self) -> dict:
+        """This process's figures, in the form written to its snapshot file."""
+        with self._lock:
+            series = {metric.name: metric.snapshot() for metric in self._series()}
+        counters, gauges = {}, {}
+        for source in self._stats_sources:
+            values = source.read()
+            counters.update({f'{source.prefix}_{key}': values[key] for key in source.counters})
+            gauges.update({f'{source.prefix}_{key}': values[key] for key in source.gauges})
+        return {'series': series, 'counters': counters, 'gauges': gauges}
+
+    def _series(self):
+        return self.requests, self.duration, self.queries, self.db_time, self.response_size
+
+    def _merge_states(self, states: Iterable[dict]) -> dict:
+        series = {metric.name: metric for metric in self._create_series()}
+        counters, gauges = defaultdict(int), defaultdict(int)
+        for state in states:
+            for name, snapshot in state.get('series', {}).items():
+                if name in series:
+                    series[name].merge(snapshot)
+            for name, value in state.get('counters', {}).items():
+                counters[name] += value
+            for name, value in state.get('gauges', {}).items():
+                gauges[name] += value
+        return {
+            'series': {name: metric.snapshot() for name, metric in series.items()},
+            'counters': dict(counters),
+            'gauges': dict(gauges),
+        }
+
+    @contextmanager
+    def _store_lock(self):
+        # Only needed with gunicorn, so only imported where fork is available
+        import fcntl
+        with open(os.path.join(self._directory, LOCK_FILE), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _read_state(path: str):
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_state(path: str, state: dict) -> None:
+        # Written aside and renamed into place so readers never see half a file
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(temporary, path)
+
+    def _timed_flush(self) -> None:
+        with self._lock:
+            self._flush_timer = None
+        self.flush()
+
+    def flush(self) -> None:
+        """Write this process's snapshot, if figures are shared between processes."""
+        if self._directory is not None:
+            self._write_state(os.path.join(self._directory, f'{os.getpid()}.json'), self._state())
+
+    def mark_process_dead(self, pid: int) -> None:
+        """Fold an exited process's totals into the archive and drop its snapshot."""
+        if self._directory is None:
+            return
+        path = os.path.join(self._directory, f'{pid}.json')
+        with self._store_lock():
+            state = self._read_state(path)
+            if state is None:
+                return
+            archive_path = os.path.join(self._directory, ARCHIVE_FILE)
+            # Levels such as a cache's size die with the process; only totals carry on
+            state['gauges'] = {}
+            self._write_state(archive_path, self._merge_states([self._read_state(archive_path) or {}, state]))
+            os.remove(path)
+
+    def render(self) -> str:
+        if self._directory is None:
+            state = self._state()
+        else:
+            self.flush()
+            with self._store_lock():
+                paths = glob.glob(os.path.join(self._directory, '*.json'))
+                state = self._merge_states(filter(None, map(self._read_state, paths)))
+
+        lines = []
+        for metric in self._create_series():
+            metric.merge(state['series'].get(metric.name, []))
+            lines += metric.render()
+        for source in self._stats_sources:
+            counters = {key: state['counters'].get(f'{source.prefix}_{key}', 0) for key in source.counters}
+            gauges = {key: state['gauges'].get(f'{source.prefix}_{key}', 0) for key in source.gauges}
+            lines += render_counters(source.prefix, source.documentation, counters)
+            lines += render_gauges(source.prefix, source.documentation, gauges)
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,52 @@
+from concurrent.futures import ThreadPoolExecutor
+import re
+import threading
+
+import bcrypt
+
+BCRYPT_HASH_PATTERN = re.compile(r'^\$2[abxy]?\$(\d{2})\$')
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when too much bcrypt work is already queued to accept more."""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a small dedicated thread pool so that a burst of logins
+    cannot occupy every request worker. At most max_workers hashes run at once
+    and at most max_pending more may wait; beyond that callers get
+    PasswordHasherBusy immediately rather than queueing without bound.
+    """
+
+    def __init__(self, rounds: int = 12, max_workers: int = 2, max_pending: int = 16) -> None:
+        self.rounds = rounds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='bcrypt')
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+
+    def hash(self, password: str) -> str:
+        return self._run(
+            lambda: bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=self.rounds)).decode('utf-8')
+        )
+
+    def check(self, password: str, password_hash: str) -> bool:
+        return self._run(lambda: bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8')))
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """Whether a bcrypt hash was made with a different cost than the configured one."""
+        match = BCRYPT_HASH_PATTERN.match(password_hash)
+        return match is None or int(match.group(1)) != self.rounds
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def _run(self, work):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy("Server is busy, please try again shortly")
+        try:
+            future = self._executor.submit(work)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
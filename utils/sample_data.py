@@ -0,0 +1,9 @@
+"""Shape of the generated score history shared by the seed script and the benchmark datasets."""
+
+# Scores drawn for a day that is played, with a realistic distribution
+# 1: 1%, 2: 5%, 3: 30%, 4: 40%, 5: 15%, 6: 5%, X: 4% (a failed game leaves no score)
+SCORE_WEIGHTS = [1, 5, 30, 40, 15, 5, 4]
+SCORE_OPTIONS = [1, 2, 3, 4, 5, 6, None]
+
+# Chance that a user plays on any given day
+PLAY_PROBABILITY = 0.8
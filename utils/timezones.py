@@ -0,0 +1,21 @@
+import datetime
+from functools import lru_cache
+import pytz
+
+# Validated against with a set lookup rather than a scan of pytz's list
+VALID_TIMEZONES = frozenset(pytz.all_timezones)
+
+class InvalidTimezone(Exception):
+    pass
+
+@lru_cache(maxsize=None)
+def get_timezone(name: str) -> datetime.tzinfo:
+    if name not in VALID_TIMEZONES:
+        raise InvalidTimezone('Invalid timezone')
+    return pytz.timezone(name)
+
+def today_in(timezone: str = None) -> datetime.date:
+    """Today's date in the named timezone, or in server local time if None."""
+    if timezone is None:
+        return datetime.date.today()
+    return datetime.datetime.now(get_timezone(timezone)).date()